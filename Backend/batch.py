@@ -0,0 +1,204 @@
+"""
+여러 YouTube 영상을 한 번에 분석하는 배치 스크립트
+
+- 네트워크 단계(자막/메타데이터 수집)는 스레드 풀에서 높은 동시성으로 실행
+- YouTube 비디오 정보는 시작 전에 50개씩 묶어 미리 받아둠 (videos.list 호출 수 절감)
+- 모델 단계(챕터 생성, Bloom 분류, 요약)는 모델을 미리 로드한 프로세스 풀에서 실행
+- 이미 분석 결과가 있는 영상은 건너뜀
+
+사용 예:
+    python -m Backend.batch aircAruvnKk E6DuimPZDz8 --lang en
+    python -m Backend.batch --file video_ids.txt --fetch-workers 16 --model-workers 2
+"""
+
+import argparse
+import multiprocessing
+import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .controllers.catalog import get_catalog
+from .controllers.youtube_api import get_youtube_video_infos
+
+# 네트워크 단계만 실행할 때의 대상 단계
+FETCH_STAGES = ["transcript", "youtube_chapters"]
+
+
+def read_video_ids(ids: Iterable[str], file_path: str = None) -> List[str]:
+    """
+    명령줄 인자와 파일에서 영상 ID를 읽어 중복 없이 순서대로 반환합니다.
+    파일은 한 줄에 하나의 ID이며, 빈 줄과 '#'으로 시작하는 줄은 무시합니다.
+    """
+    candidates = list(ids)
+    if file_path:
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    candidates.append(line)
+
+    seen = set()
+    video_ids = []
+    for vid in candidates:
+        vid = vid.strip()
+        if vid and vid not in seen:
+            seen.add(vid)
+            video_ids.append(vid)
+    return video_ids
+
+
+def _fetch_video(video_id: str, lang: str, use_cache: bool) -> Tuple[str, bool, str, Dict[str, Any]]:
+    """
+    네트워크 단계(자막, YouTube 챕터)를 실행합니다.
+    수집 결과는 모델 단계에 직접 넘기므로 캐시를 사용하지 않아도 다시 가져오지 않습니다.
+    """
+    from .main import run_analysis
+    try:
+        result = run_analysis(video_id, lang=lang, use_cache=use_cache, targets=FETCH_STAGES)
+        if not result.ok("transcript"):
+            return video_id, False, "자막을 가져올 수 없습니다.", {}
+        return video_id, True, "", {name: result.outputs.get(name) for name in FETCH_STAGES}
+    except Exception as e:
+        return video_id, False, f"수집 중 오류: {e}", {}
+
+
+def _init_model_worker(lang: str):
+    """프로세스 풀 워커 초기화: 모델을 한 번만 로드하여 이후 영상에서 재사용"""
+    print(f"🔥 워커 모델 warm-up 시작 (lang={lang})")
+    try:
+        from .controllers.summary import warm_up_summarizers
+        from .controllers.semantic_segmentation import warm_up_embedding_model
+        from .controllers.bloom_classifier import warm_up_bloom_classifier
+        warm_up_summarizers([lang])
+        warm_up_embedding_model()
+        warm_up_bloom_classifier()
+    except ImportError as e:
+        # 모델 라이브러리가 없어도 워커는 시작하고, 각 단계에서 오류를 보고
+        print(f"⚠️ 워커 모델 warm-up 실패: {e}")
+
+
+def _analyze_video(video_id: str, lang: str, use_cache: bool,
+                   prefetched: Dict[str, Any]) -> Tuple[str, bool, str]:
+    """프로세스 풀에서 전체 분석을 실행합니다. 네트워크 단계는 수집 스레드가 넘겨준 결과를 사용합니다."""
+    from .main import run_analysis
+    try:
+        result = run_analysis(video_id, lang=lang, use_cache=use_cache, prefetched=prefetched)
+        if result.ok("save"):
+            return video_id, True, ""
+        errors = ", ".join(f"{name}: {err}" for name, err in result.errors.items())
+        return video_id, False, errors or "세그먼트를 생성할 수 없습니다."
+    except Exception as e:
+        return video_id, False, f"분석 중 오류: {e}"
+
+
+def run_batch(video_ids: List[str], lang: str = 'en', fetch_workers: int = 16, model_workers: int = 1,
+              use_cache: bool = True, force: bool = False) -> List[Tuple[str, bool, str]]:
+    """
+    여러 영상을 분석합니다. 수집이 끝난 영상부터 바로 모델 단계에 투입됩니다.
+
+    Args:
+        video_ids: 분석할 영상 ID 목록
+        lang: 자막 언어
+        fetch_workers: 네트워크 단계 동시 실행 수
+        model_workers: 모델 단계 프로세스 수
+        use_cache: 단계별 결과 캐시 사용 여부
+        force: 이미 분석된 영상도 다시 분석
+
+    Returns:
+        (video_id, 성공 여부, 메시지) 리스트
+    """
+    results = []
+    pending = []
+    catalog = get_catalog()
+    for vid in video_ids:
+        existing = None if force else catalog.get_analysis(vid, lang)
+        if existing:
+            print(f"⏭️ 이미 분석된 영상: {vid} ({existing['store_path'] or existing['json_path']})")
+            results.append((vid, True, "이미 분석됨"))
+        else:
+            pending.append(vid)
+
+    if not pending:
+        return results
+
+    print(f"🎬 분석 대상 {len(pending)}개 (fetch_workers={fetch_workers}, model_workers={model_workers})")
+
+    # 영상마다 videos.list를 호출하지 않도록 비디오 정보를 묶어서 미리 캐시
+    # (youtube_chapters 단계는 같은 프로세스의 스레드에서 실행되므로 캐시를 그대로 사용하고,
+    #  모델 프로세스에는 수집 결과를 직접 넘기므로 다시 호출하지 않음)
+    infos = get_youtube_video_infos(pending)
+    print(f"📥 비디오 정보 {sum(1 for info in infos.values() if info)}/{len(pending)}개 미리 가져옴")
+
+    # torch/transformers는 fork 이후 사용 시 문제가 생길 수 있어 spawn 사용
+    mp_context = multiprocessing.get_context("spawn")
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=model_workers, mp_context=mp_context,
+                                initializer=_init_model_worker, initargs=(lang,)) as model_pool:
+        fetch_futures = [fetch_pool.submit(_fetch_video, vid, lang, use_cache) for vid in pending]
+        model_futures = {}
+        for future in as_completed(fetch_futures):
+            vid, ok, message, prefetched = future.result()
+            if not ok:
+                print(f"❌ {vid}: {message}")
+                results.append((vid, False, message))
+                continue
+            try:
+                model_futures[model_pool.submit(_analyze_video, vid, lang, use_cache, prefetched)] = vid
+            except BrokenProcessPool as e:
+                message = f"모델 프로세스 오류: {e}"
+                print(f"❌ {vid}: {message}")
+                results.append((vid, False, message))
+
+        analyzed = False
+        for future in as_completed(model_futures):
+            try:
+                vid, ok, message = future.result()
+            except BrokenProcessPool as e:
+                # 워커 프로세스가 비정상 종료되면(메모리 부족 등) 남은 영상을 모두 실패로 기록
+                vid, ok, message = model_futures[future], False, f"모델 프로세스 오류: {e}"
+            print(f"{'✅' if ok else '❌'} {vid}{': ' + message if message else ''}")
+            results.append((vid, ok, message))
+            analyzed = analyzed or ok
+
+    # 영상 전체를 대상으로 한 색인은 배치가 끝난 뒤 한 번만 갱신
+    if analyzed:
+        from .jobs import refresh_indexes
+        refresh_indexes()
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="여러 YouTube 영상을 일괄 분석합니다.")
+    parser.add_argument("video_ids", nargs="*", help="분석할 영상 ID")
+    parser.add_argument("--file", "-f", help="영상 ID 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--lang", default="en", choices=["ko", "en"], help="자막 언어")
+    parser.add_argument("--fetch-workers", type=int, default=16, help="자막/메타데이터 수집 동시 실행 수")
+    parser.add_argument("--model-workers", type=int, default=1, help="모델 단계 프로세스 수")
+    parser.add_argument("--force", action="store_true", help="이미 분석된 영상도 다시 분석")
+    parser.add_argument("--no-cache", action="store_true", help="단계별 결과 캐시를 사용하지 않음")
+    args = parser.parse_args(argv)
+
+    video_ids = read_video_ids(args.video_ids, args.file)
+    if not video_ids:
+        parser.error("분석할 영상 ID를 입력하거나 --file을 지정해주세요.")
+
+    results = run_batch(
+        video_ids,
+        lang=args.lang,
+        fetch_workers=args.fetch_workers,
+        model_workers=args.model_workers,
+        use_cache=not args.no_cache,
+        force=args.force
+    )
+
+    failed = [r for r in results if not r[1]]
+    print(f"\n📊 배치 분석 완료: 성공 {len(results) - len(failed)}개, 실패 {len(failed)}개")
+    for vid, _, message in failed:
+        print(f"   - {vid}: {message}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,21 +2,64 @@
 Controllers package for OSC analysis
 """
 
-from Backend.controllers.youtube_api import get_youtube_chapters, get_youtube_video_info
-from Backend.controllers.transcript import extract_transcript
+from Backend.controllers.youtube_api import (
+    get_youtube_chapters, get_youtube_chapters_batch, get_youtube_video_info, get_youtube_video_infos
+)
+from Backend.controllers.youtube_client import YouTubeClient, get_youtube_client
+from Backend.controllers.http_cache import ResponseCache, get_response_cache
+from Backend.controllers.caption_probe import get_caption_tracks, probe_captions
+from Backend.controllers.transcript import extract_transcript, TranscriptStore
 from Backend.controllers.segments import segment_video_by_description, map_subtitles_to_segments
 from Backend.controllers.file_io import save_segments_to_json, save_segments_to_txt, save_segments_with_subtitles_to_json
-from Backend.controllers.summary import generate_summary, batch_generate_summaries
+from Backend.controllers.summary import generate_summary, batch_generate_summaries, generate_segment_summaries
+from Backend.controllers.model_registry import ModelRegistry, get_model_registry
+from Backend.controllers.result_cache import ResultCache
+from Backend.controllers.pipeline import Stage, PipelineRunner, Uncached
+from Backend.controllers.embedding_store import EmbeddingStore
+from Backend.controllers.segment_store import SegmentStore
+from Backend.controllers.catalog import Catalog, get_catalog
+from Backend.controllers.recommendation import RecommendationIndex, get_recommendation_index, refresh_recommendation_index
+from Backend.controllers.learning_path import LearningPathPlanner, plan_learning_path, refresh_similarity_graph
+from Backend.controllers.search import SearchIndex, get_search_index, index_video
 
 __all__ = [
     'get_youtube_chapters',
     'get_youtube_video_info', 
+    'get_youtube_chapters_batch',
+    'get_youtube_video_infos',
+    'YouTubeClient',
+    'get_youtube_client',
+    'ResponseCache',
+    'get_response_cache',
+    'get_caption_tracks',
+    'probe_captions',
     'extract_transcript',
+    'TranscriptStore',
     'segment_video_by_description',
     'map_subtitles_to_segments',
     'save_segments_to_json',
     'save_segments_to_txt',
     'save_segments_with_subtitles_to_json',
     'generate_summary',
-    'batch_generate_summaries'
+    'batch_generate_summaries',
+    'generate_segment_summaries',
+    'ModelRegistry',
+    'get_model_registry',
+    'ResultCache',
+    'Stage',
+    'PipelineRunner',
+    'Uncached',
+    'EmbeddingStore',
+    'SegmentStore',
+    'Catalog',
+    'get_catalog',
+    'RecommendationIndex',
+    'get_recommendation_index',
+    'refresh_recommendation_index',
+    'LearningPathPlanner',
+    'plan_learning_path',
+    'refresh_similarity_graph',
+    'SearchIndex',
+    'get_search_index',
+    'index_video'
 ]
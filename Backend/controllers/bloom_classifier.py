@@ -2,10 +2,14 @@
 Bloom 인지단계 분류를 위한 BloomBERT 모델 컨트롤러
 """
 
+import itertools
+import json
+import math
 import torch
 from transformers import DistilBertTokenizer, DistilBertModel
 import torch.nn as nn
 from pathlib import Path
+from Backend.controllers.model_registry import get_model_registry
 
 # Bloom 인지단계 매핑
 BLOOM_CATEGORIES = {
@@ -46,6 +50,109 @@ class BloomBERT(nn.Module):
         logits = self.classifier(x)
         return logits
 
+BLOOM_TASK = "bloom-classification"
+MAX_SEQ_LEN = 512
+DEFAULT_BATCH_SIZE = 16
+
+# 긴 텍스트 슬라이딩 윈도우 설정
+DEFAULT_WINDOW_STRIDE = 128
+# 윈도우를 길이순으로 정렬하는 단위 (배치 크기의 배수). 한 번에 보관하는 윈도우 수를 제한
+WINDOW_SORT_CHUNK_BATCHES = 8
+AGGREGATIONS = ("mean", "max", "attention")
+DEFAULT_AGGREGATION = "mean"
+
+
+def _format_prediction(probabilities):
+    """클래스별 확률 리스트를 예측 결과 dict로 변환"""
+    pred_class = max(range(len(probabilities)), key=lambda c: probabilities[c])
+    return {
+        "label": BLOOM_CATEGORIES[pred_class],
+        "probabilities": {BLOOM_CATEGORIES[c]: float(p) for c, p in enumerate(probabilities)},
+    }
+
+
+def _unknown_prediction(failed=False):
+    """분류하지 못한 텍스트의 결과 (failed=True: 추론 오류로 실패, 결과를 캐시하지 않도록 표시)"""
+    prediction = {"label": "Unknown", "probabilities": {}}
+    if failed:
+        prediction["failed"] = True
+    return prediction
+
+
+class _LogitAggregator:
+    """
+    한 텍스트의 윈도우 logits를 스트리밍 방식으로 집계합니다.
+    - mean: 평균
+    - max: 클래스별 최댓값
+    - attention: 윈도우 확신도(최대 logit)의 softmax 가중 평균 (log-sum-exp로 누적)
+    """
+
+    def __init__(self, method):
+        self.method = method
+        self.count = 0
+        self._acc = None
+        self._max_score = None
+        self._weight_sum = 0.0
+
+    def add(self, logits):
+        self.count += 1
+        if self.method == "mean":
+            self._acc = logits.clone() if self._acc is None else self._acc + logits
+        elif self.method == "max":
+            self._acc = logits.clone() if self._acc is None else torch.maximum(self._acc, logits)
+        else:
+            score = float(logits.max())
+            if self._acc is None:
+                self._max_score = score
+                self._acc = logits.clone()
+                self._weight_sum = 1.0
+                return
+            if score > self._max_score:
+                # 기준 점수가 바뀌면 지금까지의 누적값을 다시 스케일링
+                rescale = math.exp(self._max_score - score)
+                self._acc = self._acc * rescale
+                self._weight_sum *= rescale
+                self._max_score = score
+            weight = math.exp(score - self._max_score)
+            self._acc = self._acc + logits * weight
+            self._weight_sum += weight
+
+    def result(self):
+        if self._acc is None:
+            return None
+        if self.method == "mean":
+            return self._acc / self.count
+        if self.method == "max":
+            return self._acc
+        return self._acc / self._weight_sum
+
+
+def get_default_model_path() -> Path:
+    """기본 BloomBERT 가중치 경로"""
+    root_dir = Path(__file__).resolve().parents[1]
+    return root_dir / "models" / "bloombert_model.pt"
+
+
+def _load_bloom_model(model_path: str, device):
+    """레지스트리용 BloomBERT 로더: (model, tokenizer) 튜플 반환"""
+    device = torch.device(device)
+    model = BloomBERT()
+    model.load_state_dict(torch.load(model_path, map_location=device))
+    model.to(device)
+    model.eval()
+    tokenizer = DistilBertTokenizer.from_pretrained("distilbert-base-uncased")
+    return model, tokenizer
+
+
+get_model_registry().register_loader(BLOOM_TASK, _load_bloom_model)
+
+
+def warm_up_bloom_classifier(model_path=None):
+    """BloomBERT 모델을 미리 로드합니다."""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return get_model_registry().warm_up([(BLOOM_TASK, str(model_path or get_default_model_path()), device)])
+
+
 class BloomClassifier:
     """Bloom 인지단계 분류기"""
     
@@ -55,53 +162,253 @@ class BloomClassifier:
         # 모델 경로 설정
         if model_path is None:
             # 기본 모델 경로
-            root_dir = Path(__file__).resolve().parents[1]
-            model_path = root_dir / "models" / "bloombert_model.pt"
+            model_path = get_default_model_path()
+        
+        # 모델/토크나이저 로드 (레지스트리에서 공유, 프로세스당 한 번만 로드)
+        self.model, self.tokenizer = get_model_registry().get(BLOOM_TASK, str(model_path), str(self.device))
+        
+        print(f"✅ BloomBERT 모델 준비 완료 (Device: {self.device})")
+    
+    def predict_bloom_category(self, text, aggregation=DEFAULT_AGGREGATION):
+        """텍스트의 Bloom 인지단계를 예측 (긴 텍스트는 슬라이딩 윈도우로 전체를 반영)"""
+        return self.predict_long_batch([text], batch_size=1, aggregation=aggregation)[0]["label"]
+    
+    def predict_batch(self, texts, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        여러 텍스트의 Bloom 인지단계를 한 번에 예측합니다.
+        전체 텍스트를 한 번에 토큰화한 뒤 시퀀스 길이순으로 버킷을 나눠 패딩을 최소화합니다.
         
-        # 모델 로드
-        self.model = BloomBERT()
-        self.model.load_state_dict(torch.load(model_path, map_location=self.device))
-        self.model.to(self.device)
-        self.model.eval()
+        Args:
+            texts (list): 분류할 텍스트 리스트
+            batch_size (int): 배치당 최대 텍스트 수
         
-        # 토크나이저 로드
-        self.tokenizer = DistilBertTokenizer.from_pretrained("distilbert-base-uncased")
+        Returns:
+            list: 입력 순서와 동일한 {"label": str, "probabilities": {카테고리: 확률}} 리스트
+        """
+        texts = [t or "" for t in texts]
+        results = [_unknown_prediction() for _ in texts]
+        if not texts:
+            return results
         
-        print(f"✅ BloomBERT 모델 로드 완료 (Device: {self.device})")
+        try:
+            # 전체 텍스트 일괄 토큰화 (패딩 없이)
+            encodings = self.tokenizer(texts, truncation=True, max_length=MAX_SEQ_LEN)
+        except Exception as e:
+            print(f"⚠️ Bloom 분류 중 오류: {e}")
+            return [_unknown_prediction(failed=True) for _ in texts]
+        
+        # 길이순 정렬 → 인접한 길이끼리 배치 구성
+        order = sorted(range(len(texts)), key=lambda i: len(encodings["input_ids"][i]))
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            try:
+                padded = self.tokenizer.pad(
+                    {
+                        "input_ids": [encodings["input_ids"][i] for i in bucket],
+                        "attention_mask": [encodings["attention_mask"][i] for i in bucket],
+                    },
+                    return_tensors="pt"
+                )
+                logits = self._forward(padded["input_ids"], padded["attention_mask"])
+                for i, row in zip(bucket, torch.softmax(logits, dim=1).cpu().tolist()):
+                    results[i] = _format_prediction(row)
+            except Exception as e:
+                print(f"⚠️ Bloom 분류 중 오류: {e}")
+                for i in bucket:
+                    results[i] = _unknown_prediction(failed=True)
+        
+        return results
+    
+    def predict_long_batch(self, texts, batch_size=DEFAULT_BATCH_SIZE, window_size=MAX_SEQ_LEN,
+                           stride=DEFAULT_WINDOW_STRIDE, aggregation=DEFAULT_AGGREGATION):
+        """
+        긴 텍스트를 잘라내지 않고 겹치는 토큰 윈도우로 나누어 분류합니다.
+        
+        윈도우를 순서대로 만들면서 batch_size x WINDOW_SORT_CHUNK_BATCHES개씩 묶음을 가져와
+        묶음 안에서 토큰 길이순으로 정렬해 고정 크기 배치로 추론하고(패딩 최소화),
+        텍스트별로 윈도우 logits를 누적 집계합니다. 보관하는 윈도우 토큰 ID와 추론 메모리 모두
+        묶음/배치 크기로 제한되므로 텍스트 수와 길이에 관계없이 메모리가 일정합니다.
+        window_size 이하의 텍스트는 윈도우 1개로 처리되어 predict_batch와 동일한 결과를 냅니다.
+        추론에 실패한 윈도우가 있는 텍스트는 일부 윈도우만으로 판단하지 않고 Unknown으로 반환합니다.
+        
+        Args:
+            texts (list): 분류할 텍스트 리스트
+            batch_size (int): 배치당 윈도우 수
+            window_size (int): 특수 토큰을 포함한 윈도우 길이
+            stride (int): 인접 윈도우 간 겹치는 토큰 수
+            aggregation (str): 윈도우 logits 집계 방식 ("mean", "max", "attention")
+        
+        Returns:
+            list: 입력 순서와 동일한 {"label", "probabilities", "num_windows"} 리스트
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"지원하지 않는 집계 방식: {aggregation} (가능: {AGGREGATIONS})")
+        
+        texts = [t or "" for t in texts]
+        aggregators = [_LogitAggregator(aggregation) for _ in texts]
+        failed = set()
+        
+        # 묶음 단위 길이순 정렬 → 인접한 길이의 윈도우끼리 배치 구성 (긴 텍스트의 마지막 윈도우도 짧은 윈도우와 묶임)
+        windows = self._iter_windows(texts, window_size, stride)
+        chunk_size = batch_size * WINDOW_SORT_CHUNK_BATCHES
+        while True:
+            chunk = sorted(itertools.islice(windows, chunk_size), key=lambda w: len(w[1]))
+            if not chunk:
+                break
+            for start in range(0, len(chunk), batch_size):
+                self._run_window_batch(chunk[start:start + batch_size], aggregators, failed)
+        
+        results = []
+        for text_idx, agg in enumerate(aggregators):
+            if text_idx in failed:
+                results.append(_unknown_prediction(failed=True))
+                continue
+            logits = agg.result()
+            if logits is None:
+                results.append(_unknown_prediction())
+                continue
+            prediction = _format_prediction(torch.softmax(logits, dim=0).tolist())
+            prediction["num_windows"] = agg.count
+            results.append(prediction)
+        return results
     
-    def predict_bloom_category(self, text):
-        """텍스트의 Bloom 인지단계를 예측"""
+    def _iter_windows(self, texts, window_size, stride):
+        """(텍스트 인덱스, 특수 토큰이 포함된 윈도우 토큰 ID) 를 순서대로 생성"""
+        content_len = window_size - self.tokenizer.num_special_tokens_to_add()
+        step = max(1, content_len - stride)
+        for text_idx, text in enumerate(texts):
+            ids = self.tokenizer(text, add_special_tokens=False, truncation=False, verbose=False)["input_ids"]
+            start = 0
+            while True:
+                chunk = ids[start:start + content_len]
+                yield text_idx, self.tokenizer.build_inputs_with_special_tokens(chunk)
+                if start + content_len >= len(ids):
+                    break
+                start += step
+    
+    def _run_window_batch(self, batch, aggregators, failed):
+        """윈도우 배치를 추론하고 텍스트별 집계기에 logits를 누적 (실패하면 해당 텍스트를 failed에 기록)"""
         try:
-            # 텍스트 토큰화
-            encodings = self.tokenizer(text, truncation=True, padding=True, return_tensors="pt")
-            input_ids = encodings["input_ids"].to(self.device)
-            attention_mask = encodings["attention_mask"].to(self.device)
-            
-            # 예측 수행
-            with torch.no_grad():
-                outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
-                pred_class = int(torch.argmax(outputs, dim=1).cpu().numpy()[0])
-            
-            return BLOOM_CATEGORIES[pred_class]
-            
+            padded = self.tokenizer.pad(
+                {
+                    "input_ids": [ids for _, ids in batch],
+                    "attention_mask": [[1] * len(ids) for _, ids in batch],
+                },
+                return_tensors="pt"
+            )
+            logits = self._forward(padded["input_ids"], padded["attention_mask"]).float().cpu()
+            for (text_idx, _), row in zip(batch, logits):
+                aggregators[text_idx].add(row)
         except Exception as e:
             print(f"⚠️ Bloom 분류 중 오류: {e}")
-            return "Unknown"
+            failed.update(text_idx for text_idx, _ in batch)
+    
+    def _forward(self, input_ids, attention_mask):
+        """추론 모드로 모델을 실행하여 logits를 반환"""
+        with torch.inference_mode():
+            return self.model(
+                input_ids=input_ids.to(self.device),
+                attention_mask=attention_mask.to(self.device)
+            )
     
-    def predict_segments(self, segments):
-        """세그먼트 리스트의 각 자막에 대해 Bloom 분류 수행"""
+    def predict_segments(self, segments, batch_size=DEFAULT_BATCH_SIZE, long_document=True,
+                         aggregation=DEFAULT_AGGREGATION):
+        """
+        세그먼트 리스트의 각 자막에 대해 Bloom 분류 수행 (배치 추론)
+        long_document가 True이면 512 토큰을 넘는 자막도 슬라이딩 윈도우로 전체를 반영합니다.
+        """
         print(f"\n🧠 Bloom 인지단계 분류 시작...")
         
+        targets = [i for i, seg in enumerate(segments) if getattr(seg, 'subtitles', None)]
+        texts = [segments[i].subtitles for i in targets]
+        if long_document:
+            predictions = self.predict_long_batch(texts, batch_size=batch_size, aggregation=aggregation)
+        else:
+            predictions = self.predict_batch(texts, batch_size=batch_size)
+        prediction_map = dict(zip(targets, predictions))
+        
         for i, segment in enumerate(segments):
-            if hasattr(segment, 'subtitles') and segment.subtitles:
-                # 자막 텍스트로 Bloom 분류
-                bloom_category = self.predict_bloom_category(segment.subtitles)
-                segment.bloom_category = bloom_category
-                
-                print(f"   세그먼트 {i+1}: {bloom_category}")
+            prediction = prediction_map.get(i)
+            if prediction is not None:
+                segment.bloom_category = prediction["label"]
+                segment.bloom_probabilities = prediction["probabilities"]
+                segment.bloom_failed = prediction.get("failed", False)
+                print(f"   세그먼트 {i+1}: {prediction['label']}")
             else:
                 segment.bloom_category = "Unknown"
+                segment.bloom_probabilities = {}
+                segment.bloom_failed = False
                 print(f"   세그먼트 {i+1}: 자막 없음")
         
         print("✅ Bloom 분류 완료!")
         return segments
+    
+    def predict_segment_files(self, json_paths, batch_size=DEFAULT_BATCH_SIZE, aggregation=DEFAULT_AGGREGATION):
+        """
+        저장된 세그먼트 JSON 파일들의 bloom_category를 일괄 재분류합니다.
+        모든 파일의 세그먼트를 모아 한 번의 배치 추론(긴 자막은 슬라이딩 윈도우)으로 처리하고,
+        JSON 파일과 함께 세그먼트 저장소(segments.sqlite)와 카탈로그도 갱신합니다.
+        (카탈로그 리비전이 바뀌므로 추천 색인은 다음 조회 시 다시 만들어짐)
+        추론에 실패한 세그먼트는 기존 분류를 유지합니다.
+        
+        Args:
+            json_paths (list): segments_with_subtitles_*.json 파일 경로 리스트
+            batch_size (int): 배치당 최대 윈도우 수
+            aggregation (str): 윈도우 logits 집계 방식 (분석 파이프라인과 같은 DEFAULT_AGGREGATION)
+        
+        Returns:
+            int: 재분류된 세그먼트 수
+        """
+        from Backend.controllers.catalog import get_catalog, parse_segments_json_path
+        from Backend.controllers.segment_store import SegmentStore
+
+        documents = []
+        targets = []  # (문서 인덱스, 세그먼트 위치, 세그먼트 dict)
+        for path in json_paths:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            documents.append((path, data, {}))
+            for position, item in enumerate(data.get("segments", [])):
+                if item.get("subtitles"):
+                    targets.append((len(documents) - 1, position, item))
+        
+        print(f"🧠 {len(documents)}개 파일, {len(targets)}개 세그먼트 재분류 중...")
+        predictions = self.predict_long_batch([item["subtitles"] for _, _, item in targets],
+                                              batch_size=batch_size, aggregation=aggregation)
+        count = 0
+        for (doc_idx, position, item), prediction in zip(targets, predictions):
+            if prediction.get("failed"):
+                continue
+            item["bloom_category"] = prediction["label"]
+            item["bloom_probabilities"] = prediction["probabilities"]
+            documents[doc_idx][2][position] = prediction
+            count += 1
+        
+        catalog = get_catalog()
+        for path, data, updated in documents:
+            if not updated:
+                continue
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+            parsed = parse_segments_json_path(path)
+            if parsed is None:
+                print(f"⚠️ 영상 ID/언어를 알 수 없어 JSON 파일만 갱신했습니다: {path}")
+                continue
+            video_id, lang = parsed
+            store = SegmentStore(video_id)
+            store.update_bloom(lang, updated)
+            # 기존 기록의 모델 정보/완료 여부는 유지하고 챕터 분류만 교체
+            existing = catalog.get_analysis(video_id, lang, include_incomplete=True)
+            chapters = store.load_chapters(lang) if lang in store.languages() else data.get("segments", [])
+            catalog.record_analysis(
+                video_id, lang, chapters,
+                models=existing["models"] if existing else None,
+                store_path=store.db_path if store.exists() else None,
+                json_path=path,
+                duration=existing["duration"] if existing else None,
+                complete=existing["complete"] if existing else True
+            )
+        
+        print(f"✅ 저장된 세그먼트 재분류 완료! ({count}/{len(targets)}개)")
+        return count
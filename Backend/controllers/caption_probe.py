@@ -0,0 +1,103 @@
+"""
+영상별 자막 제공 여부 확인 (검색 결과 필터링용)
+- 후보 영상의 자막 목록 조회를 제한된 스레드 풀에서 동시에 실행
+- 검색 순서를 유지하면서 조건을 만족하는 영상이 limit개 모이면 남은 조회는 취소
+- 조회 결과(수동/자동 생성 자막 언어 목록)는 응답 캐시(http_cache)에 저장하여 워커 간에 공유
+- 이미 분석한 영상은 TranscriptStore에 저장된 자막 목록을 사용 (유효 기간 안이면 네트워크 요청 없음)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+from youtube_transcript_api import TranscriptsDisabled
+from Backend.controllers.http_cache import cache_key, get_response_cache
+from Backend.controllers.transcript import TranscriptStore, list_transcripts
+
+# 자막 목록 조회 동시 실행 수
+PROBE_MAX_WORKERS = 8
+# 응답 캐시에 저장할 때 사용하는 엔드포인트 이름 (TTL은 http_cache.ENDPOINT_TTLS)
+TRANSCRIPT_LIST_ENDPOINT = "transcript_list"
+PREFERRED_LANGUAGES = ("ko", "en")
+
+
+def get_caption_tracks(video_id: str, use_cache: bool = True) -> Optional[Dict[str, List[str]]]:
+    """
+    영상에서 제공하는 자막 언어 목록을 반환합니다.
+
+    Returns:
+        {"manual": [언어 코드...], "generated": [언어 코드...]}
+        자막이 꺼진 영상은 빈 목록, 네트워크 오류 등으로 확인하지 못하면 None (캐시하지 않음)
+    """
+    if use_cache:
+        # 저장된 목록은 TRANSCRIPT_LIST_TTL이 지나면 무시하고 다시 조회
+        stored = TranscriptStore(video_id).cached_tracks()
+        if stored is not None:
+            tracks = {"manual": [], "generated": []}
+            for t in stored:
+                tracks["generated" if t["is_generated"] else "manual"].append(t["language_code"])
+            return tracks
+
+    cache = get_response_cache() if use_cache else None
+    key = cache_key(TRANSCRIPT_LIST_ENDPOINT, {"video_id": video_id})
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None and cached.is_fresh():
+            return cached.body
+
+    try:
+        tracks = {"manual": [], "generated": []}
+        for t in list_transcripts(video_id):
+            tracks["generated" if t.is_generated else "manual"].append(t.language_code)
+    except TranscriptsDisabled:
+        tracks = {"manual": [], "generated": []}
+    except Exception as e:
+        print(f"⚠️ 자막 목록을 확인할 수 없습니다: {video_id} ({e})")
+        return None
+
+    if cache is not None:
+        cache.put(key, TRANSCRIPT_LIST_ENDPOINT, tracks)
+    return tracks
+
+
+def has_preferred_captions(tracks: Optional[Dict[str, List[str]]], allow_generated: bool = False,
+                           languages: Sequence[str] = PREFERRED_LANGUAGES) -> bool:
+    """선호 언어(한국어/영어)의 수동 자막이 있는지 (allow_generated면 자동 생성 자막도 허용)"""
+    if not tracks:
+        return False
+    kinds = ("manual", "generated") if allow_generated else ("manual",)
+    return any(code.startswith(lang) for kind in kinds for code in tracks.get(kind, []) for lang in languages)
+
+
+def probe_captions(video_ids: Iterable[str], limit: Optional[int] = None, allow_generated: bool = False,
+                   max_workers: int = PROBE_MAX_WORKERS) -> List[str]:
+    """
+    선호 언어 자막이 있는 영상 ID를 입력 순서대로 반환합니다.
+    앞에서부터 limit개를 찾으면 나머지는 조회하지 않습니다.
+
+    Args:
+        video_ids: 후보 영상 ID (검색 순위 순)
+        limit: 필요한 영상 수 (None이면 전부 확인)
+        allow_generated: 자동 생성 자막도 허용할지
+        max_workers: 동시에 조회할 최대 영상 수
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    if limit is not None and limit <= 0:
+        return []
+
+    found: List[str] = []
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {}
+        submitted = 0
+        for idx, vid in enumerate(video_ids):
+            # 현재 위치부터 max_workers개를 미리 조회해 둠 (완료된 것은 캐시에 남음)
+            while submitted < len(video_ids) and submitted < idx + max_workers:
+                futures[submitted] = executor.submit(get_caption_tracks, video_ids[submitted])
+                submitted += 1
+            if has_preferred_captions(futures.pop(idx).result(), allow_generated=allow_generated):
+                found.append(vid)
+                if limit is not None and len(found) >= limit:
+                    break
+    finally:
+        # 조건을 채웠으면 대기 중인 조회는 취소 (실행 중인 조회는 끝나면 캐시에 저장됨)
+        executor.shutdown(wait=False, cancel_futures=True)
+    return found
@@ -0,0 +1,367 @@
+"""
+분석된 영상 카탈로그 (SQLite)
+- 분석이 끝난 영상/언어별 메타데이터(제목, 과목, 길이, 사용 모델)와 챕터(Bloom 단계, 길이)를 한 곳에 색인
+- 파일 시스템을 뒤지지 않고 "과목 X에서 7분 이하인 Analyse 단계 챕터" 같은 조회를 인덱스로 처리
+- 카탈로그 파일이 처음 만들어질 때 기존 output 폴더의 결과를 한 번 가져옴
+"""
+
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from Backend.controllers.file_io import get_output_root
+from Backend.controllers.segment_store import SegmentStore, SEGMENT_STORE_FILENAME
+
+CATALOG_FILENAME = "catalog.sqlite"
+
+_LEGACY_JSON_PATTERN = re.compile(r"^(?P<video_id>.+)_segments_with_subtitles(?:_(?P<suffix>kr|en))?\.json$")
+_JSON_PATTERN = re.compile(r"^segments_with_subtitles_(?P<suffix>kr|en)\.json$")
+
+
+def get_catalog_path() -> str:
+    return os.path.join(get_output_root(), CATALOG_FILENAME)
+
+
+def _language_from_suffix(suffix: Optional[str]) -> str:
+    return "ko" if suffix == "kr" else "en"
+
+
+def parse_segments_json_path(path: str) -> Optional[Tuple[str, str]]:
+    """segments_with_subtitles JSON 파일 경로에서 (video_id, 언어 코드)를 구합니다. 형식이 다르면 None"""
+    name = os.path.basename(path)
+    m = _JSON_PATTERN.match(name)
+    if m:
+        return os.path.basename(os.path.dirname(os.path.abspath(path))), _language_from_suffix(m.group("suffix"))
+    m = _LEGACY_JSON_PATTERN.match(name)
+    if m:
+        return m.group("video_id"), _language_from_suffix(m.group("suffix"))
+    return None
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class Catalog:
+    """분석된 영상과 챕터의 SQLite 카탈로그"""
+
+    def __init__(self, db_path: Optional[str] = None, sync_existing: bool = True):
+        self.db_path = db_path or get_catalog_path()
+        is_new = not os.path.exists(self.db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS videos (
+                    video_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    subject TEXT,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_videos_subject ON videos(subject);
+                CREATE TABLE IF NOT EXISTS analyses (
+                    video_id TEXT NOT NULL,
+                    language_code TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    num_chapters INTEGER NOT NULL,
+                    models TEXT NOT NULL DEFAULT '{}',
+                    store_path TEXT,
+                    json_path TEXT,
+                    analyzed_at TEXT NOT NULL,
+                    complete INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (video_id, language_code)
+                );
+                CREATE TABLE IF NOT EXISTS chapters (
+                    video_id TEXT NOT NULL,
+                    language_code TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    start_time REAL NOT NULL,
+                    end_time REAL NOT NULL,
+                    duration REAL NOT NULL,
+                    bloom_category TEXT,
+                    PRIMARY KEY (video_id, language_code, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_chapters_bloom ON chapters(bloom_category, duration);
+                CREATE INDEX IF NOT EXISTS idx_chapters_duration ON chapters(duration);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+            # 카탈로그 파일을 새로 만들면 리비전이 이전 색인과 겹치지 않도록 고유 ID를 붙임
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('catalog_id', ?)", (uuid.uuid4().hex,))
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('revision', '0')")
+            # complete 열이 없던 이전 카탈로그는 기존 결과를 모두 완료된 분석으로 취급
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(analyses)").fetchall()}
+            if "complete" not in columns:
+                conn.execute("ALTER TABLE analyses ADD COLUMN complete INTEGER NOT NULL DEFAULT 1")
+        if is_new and sync_existing:
+            self.sync_from_output()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _bump_revision(conn: sqlite3.Connection):
+        """파생 색인(추천 색인 등)에 영향을 주는 변경이 있을 때 리비전을 올립니다."""
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'")
+
+    # ------------------------------------------------------------------ 기록
+
+    def register_video(self, video_id: str, title: Optional[str] = None, subject: Optional[str] = None):
+        """
+        영상 메타데이터(제목, 과목)를 기록합니다. None인 값은 기존 값을 유지합니다.
+        값이 바뀌지 않으면 아무것도 기록하지 않습니다. (영상을 고를 때마다 호출되므로 리비전을 올리지 않음)
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = conn.execute(
+                    "INSERT INTO videos (video_id, title, subject, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(video_id) DO UPDATE SET "
+                    "title = COALESCE(excluded.title, videos.title), "
+                    "subject = COALESCE(excluded.subject, videos.subject), "
+                    "updated_at = excluded.updated_at "
+                    "WHERE COALESCE(excluded.title, videos.title) IS NOT videos.title "
+                    "OR COALESCE(excluded.subject, videos.subject) IS NOT videos.subject",
+                    (video_id, title or None, subject or None, _now())
+                )
+                # 분석 결과가 있는 영상의 제목/과목이 바뀌면 추천 항목도 바뀜
+                if cur.rowcount and conn.execute(
+                        "SELECT 1 FROM analyses WHERE video_id = ? LIMIT 1", (video_id,)).fetchone():
+                    self._bump_revision(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def record_analysis(self, video_id: str, language_code: str, chapters: List[Dict[str, Any]],
+                        models: Optional[Dict[str, Any]] = None, store_path: Optional[str] = None,
+                        json_path: Optional[str] = None, duration: Optional[float] = None,
+                        complete: bool = True):
+        """
+        분석 결과를 기록합니다. 같은 영상/언어의 기존 챕터는 교체합니다.
+
+        Args:
+            chapters: {"title", "start_time", "end_time", "bloom_category"} dict 리스트
+            models: 분석에 사용한 모델 이름/버전
+            duration: 영상 길이(초). None이면 마지막 챕터의 종료 시각
+            complete: False이면 요약/Bloom 분류 일부가 실패한 결과로 기록하여,
+                      has_analysis/get_analysis가 분석되지 않은 영상으로 취급 (다시 분석 대상)
+        """
+        rows = []
+        for position, ch in enumerate(chapters):
+            start, end = float(ch.get("start_time") or 0.0), float(ch.get("end_time") or 0.0)
+            rows.append((video_id, language_code, position, str(ch.get("title") or ""),
+                         start, end, end - start, ch.get("bloom_category")))
+        if duration is None:
+            duration = max((r[5] for r in rows), default=0.0)
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO videos (video_id, updated_at) VALUES (?, ?) ON CONFLICT(video_id) DO NOTHING",
+                    (video_id, _now())
+                )
+                conn.execute("DELETE FROM chapters WHERE video_id = ? AND language_code = ?", (video_id, language_code))
+                conn.executemany("INSERT INTO chapters VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO analyses (video_id, language_code, duration, num_chapters, models, "
+                    "store_path, json_path, analyzed_at, complete) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (video_id, language_code, float(duration), len(rows),
+                     json.dumps(models or {}, ensure_ascii=False, default=str),
+                     store_path, json_path, _now(), int(bool(complete)))
+                )
+                self._bump_revision(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def record_segments(self, video_id: str, language_code: str, segments,
+                        models: Optional[Dict[str, Any]] = None, json_path: Optional[str] = None,
+                        complete: bool = True):
+        """VideoSegment 리스트(bloom_category 속성 포함)로 분석 결과를 기록합니다."""
+        chapters = [
+            {"title": seg.title, "start_time": seg.start_time, "end_time": seg.end_time,
+             "bloom_category": getattr(seg, "bloom_category", "Unknown")}
+            for seg in segments
+        ]
+        store = SegmentStore(video_id)
+        self.record_analysis(video_id, language_code, chapters, models=models,
+                             store_path=store.db_path if store.exists() else None, json_path=json_path,
+                             complete=complete)
+
+    def remove_analysis(self, video_id: str, language_code: str):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM chapters WHERE video_id = ? AND language_code = ?", (video_id, language_code))
+            cur = conn.execute("DELETE FROM analyses WHERE video_id = ? AND language_code = ?", (video_id, language_code))
+            if cur.rowcount:
+                self._bump_revision(conn)
+            conn.execute("COMMIT")
+
+    # ------------------------------------------------------------------ 조회
+
+    def has_analysis(self, video_id: str, language_code: Optional[str] = None,
+                     include_incomplete: bool = False) -> bool:
+        return self.get_analysis(video_id, language_code, include_incomplete=include_incomplete) is not None
+
+    def get_analysis(self, video_id: str, language_code: Optional[str] = None,
+                     include_incomplete: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        영상의 분석 정보를 반환합니다. language_code가 없으면 언어 코드 순으로 첫 번째 결과
+        요약/Bloom 분류 일부가 실패한 결과는 include_incomplete=True일 때만 반환합니다.
+        """
+        query = ("SELECT a.*, v.title, v.subject FROM analyses a JOIN videos v ON v.video_id = a.video_id "
+                 "WHERE a.video_id = ?")
+        params: List[Any] = [video_id]
+        if not include_incomplete:
+            query += " AND a.complete = 1"
+        if language_code:
+            query += " AND a.language_code = ?"
+            params.append(language_code)
+        query += " ORDER BY a.language_code LIMIT 1"
+        with self._connect() as conn:
+            row = conn.execute(query, params).fetchone()
+        if row is None:
+            return None
+        item = dict(row)
+        item["models"] = json.loads(item["models"] or "{}")
+        item["complete"] = bool(item["complete"])
+        return item
+
+    def revision(self) -> str:
+        """
+        분석 결과가 기록/삭제되거나 분석된 영상의 제목/과목이 바뀌면 달라지는 문자열 (파생 색인의 재생성 여부 판단용)
+        영상 선택(register_video)만으로는 바뀌지 않습니다.
+        """
+        with self._connect() as conn:
+            rows = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('catalog_id', 'revision')").fetchall())
+        return f"{rows.get('catalog_id', '')}:{rows.get('revision', '0')}"
+
+    def list_videos(self, subject: Optional[str] = None, language_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """분석된 영상 목록"""
+        query = ("SELECT a.video_id, a.language_code, a.duration, a.num_chapters, a.analyzed_at, v.title, v.subject "
+                 "FROM analyses a JOIN videos v ON v.video_id = a.video_id WHERE 1 = 1")
+        params: List[Any] = []
+        if subject:
+            query += " AND v.subject = ?"
+            params.append(subject)
+        if language_code:
+            query += " AND a.language_code = ?"
+            params.append(language_code)
+        query += " ORDER BY a.analyzed_at DESC"
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    def find_chapters(self, bloom_category: Optional[str] = None, subject: Optional[str] = None,
+                      max_duration: Optional[float] = None, min_duration: Optional[float] = None,
+                      language_code: Optional[str] = None, exclude_video_id: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        조건에 맞는 챕터를 찾습니다. 예) Analyse 단계이면서 과목 X에서 7분 이하인 챕터:
+            find_chapters(bloom_category="Analyse", subject="X", max_duration=420)
+        """
+        query = ("SELECT c.*, v.title AS video_title, v.subject FROM chapters c "
+                 "JOIN videos v ON v.video_id = c.video_id WHERE 1 = 1")
+        params: List[Any] = []
+        if bloom_category:
+            query += " AND c.bloom_category = ?"
+            params.append(bloom_category)
+        if max_duration is not None:
+            query += " AND c.duration <= ?"
+            params.append(float(max_duration))
+        if min_duration is not None:
+            query += " AND c.duration >= ?"
+            params.append(float(min_duration))
+        if subject:
+            query += " AND v.subject = ?"
+            params.append(subject)
+        if language_code:
+            query += " AND c.language_code = ?"
+            params.append(language_code)
+        if exclude_video_id:
+            query += " AND c.video_id != ?"
+            params.append(exclude_video_id)
+        query += " ORDER BY c.video_id, c.language_code, c.position"
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    # ------------------------------------------------------------------ 기존 결과 가져오기
+
+    def sync_from_output(self, output_root: Optional[str] = None) -> int:
+        """
+        output 폴더의 기존 분석 결과(세그먼트 저장소, JSON)를 카탈로그에 기록합니다.
+        카탈로그 도입 이전 결과를 가져오기 위한 것으로, 가져온 결과 수를 반환합니다.
+        """
+        output_root = output_root or get_output_root()
+        if not os.path.isdir(output_root):
+            return 0
+
+        found: Dict[tuple, Dict[str, Any]] = {}
+        # 이전 구조: output/{video_id}_segments_with_subtitles*.json
+        for path in glob.glob(os.path.join(glob.escape(output_root), "*_segments_with_subtitles*.json")):
+            m = _LEGACY_JSON_PATTERN.match(os.path.basename(path))
+            if m:
+                found[(m.group("video_id"), _language_from_suffix(m.group("suffix")))] = {"json_path": path}
+        # 새 구조: output/{video_id}/segments_with_subtitles_*.json, output/{video_id}/segments.sqlite
+        for video_dir in glob.glob(os.path.join(glob.escape(output_root), "*", "")):
+            video_id = os.path.basename(os.path.normpath(video_dir))
+            for path in glob.glob(os.path.join(glob.escape(video_dir), "segments_with_subtitles_*.json")):
+                m = _JSON_PATTERN.match(os.path.basename(path))
+                if m:
+                    found[(video_id, _language_from_suffix(m.group("suffix")))] = {"json_path": path}
+            if os.path.exists(os.path.join(video_dir, SEGMENT_STORE_FILENAME)):
+                for lang in SegmentStore(video_id).languages():
+                    found.setdefault((video_id, lang), {})["store"] = True
+
+        count = 0
+        for (video_id, lang), info in found.items():
+            try:
+                if info.get("store"):
+                    store = SegmentStore(video_id)
+                    chapters = store.load_chapters(lang)
+                    store_path = store.db_path
+                else:
+                    with open(info["json_path"], "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    chapters = data.get("segments", []) if isinstance(data, dict) else data
+                    store_path = None
+                self.record_analysis(video_id, lang, chapters, store_path=store_path, json_path=info.get("json_path"))
+                count += 1
+            except Exception as e:
+                print(f"[WARN] 기존 결과를 카탈로그에 추가하지 못했습니다: {video_id} ({lang}) ({e})")
+        if count:
+            print(f"📚 기존 분석 결과 {count}개를 카탈로그에 추가했습니다.")
+        return count
+
+
+_default_catalog = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """프로세스 전역 기본 카탈로그를 반환합니다."""
+    global _default_catalog
+    with _default_catalog_lock:
+        if _default_catalog is None:
+            _default_catalog = Catalog()
+        return _default_catalog
@@ -0,0 +1,152 @@
+"""
+동적 계획법(DP) 기반 최적 변화점(change-point) 분할
+- 구간 비용: 정규화된 임베딩의 구간 내 제곱 오차 합 (구간 평균과의 거리)
+- 임베딩 누적합과 Gram 행렬로 모든 구간의 비용을 한 번에 계산
+- 챕터 수(K)와 최소 챕터 길이를 제약으로 직접 두고, 한 번의 DP로 K별 최적 분할을 구함
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+# 챕터 하나를 늘릴 때의 비용 패널티 배율 (클수록 챕터 수가 적어짐)
+DEFAULT_PENALTY_SCALE = 1.0
+
+
+def segment_cost_matrix(embeddings: np.ndarray) -> np.ndarray:
+    """
+    모든 구간 [i, j) (0 <= i < j <= N)의 비용 행렬 (N+1, N+1)을 계산합니다.
+
+    cost(i, j) = sum_{t in [i, j)} |x_t|^2 - |sum_{t in [i, j)} x_t|^2 / (j - i)
+    구간 합의 제곱 노름은 누적합 P의 Gram 행렬 G = P P^T 로 |P_j - P_i|^2 = G_jj + G_ii - 2 G_ij 입니다.
+    i >= j 인 칸은 inf 입니다.
+    """
+    x = np.asarray(embeddings, dtype=np.float64)
+    n = len(x)
+    prefix = np.zeros((n + 1, x.shape[1]), dtype=np.float64)
+    np.cumsum(x, axis=0, out=prefix[1:])
+    sq_prefix = np.concatenate(([0.0], np.cumsum(np.einsum("ij,ij->i", x, x))))
+
+    gram = prefix @ prefix.T
+    diag = np.diag(gram)
+    sum_sq = diag[None, :] + diag[:, None] - 2.0 * gram
+
+    idx = np.arange(n + 1)
+    lengths = idx[None, :] - idx[:, None]
+    valid = lengths > 0
+    cost = np.full((n + 1, n + 1), np.inf)
+    cost[valid] = (sq_prefix[None, :] - sq_prefix[:, None])[valid] - sum_sq[valid] / lengths[valid]
+    # 부동소수점 오차로 생기는 아주 작은 음수 제거
+    np.maximum(cost, 0.0, out=cost)
+    return cost
+
+
+def duration_mask(window_times: Sequence[Tuple[float, float]], min_duration: float) -> np.ndarray:
+    """구간 [i, j)의 길이(창 i 시작 ~ 창 j-1 종료)가 min_duration 이상인지 나타내는 (N+1, N+1) 마스크"""
+    n = len(window_times)
+    starts = np.array([t[0] for t in window_times], dtype=np.float64)
+    ends = np.array([t[1] for t in window_times], dtype=np.float64)
+    mask = np.zeros((n + 1, n + 1), dtype=bool)
+    # mask[i, j] (j >= 1): ends[j-1] - starts[i] >= min_duration
+    mask[:n, 1:] = (ends[None, :] - starts[:, None]) >= min_duration
+    return mask
+
+
+def solve_segmentation(cost: np.ndarray, max_segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    K = 1..max_segments 개 구간으로 나누는 최소 비용을 DP로 계산합니다.
+
+    Returns:
+        (totals, back)
+        totals[k-1]: k개 구간으로 나눈 최소 총 비용 (불가능하면 inf)
+        back[k-1, j]: [0, j)를 k개로 나눌 때 마지막 구간의 시작 인덱스
+    """
+    n = cost.shape[0] - 1
+    max_segments = max(1, min(max_segments, n))
+    back = np.zeros((max_segments, n + 1), dtype=np.int64)
+    totals = np.full(max_segments, np.inf)
+
+    best = cost[0].copy()  # 1개 구간: [0, j)
+    totals[0] = best[n]
+    for k in range(2, max_segments + 1):
+        candidates = best[:, None] + cost
+        back[k - 1] = np.argmin(candidates, axis=0)
+        best = candidates[back[k - 1], np.arange(n + 1)]
+        totals[k - 1] = best[n]
+    return totals, back
+
+
+def backtrack(back: np.ndarray, num_segments: int, n: int) -> List[Tuple[int, int]]:
+    """DP 결과에서 num_segments개 구간의 [start, end) 목록을 복원합니다."""
+    bounds = []
+    end = n
+    for k in range(num_segments, 1, -1):
+        start = int(back[k - 1, end])
+        bounds.append((start, end))
+        end = start
+    bounds.append((0, end))
+    return bounds[::-1]
+
+
+def choose_num_segments(totals: np.ndarray, min_segments: int, max_segments: int,
+                        penalty: float) -> Optional[int]:
+    """
+    목표 범위 안에서 (총 비용 + penalty * K)가 최소인 K를 고릅니다.
+    범위 안에 가능한 K가 없으면 범위와 가장 가까운 가능한 K를 반환합니다.
+    """
+    feasible = [k for k in range(1, len(totals) + 1) if np.isfinite(totals[k - 1])]
+    if not feasible:
+        return None
+    in_range = [k for k in feasible if min_segments <= k <= max_segments]
+    if in_range:
+        return min(in_range, key=lambda k: totals[k - 1] + penalty * k)
+    return min(feasible, key=lambda k: (min(abs(k - min_segments), abs(k - max_segments)), k))
+
+
+def optimal_segment_ranges(embeddings: np.ndarray,
+                           window_times: Sequence[Tuple[float, float]],
+                           min_segments: int,
+                           max_segments: int,
+                           min_duration: float = 0.0,
+                           penalty: Optional[float] = None) -> List[Tuple[int, int]]:
+    """
+    창 임베딩을 목표 챕터 수 범위 안에서 최적으로 분할합니다.
+
+    Args:
+        embeddings: (N, D) 창 임베딩 (내부에서 정규화)
+        window_times: 창별 (시작 시각, 종료 시각)
+        min_segments / max_segments: 목표 챕터 수 범위
+        min_duration: 챕터 최소 길이(초). 만족할 수 없으면 제약 없이 다시 계산
+        penalty: 챕터 하나당 비용 패널티. None이면 (1개 구간 비용 / N) * log(N) * DEFAULT_PENALTY_SCALE
+
+    Returns:
+        창 인덱스 범위 (start_idx, end_idx) 목록 (양 끝 포함, 서로 겹치지 않음)
+    """
+    x = np.asarray(embeddings, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return []
+    if n == 1:
+        return [(0, 0)]
+
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    x = x / np.where(norms > 0, norms, 1.0)
+
+    base_cost = segment_cost_matrix(x)
+    cost = base_cost
+    if min_duration and min_duration > 0:
+        cost = np.where(duration_mask(window_times, min_duration), base_cost, np.inf)
+
+    totals, back = solve_segmentation(cost, max_segments)
+    if not np.isfinite(totals).any():
+        print(f"⚠️ 최소 길이 {min_duration}s 제약을 만족하는 분할이 없어 제약 없이 계산합니다.")
+        cost = base_cost
+        totals, back = solve_segmentation(cost, max_segments)
+
+    if penalty is None:
+        penalty = DEFAULT_PENALTY_SCALE * (base_cost[0, n] / n) * math.log(n)
+
+    k = choose_num_segments(totals, min_segments, max_segments, penalty)
+    if k is None:
+        return [(0, n - 1)]
+    return [(s, e - 1) for s, e in backtrack(back, k, n)]
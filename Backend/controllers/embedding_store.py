@@ -0,0 +1,284 @@
+"""
+텍스트 임베딩 영구 저장소
+- (모델 이름, 텍스트 해시) 키로 임베딩을 디스크에 저장하고 다음 실행에서 재사용
+- 임베딩은 float16 .npy 샤드로 저장하고 memory-map으로 읽어 필요한 행만 메모리에 올림
+- 샤드는 추가만 하므로(append-only) 여러 프로세스가 동시에 써도 안전
+- 작은 샤드가 COMPACT_SHARD_THRESHOLD개를 넘으면 하나로 합쳐, 샤드 목록을 읽는 비용이 계속 늘지 않도록 함
+- 검색어/추천 질의처럼 한 번 쓰고 마는 텍스트는 저장하지 않고 프로세스 안의 LRU 캐시만 사용 (encode_query)
+"""
+
+import json
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from Backend.controllers.result_cache import get_cache_root, hash_text
+
+# 저장 형식이 바뀌면 올려서 기존 샤드를 무시
+EMBEDDING_STORE_VERSION = 1
+EMBEDDING_DTYPE = np.float16
+# 행 수가 COMPACT_TARGET_ROWS 미만인 샤드가 이 개수를 넘으면 하나로 합침
+COMPACT_SHARD_THRESHOLD = 32
+COMPACT_TARGET_ROWS = 65536
+# 질의 임베딩 LRU 캐시 크기 (프로세스별)
+QUERY_CACHE_SIZE = 256
+
+
+def _model_dir_name(model_name: str) -> str:
+    """모델 이름을 폴더 이름으로 사용할 수 있게 변환"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("_") or "model"
+
+
+class _ModelShards:
+    """한 모델의 샤드 목록과 (텍스트 해시 -> (샤드, 행)) 인덱스"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index: Dict[str, Tuple[str, int]] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.loaded_shards = set()
+        # 현재 버전 샤드의 행 수
+        self.shard_rows: Dict[str, int] = {}
+
+    def refresh(self):
+        """디스크에서 아직 읽지 않은 샤드 인덱스를 읽어옵니다. (다른 프로세스가 추가한 샤드 포함)"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            shard = name[:-len(".json")]
+            if shard in self.loaded_shards:
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except Exception as e:
+                print(f"[WARN] 임베딩 샤드 인덱스를 읽을 수 없어 무시합니다: {name} ({e})")
+                continue
+            self.loaded_shards.add(shard)
+            if meta.get("version") != EMBEDDING_STORE_VERSION:
+                continue
+            hashes = meta.get("hashes", [])
+            self.shard_rows[shard] = len(hashes)
+            for row, key in enumerate(hashes):
+                self.index.setdefault(key, (shard, row))
+
+    def reload(self):
+        """샤드 목록을 처음부터 다시 읽습니다. (다른 프로세스가 샤드를 합치면서 기존 샤드를 지운 경우)"""
+        self.index.clear()
+        self.arrays.clear()
+        self.loaded_shards.clear()
+        self.shard_rows.clear()
+        self.refresh()
+
+    def array(self, shard: str) -> np.ndarray:
+        arr = self.arrays.get(shard)
+        if arr is None:
+            arr = np.load(os.path.join(self.directory, f"{shard}.npy"), mmap_mode="r")
+            self.arrays[shard] = arr
+        return arr
+
+
+class EmbeddingStore:
+    """
+    모델별 텍스트 임베딩 저장소.
+
+    {root}/embeddings/{model}/{shard}.npy  : (N, D) float16 임베딩
+    {root}/embeddings/{model}/{shard}.json : 각 행의 텍스트 해시
+
+    인덱스 파일은 임베딩 파일을 쓴 뒤에 생성되므로, 인덱스에 보이는 행은 항상 완전히 기록된 상태입니다.
+    """
+
+    def __init__(self, root: Optional[str] = None, enabled: bool = True):
+        self.root = os.path.join(root or get_cache_root(), 'embeddings')
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self._models: Dict[str, _ModelShards] = {}
+
+    def _shards(self, model_name: str) -> _ModelShards:
+        shards = self._models.get(model_name)
+        if shards is None:
+            shards = _ModelShards(os.path.join(self.root, _model_dir_name(model_name)))
+            shards.refresh()
+            self._models[model_name] = shards
+        return shards
+
+    def lookup(self, model_name: str, texts: Sequence[str]) -> Tuple[List[Optional[np.ndarray]], List[int]]:
+        """
+        저장된 임베딩을 찾습니다.
+
+        Returns:
+            (texts 순서의 임베딩 또는 None 리스트, 저장소에 없는 텍스트의 인덱스 리스트)
+        """
+        if not self.enabled:
+            return [None] * len(texts), list(range(len(texts)))
+
+        keys = [hash_text(t) for t in texts]
+        with self._lock:
+            shards = self._shards(model_name)
+            if any(k not in shards.index for k in keys):
+                shards.refresh()
+            vectors: List[Optional[np.ndarray]] = []
+            missing = []
+            for i, key in enumerate(keys):
+                loc = shards.index.get(key)
+                if loc is None:
+                    vectors.append(None)
+                    missing.append(i)
+                    continue
+                shard, row = loc
+                try:
+                    vectors.append(np.asarray(shards.array(shard)[row], dtype=np.float32))
+                except OSError:
+                    # 다른 프로세스가 샤드를 합치면서 지운 경우: 합쳐진 샤드를 다시 읽어 찾음
+                    shards.reload()
+                    loc = shards.index.get(key)
+                    if loc is None:
+                        vectors.append(None)
+                        missing.append(i)
+                    else:
+                        vectors.append(np.asarray(shards.array(loc[0])[loc[1]], dtype=np.float32))
+        return vectors, missing
+
+    def put_many(self, model_name: str, texts: Sequence[str], embeddings: np.ndarray):
+        """텍스트와 임베딩을 새 샤드로 저장합니다. 이미 저장된 텍스트는 건너뜁니다."""
+        if not self.enabled or len(texts) == 0:
+            return
+        embeddings = np.asarray(embeddings)
+        if embeddings.ndim != 2 or len(embeddings) != len(texts):
+            raise ValueError("texts와 embeddings의 개수가 일치해야 합니다.")
+
+        with self._lock:
+            shards = self._shards(model_name)
+            keys, rows, seen = [], [], set()
+            for i, text in enumerate(texts):
+                key = hash_text(text)
+                if key in shards.index or key in seen:
+                    continue
+                seen.add(key)
+                keys.append(key)
+                rows.append(i)
+            if not keys:
+                return
+
+            self._write_shard(model_name, shards, keys, embeddings[rows].astype(EMBEDDING_DTYPE))
+            small = [name for name, n in shards.shard_rows.items() if n < COMPACT_TARGET_ROWS]
+            if len(small) > COMPACT_SHARD_THRESHOLD:
+                self._compact(model_name, shards, small)
+
+    @staticmethod
+    def _write_shard(model_name: str, shards: _ModelShards, keys: List[str], embeddings: np.ndarray) -> str:
+        """임베딩 파일을 먼저 쓰고 인덱스 파일을 나중에 써서 새 샤드를 추가합니다."""
+        os.makedirs(shards.directory, exist_ok=True)
+        shard = uuid.uuid4().hex
+        npy_path = os.path.join(shards.directory, f"{shard}.npy")
+        json_path = os.path.join(shards.directory, f"{shard}.json")
+
+        tmp_npy = f"{npy_path}.{os.getpid()}.tmp"
+        with open(tmp_npy, "wb") as f:
+            np.save(f, embeddings)
+        os.replace(tmp_npy, npy_path)
+
+        tmp_json = f"{json_path}.{os.getpid()}.tmp"
+        with open(tmp_json, "w", encoding="utf-8") as f:
+            json.dump({"version": EMBEDDING_STORE_VERSION, "model": model_name, "hashes": keys}, f)
+        os.replace(tmp_json, json_path)
+
+        shards.loaded_shards.add(shard)
+        shards.shard_rows[shard] = len(keys)
+        for row, key in enumerate(keys):
+            shards.index[key] = (shard, row)
+        return shard
+
+    def _compact(self, model_name: str, shards: _ModelShards, victims: List[str]):
+        """
+        작은 샤드들을 하나로 합칩니다. 합친 샤드를 먼저 기록한 뒤 기존 샤드를 인덱스 파일부터 지우므로,
+        다른 프로세스는 항상 둘 중 하나에서 같은 임베딩을 찾을 수 있습니다.
+        """
+        victim_set = set(victims)
+        keys = [key for key, (shard, _) in shards.index.items() if shard in victim_set]
+        if not keys:
+            return
+        merged = np.stack([shards.array(shards.index[key][0])[shards.index[key][1]] for key in keys])
+        self._write_shard(model_name, shards, keys, merged.astype(EMBEDDING_DTYPE))
+        for shard in victims:
+            shards.arrays.pop(shard, None)
+            shards.shard_rows.pop(shard, None)
+            for ext in (".json", ".npy"):
+                try:
+                    os.remove(os.path.join(shards.directory, f"{shard}{ext}"))
+                except OSError:
+                    # 다른 프로세스가 이미 지웠거나 (Windows에서) 아직 열려 있는 경우: 다음 정리 때 다시 시도
+                    pass
+        print(f"🗜️ 임베딩 샤드 {len(victims)}개를 하나로 합쳤습니다: {len(keys)}개 임베딩")
+
+    def encode(self, model, model_name: str, texts: Sequence[str]) -> np.ndarray:
+        """
+        저장소에 없는 텍스트만 model.encode로 임베딩하고, 전체 임베딩을 texts 순서대로 반환합니다.
+        """
+        if len(texts) == 0:
+            return np.array([])
+
+        vectors, missing = self.lookup(model_name, texts)
+        if missing:
+            # 같은 텍스트는 한 번만 인코딩
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = np.asarray(model.encode(unique_texts, show_progress_bar=False), dtype=np.float32)
+            self.put_many(model_name, unique_texts, encoded)
+            # 저장소에서 읽은 값과 같은 정밀도로 맞춰, 첫 실행과 재실행의 결과가 같도록 함
+            by_text = dict(zip(unique_texts, encoded.astype(EMBEDDING_DTYPE).astype(np.float32)))
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+            print(f"🧮 임베딩 계산 {len(unique_texts)}개, 저장소 재사용 {len(texts) - len(missing)}개")
+        else:
+            print(f"♻️ 임베딩 저장소 재사용: {len(texts)}개")
+        return np.stack(vectors)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+_disabled_store = EmbeddingStore(enabled=False)
+
+
+def get_embedding_store(enabled: bool = True) -> EmbeddingStore:
+    """
+    프로세스 전역 기본 임베딩 저장소를 반환합니다.
+    enabled=False이면 읽기/쓰기를 하지 않는 저장소를 반환합니다. (캐시를 쓰지 않는 분석 실행용)
+    """
+    global _default_store
+    if not enabled:
+        return _disabled_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = EmbeddingStore()
+        return _default_store
+
+
+_query_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+
+def encode_query(model, model_name: str, text: str) -> np.ndarray:
+    """
+    검색어/추천 질의를 임베딩합니다. (float32 1차원 벡터)
+    질의마다 샤드 파일이 생기지 않도록 영구 저장소 대신 프로세스 안의 LRU 캐시만 사용합니다.
+    """
+    key = (model_name, text)
+    with _query_cache_lock:
+        vector = _query_cache.get(key)
+        if vector is not None:
+            _query_cache.move_to_end(key)
+            return vector
+    vector = np.asarray(model.encode([text], show_progress_bar=False), dtype=np.float32)[0]
+    vector.setflags(write=False)
+    with _query_cache_lock:
+        _query_cache[key] = vector
+        while len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return vector
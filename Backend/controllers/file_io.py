@@ -2,10 +2,11 @@
 파일 입출력 관련 함수들
 """
 
+import glob
 import json
 import os
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from Backend.models.video_segment import VideoSegment
 from .utils import seconds_to_time_str
 
@@ -41,6 +42,40 @@ def ensure_output_dir(video_id: str = None):
     return output_dir
 
 
+def get_output_root() -> str:
+    """output 폴더 경로 (생성하지 않음)"""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(current_dir, 'output')
+
+
+def get_language_suffix(language_code: str) -> str:
+    """결과 파일명에 사용하는 언어 접미사"""
+    return "kr" if language_code == "ko" else "en"
+
+
+def find_segments_output(video_id: str, language_code: Optional[str] = None) -> Optional[str]:
+    """
+    이미 분석된 세그먼트 JSON 파일을 찾습니다.
+    새 구조(output/{video_id}/segments_with_subtitles_*.json)를 먼저 확인하고,
+    없으면 이전 구조(output/{video_id}_segments_with_subtitles*.json)를 확인합니다.
+
+    Args:
+        video_id (str): 영상 ID
+        language_code (str, optional): 지정하면 해당 언어 결과만 찾음
+
+    Returns:
+        Optional[str]: 파일 경로 (없으면 None)
+    """
+    output_dir = get_output_root()
+    video_dir = os.path.join(output_dir, video_id)
+    suffix = get_language_suffix(language_code) if language_code else "*"
+
+    found = sorted(glob.glob(os.path.join(glob.escape(video_dir), f"segments_with_subtitles_{suffix}.json")))
+    if not found:
+        found = sorted(glob.glob(os.path.join(glob.escape(output_dir), f"{glob.escape(video_id)}_segments_with_subtitles*.json")))
+    return found[0] if found else None
+
+
 def save_segments_to_json(segments: List[VideoSegment], video_id: str, output_path: str = None):
     """
     세그먼트 정보를 JSON 파일로 저장합니다.
@@ -126,10 +161,20 @@ def save_segments_to_txt(segments: List[VideoSegment], video_id: str, output_pat
     print(f"✅ 세그먼트 TXT 저장 완료: {output_path}")
 
 
-def save_segments_with_subtitles_to_json(segments: List[VideoSegment], video_id: str, output_path: str = None, language_code: str = 'ko'):
+def save_segments_with_subtitles_to_json(segments: List[VideoSegment], video_id: str, output_path: str = None, language_code: str = 'ko',
+                                         summaries: Optional[List[str]] = None, summary_batch_size: int = 8,
+                                         write_json: bool = True):
     """
-    자막이 매핑된 세그먼트 정보를 JSON 파일로 저장합니다.
+    자막이 매핑된 세그먼트 정보를 영상별 세그먼트 저장소(segments.sqlite)와 JSON 파일로 저장합니다.
     AI 요약을 포함합니다.
+
+    Args:
+        summaries: 미리 생성된 세그먼트별 요약 (None이면 배치 요약을 수행)
+        summary_batch_size: 배치 요약 시 배치 크기
+        write_json: 호환용 JSON 파일도 저장할지 여부
+
+    Returns:
+        저장한 JSON 파일 경로 (write_json=False이면 None)
     """
     # 영상 ID별 폴더 생성
     video_dir = ensure_output_dir(video_id)
@@ -143,7 +188,7 @@ def save_segments_with_subtitles_to_json(segments: List[VideoSegment], video_id:
     
     if output_path is None:
         # 언어 코드를 파일명에 포함
-        lang_suffix = "kr" if language_code == "ko" else "en"
+        lang_suffix = get_language_suffix(language_code)
         # 영상 ID 폴더 안에 저장, 파일명에서 video_id 제거 (폴더명에 이미 포함)
         output_path = os.path.join(video_dir, f'segments_with_subtitles_{lang_suffix}.json')
     
@@ -154,18 +199,19 @@ def save_segments_with_subtitles_to_json(segments: List[VideoSegment], video_id:
         "segments": []
     }
     
-    # AI 요약 함수 import
-    from Backend.controllers.summary import generate_summary
-    
-    for i, segment in enumerate(segments):
-        print(f"🤖 세그먼트 {i+1}/{len(segments)} AI 요약 생성 중...")
-        
-        # 자막이 있는 경우 AI 요약 생성
-        if segment.subtitles and len(segment.subtitles.strip()) > 50:
-            ai_summary = generate_summary(segment.subtitles, language_code)
-        else:
-            ai_summary = "자막이 부족하여 요약할 수 없습니다."
-        
+    # AI 요약: 영상의 모든 세그먼트를 한 번에 배치 요약
+    if summaries is None:
+        from Backend.controllers.summary import generate_segment_summaries, SUMMARY_FAILED_MESSAGE
+        summaries = generate_segment_summaries(segments, language_code, batch_size=summary_batch_size)
+        summaries = [SUMMARY_FAILED_MESSAGE if s is None else s for s in summaries]
+    
+    # 챕터 메타데이터와 자막을 분리 저장하는 세그먼트 저장소
+    from Backend.controllers.segment_store import SegmentStore
+    SegmentStore(video_id).save_segments(segments, language_code, summaries)
+    if not write_json:
+        return None
+
+    for segment, ai_summary in zip(segments, summaries):
         # Bloom 인지단계 분류 결과 가져오기
         bloom_category = getattr(segment, 'bloom_category', 'Unknown')
         
@@ -180,6 +226,7 @@ def save_segments_with_subtitles_to_json(segments: List[VideoSegment], video_id:
             "summary": ai_summary,  # AI 요약 사용
             "subtitles": segment.subtitles,
             "bloom_category": bloom_category,  # Bloom 인지단계 분류 결과
+            "bloom_probabilities": getattr(segment, 'bloom_probabilities', {}) or {},
             "tags": segment.tags,
             "keywords": segment.keywords
         }
@@ -194,6 +241,7 @@ def save_segments_with_subtitles_to_json(segments: List[VideoSegment], video_id:
             raise OSError(f"파일 저장 실패: {output_path}")
         
         print(f"✅ AI 요약과 Bloom 분류가 포함된 세그먼트 JSON 저장 완료: {output_path}")
+        return output_path
     except Exception as e:
         print(f"[ERROR] 파일 저장 중 오류 발생: {e}")
         import traceback
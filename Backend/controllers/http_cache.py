@@ -0,0 +1,276 @@
+"""
+YouTube API 응답 영구 캐시 (SQLite)
+- 엔드포인트별 TTL (search / videos / captions ...)로 신선도를 판단하고, 재시작해도 유지
+- 신선 기간이 지난 응답은 stale 기간 동안 그대로 반환하면서 백그라운드에서 다시 검증 (stale-while-revalidate)
+- 다시 검증할 때 저장된 ETag로 If-None-Match 요청을 보내 304면 본문을 재사용
+- 전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 응답부터 삭제
+- WAL 모드 SQLite 파일 하나를 여러 Streamlit 워커 프로세스가 함께 사용
+- API 키별 일일 쿼터 사용량도 같은 파일에 기록하여 모든 프로세스가 함께 계산
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+from Backend.controllers.result_cache import get_cache_root
+
+HTTP_CACHE_FILENAME = "youtube_api.sqlite"
+
+# 엔드포인트별 (신선 기간, 추가 stale 기간) 초
+ENDPOINT_TTLS = {
+    "search": (6 * 3600, 3 * 86400),
+    "videos": (24 * 3600, 7 * 86400),
+    "captions": (12 * 3600, 3 * 86400),
+    # 자막 목록 (caption_probe, youtube_transcript_api)
+    "transcript_list": (12 * 3600, 3 * 86400),
+}
+DEFAULT_TTL = (3600, 86400)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# 한 프로세스가 재검증을 맡으면 다른 프로세스는 이 시간 동안 재검증하지 않음
+REVALIDATE_LEASE_SECONDS = 60
+# YouTube Data API 쿼터가 초기화되는 시간대 (태평양 시간 자정)
+QUOTA_TIMEZONE = "America/Los_Angeles"
+
+
+def get_http_cache_path() -> str:
+    """기본 캐시 파일 경로 (Backend/output/cache/youtube_api.sqlite)"""
+    return os.path.join(get_cache_root(), HTTP_CACHE_FILENAME)
+
+
+def quota_day(now: Optional[float] = None) -> str:
+    """쿼터 사용량을 묶는 날짜 (태평양 시간 기준, 시간대 정보가 없으면 UTC)"""
+    try:
+        from zoneinfo import ZoneInfo
+        tz = ZoneInfo(QUOTA_TIMEZONE)
+    except Exception:
+        tz = timezone.utc
+    return datetime.fromtimestamp(now or time.time(), tz).strftime("%Y-%m-%d")
+
+
+def cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """엔드포인트와 요청 파라미터(API 키 제외)의 해시"""
+    payload = json.dumps({"endpoint": endpoint, "params": {k: str(v) for k, v in params.items() if k != "key"}},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """캐시에 저장된 응답 하나"""
+
+    __slots__ = ("key", "body", "etag", "expires_at", "stale_until")
+
+    def __init__(self, key: str, body: Dict[str, Any], etag: Optional[str], expires_at: float, stale_until: float):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def is_usable_stale(self, now: Optional[float] = None) -> bool:
+        """신선하지 않지만 재검증하는 동안 반환해도 되는지"""
+        return (now or time.time()) < self.stale_until
+
+
+class ResponseCache:
+    """YouTube API 응답의 SQLite 캐시"""
+
+    def __init__(self, db_path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, tuple]] = None):
+        self.db_path = db_path or get_http_cache_path()
+        self.max_bytes = max_bytes
+        self.ttls = {**ENDPOINT_TTLS, **(ttls or {})}
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    stale_until REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    revalidate_until REAL NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+                CREATE INDEX IF NOT EXISTS idx_responses_stale ON responses(stale_until);
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    key_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    used REAL NOT NULL,
+                    PRIMARY KEY (key_id, day)
+                );
+            """)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def ttl_for(self, endpoint: str) -> tuple:
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """저장된 응답을 반환합니다. (신선도와 무관하게, 없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT body, etag, expires_at, stale_until FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        try:
+            body = json.loads(row["body"])
+        except ValueError:
+            return None
+        return CachedResponse(key, body, row["etag"], row["expires_at"], row["stale_until"])
+
+    def put(self, key: str, endpoint: str, body: Dict[str, Any], etag: Optional[str] = None):
+        """응답을 저장하고 엔드포인트 TTL로 만료 시각을 정합니다."""
+        fresh, stale = self.ttl_for(endpoint)
+        payload = json.dumps(body, ensure_ascii=False)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, endpoint, body, etag, size, fetched_at, expires_at, stale_until, last_access, revalidate_until)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (key, endpoint, payload, etag, len(payload.encode("utf-8")), now, now + fresh, now + fresh + stale, now)
+            )
+            self._evict(conn, now)
+
+    def touch(self, key: str, endpoint: str, etag: Optional[str] = None):
+        """304 Not Modified: 본문은 그대로 두고 만료 시각만 갱신합니다."""
+        fresh, stale = self.ttl_for(endpoint)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE responses SET etag = COALESCE(?, etag), fetched_at = ?, expires_at = ?, stale_until = ?,
+                    last_access = ?, revalidate_until = 0
+                WHERE key = ?
+                """,
+                (etag, now, now + fresh, now + fresh + stale, now, key)
+            )
+
+    def claim_revalidation(self, key: str) -> bool:
+        """
+        재검증 임대를 얻습니다. 다른 스레드/프로세스가 이미 재검증 중이면 False.
+        (재검증이 실패해도 임대 시간이 지나면 다시 시도됨)
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE responses SET revalidate_until = ? WHERE key = ? AND revalidate_until < ?",
+                (now + REVALIDATE_LEASE_SECONDS, key, now)
+            )
+            return cur.rowcount == 1
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """stale 기간도 지난 응답을 지우고, 크기 한도를 넘으면 오래 쓰지 않은 응답부터 삭제합니다."""
+        conn.execute("DELETE FROM responses WHERE stale_until < ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for row in conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            victims.append((row["key"],))
+            freed += row["size"]
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def consume_quota(self, key_id: str, cost: float, limit: float) -> bool:
+        """
+        오늘 쿼터 사용량에 cost를 더합니다. 더하면 limit를 넘는 경우 기록하지 않고 False.
+        (여러 프로세스가 동시에 호출해도 합계가 limit를 넘지 않도록 트랜잭션으로 처리)
+        """
+        day = quota_day()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM quota_usage WHERE day < ?", (day,))
+                row = conn.execute("SELECT used FROM quota_usage WHERE key_id = ? AND day = ?",
+                                   (key_id, day)).fetchone()
+                used = row["used"] if row else 0.0
+                if used + cost > limit:
+                    conn.execute("COMMIT")
+                    return False
+                conn.execute(
+                    """
+                    INSERT INTO quota_usage (key_id, day, used) VALUES (?, ?, ?)
+                    ON CONFLICT(key_id, day) DO UPDATE SET used = used + excluded.used
+                    """,
+                    (key_id, day, cost)
+                )
+                conn.execute("COMMIT")
+                return True
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def exhaust_quota(self, key_id: str, limit: float):
+        """서버가 쿼터 소진을 알려온 키를 오늘 하루 동안 사용하지 않도록 기록합니다."""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO quota_usage (key_id, day, used) VALUES (?, ?, ?)
+                ON CONFLICT(key_id, day) DO UPDATE SET used = MAX(used, excluded.used)
+                """,
+                (key_id, quota_day(), limit)
+            )
+
+    def quota_used(self, key_id: str) -> float:
+        """오늘 기록된 쿼터 사용량"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT used FROM quota_usage WHERE key_id = ? AND day = ?",
+                               (key_id, quota_day())).fetchone()
+        return row["used"] if row else 0.0
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT COUNT(*) AS entries, COALESCE(SUM(size), 0) AS bytes,
+                       COALESCE(SUM(expires_at > ?), 0) AS fresh
+                FROM responses
+                """, (now,)
+            ).fetchone()
+        return {"entries": row["entries"], "bytes": row["bytes"], "fresh": row["fresh"], "max_bytes": self.max_bytes}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 전역 기본 응답 캐시를 반환합니다."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
@@ -0,0 +1,331 @@
+"""
+사용자 맞춤형 학습 시퀀스 구성
+- 퀴즈 기록(output/{video_id}/quiz.json)으로 학습자가 이미 익힌 챕터와 Bloom 단계별 성취도를 계산
+- 추천 색인의 챕터 임베딩으로 챕터 간 유사도 그래프(k-최근접 이웃)를 분석 워커에서 미리 만들어 저장
+- 목표 주제에 대해 기억 → 창조 순서로 단계별 챕터를 고르는 빔 탐색
+  (점수 = 주제 관련도 + 이전 챕터와의 연결성, 이미 익힌 챕터는 제외)
+"""
+
+import glob
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+import numpy as np
+from Backend.controllers.file_io import get_output_root
+from Backend.controllers.recommendation import (
+    BLOOM_STAGES, MICRO_LEARNING_MAX_SECONDS, RecommendationIndex, get_recommendation_dir, get_recommendation_index
+)
+
+GRAPH_VERSION = 1
+# 챕터마다 저장할 이웃 수
+GRAPH_NEIGHBORS = 16
+# 단계마다 그래프 이웃 외에 추가로 고려할 주제 관련도 상위 챕터 수
+STAGE_CANDIDATES = 32
+DEFAULT_BEAM_WIDTH = 8
+# 점수 가중치: 주제 관련도, 이전 챕터와의 유사도
+TOPIC_WEIGHT = 1.0
+COHERENCE_WEIGHT = 0.5
+# 챕터의 퀴즈 정답률이 이 값 이상이면 익힌 것으로 보고, 단계 성취도가 이 값 미만인 첫 단계부터 시작
+MASTERY_THRESHOLD = 0.8
+
+
+class SimilarityGraph:
+    """챕터 간 코사인 유사도 k-최근접 이웃 그래프 (항목 번호는 추천 색인의 items 순서)"""
+
+    def __init__(self, neighbors: np.ndarray, weights: np.ndarray, revision: str):
+        self.neighbors = neighbors  # (N, M) 이웃 항목 번호 (없으면 -1)
+        self.weights = weights      # (N, M) 코사인 유사도
+        self.revision = revision
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, revision: str, num_neighbors: int = GRAPH_NEIGHBORS,
+              chunk: int = 1024) -> "SimilarityGraph":
+        """정규화된 (N, D) 벡터로 그래프를 만듭니다. 유사도 행렬은 chunk 행씩 계산합니다."""
+        n = len(vectors)
+        m = max(0, min(num_neighbors, n - 1))
+        neighbors = np.full((n, m), -1, dtype=np.int32)
+        weights = np.zeros((n, m), dtype=np.float32)
+        if m == 0:
+            return cls(neighbors, weights, revision)
+
+        for start in range(0, n, chunk):
+            sims = vectors[start:start + chunk] @ vectors.T
+            rows = np.arange(len(sims))
+            sims[rows, rows + start] = -np.inf  # 자기 자신 제외
+            top = np.argpartition(-sims, m - 1, axis=1)[:, :m]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_sims, axis=1)
+            neighbors[start:start + chunk] = np.take_along_axis(top, order, axis=1)
+            weights[start:start + chunk] = np.take_along_axis(top_sims, order, axis=1)
+        return cls(neighbors, weights, revision)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, neighbors=self.neighbors, weights=self.weights,
+                     revision=np.array(self.revision), version=np.array(GRAPH_VERSION))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SimilarityGraph"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != GRAPH_VERSION:
+                    return None
+                return cls(data["neighbors"], data["weights"], str(data["revision"]))
+        except Exception as e:
+            print(f"⚠️ 유사도 그래프를 읽지 못했습니다: {e}")
+            return None
+
+
+_quiz_history_cache: Dict[str, Dict[str, Tuple[Tuple[int, int], Dict[Tuple[str, str], Dict[str, Any]]]]] = {}
+_quiz_history_lock = threading.Lock()
+
+
+def _read_quiz_file(quiz_file: str) -> Optional[Dict[Tuple[str, str], Dict[str, Any]]]:
+    """quiz.json 하나의 챕터별 퀴즈 결과 (읽지 못하면 None)"""
+    try:
+        with open(quiz_file, "r", encoding="utf-8") as f:
+            quiz_data = json.load(f)
+    except Exception as e:
+        print(f"⚠️ 퀴즈 기록을 읽지 못했습니다: {quiz_file} ({e})")
+        return None
+    video_id = quiz_data.get("video_id") or os.path.basename(os.path.dirname(quiz_file))
+    records = {}
+    for title, chapter in (quiz_data.get("chapters") or {}).items():
+        progress = chapter.get("progress") or []
+        attempted = [p for p in progress if p.get("tries") or p.get("is_correct")]
+        if not attempted:
+            continue
+        correct = sum(1 for p in progress if p.get("is_correct"))
+        total = max(len(chapter.get("quizzes") or []), len(progress))
+        records[(video_id, title)] = {"correct": correct, "total": total, "ratio": correct / total if total else 0.0}
+    return records
+
+
+def load_quiz_history(output_root: Optional[str] = None) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    모든 영상의 quiz.json에서 챕터별 퀴즈 결과를 읽습니다.
+    파일별 결과를 (수정 시각, 크기) 기준으로 프로세스 안에 캐시하여, 바뀐 파일만 다시 읽습니다.
+
+    Returns:
+        {(video_id, 챕터 제목): {"correct", "total", "ratio"}}
+    """
+    output_root = output_root or get_output_root()
+    quiz_files = glob.glob(os.path.join(glob.escape(output_root), "*", "quiz.json"))
+    with _quiz_history_lock:
+        previous = _quiz_history_cache.get(output_root, {})
+        current = {}
+        history = {}
+        for quiz_file in quiz_files:
+            try:
+                stat = os.stat(quiz_file)
+            except OSError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = previous.get(quiz_file)
+            if cached is None or cached[0] != signature:
+                records = _read_quiz_file(quiz_file)
+                # 읽지 못한 파일(쓰는 중 등)은 캐시하지 않고 다음 호출에서 다시 읽음
+                if records is None:
+                    continue
+                cached = (signature, records)
+            current[quiz_file] = cached
+            history.update(cached[1])
+        # 삭제된 파일은 캐시에서도 제거
+        _quiz_history_cache[output_root] = current
+    return history
+
+
+class LearnerProfile:
+    """퀴즈 기록으로 계산한 학습자 상태"""
+
+    def __init__(self, mastered: Set[int], stage_mastery: Dict[str, float]):
+        self.mastered = mastered            # 익힌 챕터의 항목 번호
+        self.stage_mastery = stage_mastery  # 단계별 평균 정답률 (기록이 있는 단계만)
+
+    @classmethod
+    def from_history(cls, index: RecommendationIndex, history: Dict[Tuple[str, str], Dict[str, Any]],
+                     completed: Iterable[Tuple[str, str]] = ()) -> "LearnerProfile":
+        """
+        Args:
+            history: load_quiz_history() 결과
+            completed: 퀴즈와 별개로 완료 처리한 (video_id, 챕터 제목) 목록
+        """
+        by_title: Dict[Tuple[str, str], List[int]] = {}
+        for i, it in enumerate(index.items):
+            by_title.setdefault((it["video_id"], it["title"]), []).append(i)
+
+        mastered: Set[int] = set()
+        stage_scores: Dict[str, List[float]] = {}
+        for key, record in history.items():
+            for i in by_title.get(key, []):
+                stage = index.items[i]["bloom_category"]
+                if stage in BLOOM_STAGES:
+                    stage_scores.setdefault(stage, []).append(record["ratio"])
+                if record["ratio"] >= MASTERY_THRESHOLD:
+                    mastered.add(i)
+        for key in completed:
+            mastered.update(by_title.get(tuple(key), []))
+        return cls(mastered, {stage: float(np.mean(scores)) for stage, scores in stage_scores.items()})
+
+    def start_stage(self) -> str:
+        """성취도가 MASTERY_THRESHOLD 미만인 첫 단계 (기록이 없는 단계는 아직 익히지 않은 것으로 봄)"""
+        for stage in BLOOM_STAGES:
+            if self.stage_mastery.get(stage, 0.0) < MASTERY_THRESHOLD:
+                return stage
+        return BLOOM_STAGES[-1]
+
+
+class LearningPathPlanner:
+    """추천 색인과 유사도 그래프 위에서 단계별 학습 경로를 구성합니다."""
+
+    def __init__(self, index: RecommendationIndex, graph: Optional[SimilarityGraph]):
+        self.index = index
+        self.graph = graph
+        self.vectors = index.item_vectors()
+
+    def _stage_schedule(self, start_stage: str, per_stage: int, available: Dict[int, np.ndarray]) -> List[int]:
+        start = BLOOM_STAGES.index(start_stage)
+        schedule = []
+        for code in range(start, len(BLOOM_STAGES)):
+            count = min(per_stage, len(available.get(code, [])))
+            schedule.extend([code] * count)
+        return schedule
+
+    def plan(self, topic: Union[str, np.ndarray], profile: Optional[LearnerProfile] = None,
+             per_stage: int = 1, beam_width: int = DEFAULT_BEAM_WIDTH,
+             start_stage: Optional[str] = None, subject: Optional[str] = None,
+             max_duration: Optional[float] = MICRO_LEARNING_MAX_SECONDS,
+             language_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        목표 주제에 대한 학습 경로를 만듭니다.
+
+        Args:
+            topic: 주제 텍스트 또는 임베딩 벡터
+            profile: 학습자 상태 (None이면 기록 없음)
+            per_stage: 단계마다 넣을 챕터 수
+            start_stage: 시작 단계 (None이면 학습자 성취도로 결정)
+
+        Returns:
+            순서대로 정렬된 챕터 정보 dict 리스트 ("stage", "relevance" 포함)
+        """
+        if len(self.index) == 0:
+            return []
+        profile = profile or LearnerProfile(set(), {})
+        start_stage = start_stage or profile.start_stage()
+
+        query = self.index.encode_query(topic) if isinstance(topic, str) else np.asarray(topic, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        relevance = self.vectors @ (query / norm if norm > 0 else query)
+
+        mask = self.index.filter_mask(subject=subject, max_duration=max_duration)
+        allowed = np.ones(len(self.index), dtype=bool) if mask is None else mask.copy()
+        if language_code:
+            allowed &= np.array([it["language_code"] == language_code for it in self.index.items])
+        if profile.mastered:
+            allowed[list(profile.mastered)] = False
+
+        # 단계별 주제 관련도 상위 후보
+        stage_candidates: Dict[int, np.ndarray] = {}
+        for code in range(len(BLOOM_STAGES)):
+            ids = np.flatnonzero(allowed & (self.index.bloom_codes == code))
+            if len(ids) > STAGE_CANDIDATES:
+                ids = ids[np.argpartition(-relevance[ids], STAGE_CANDIDATES - 1)[:STAGE_CANDIDATES]]
+            if len(ids):
+                stage_candidates[code] = ids
+
+        schedule = self._stage_schedule(start_stage, per_stage, stage_candidates)
+        if not schedule:
+            return []
+
+        # 빔: (누적 점수, 경로)
+        beam: List[Tuple[float, List[int]]] = [(0.0, [])]
+        for code in schedule:
+            expanded: Dict[Tuple[int, ...], float] = {}
+            for score, path in beam:
+                candidates = set(stage_candidates[code].tolist())
+                if path and self.graph is not None:
+                    # 이전 챕터의 그래프 이웃 중 같은 단계인 챕터도 후보로 고려
+                    neighbors = self.graph.neighbors[path[-1]]
+                    neighbors = neighbors[neighbors >= 0]
+                    neighbors = neighbors[allowed[neighbors] & (self.index.bloom_codes[neighbors] == code)]
+                    candidates.update(neighbors.tolist())
+                candidates.difference_update(path)
+                if not candidates:
+                    continue
+                ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                step = TOPIC_WEIGHT * relevance[ids]
+                if path:
+                    step = step + COHERENCE_WEIGHT * (self.vectors[ids] @ self.vectors[path[-1]])
+                for i, s in zip(ids.tolist(), step.tolist()):
+                    new_path = tuple(path) + (i,)
+                    expanded[new_path] = score + s
+            if not expanded:
+                break
+            best = sorted(expanded.items(), key=lambda kv: -kv[1])[:beam_width]
+            beam = [(s, list(p)) for p, s in best]
+
+        _, path = max(beam, key=lambda b: b[0])
+        return [
+            dict(self.index.items[i], stage=self.index.items[i]["bloom_category"], relevance=float(relevance[i]))
+            for i in path
+        ]
+
+
+def get_graph_path() -> str:
+    return os.path.join(get_recommendation_dir(), "graph.npz")
+
+
+_default_planner = None
+_default_graph_mtime = None
+_default_planner_lock = threading.Lock()
+
+
+def refresh_similarity_graph(index: Optional[RecommendationIndex] = None) -> SimilarityGraph:
+    """
+    저장된 그래프가 추천 색인과 다르면 다시 만들어 저장합니다.
+    (O(N²·D) 계산이므로 분석 워커에서 추천 색인을 갱신한 뒤 호출하고, UI 요청 경로에서는 호출하지 않음)
+    """
+    index = index if index is not None else RecommendationIndex.load()
+    if index is None:
+        index = RecommendationIndex.empty()
+    graph = SimilarityGraph.load(get_graph_path())
+    if graph is None or graph.revision != index.revision or len(graph.neighbors) != len(index):
+        graph = SimilarityGraph.build(index.item_vectors(), index.revision)
+        graph.save(get_graph_path())
+        print(f"🕸️ 챕터 유사도 그래프 생성: 챕터 {len(index)}개")
+    return graph
+
+
+def get_learning_path_planner() -> LearningPathPlanner:
+    """
+    추천 색인과 같은 카탈로그 상태의 유사도 그래프로 만든 플래너를 반환합니다.
+    그래프는 저장된 것을 읽기만 하며, 아직 갱신되지 않았으면 그래프 이웃 없이 단계별 후보만으로 경로를 만듭니다.
+    """
+    global _default_planner, _default_graph_mtime
+    index = get_recommendation_index()
+    try:
+        mtime = os.path.getmtime(get_graph_path())
+    except OSError:
+        mtime = None
+    with _default_planner_lock:
+        if _default_planner is not None and _default_planner.index is index and mtime == _default_graph_mtime:
+            return _default_planner
+        graph = SimilarityGraph.load(get_graph_path()) if mtime is not None else None
+        if graph is not None and (graph.revision != index.revision or len(graph.neighbors) != len(index)):
+            graph = None
+        _default_planner, _default_graph_mtime = LearningPathPlanner(index, graph), mtime
+        return _default_planner
+
+
+def plan_learning_path(topic: Union[str, np.ndarray], completed: Iterable[Tuple[str, str]] = (),
+                       **kwargs) -> List[Dict[str, Any]]:
+    """퀴즈 기록과 완료한 챕터를 반영하여 목표 주제의 학습 경로를 만듭니다. (kwargs는 LearningPathPlanner.plan 참고)"""
+    planner = get_learning_path_planner()
+    profile = LearnerProfile.from_history(planner.index, load_quiz_history(), completed)
+    return planner.plan(topic, profile=profile, **kwargs)
@@ -0,0 +1,212 @@
+"""
+프로세스 전역 모델 레지스트리
+- (task, model_name, device) 키로 모델을 한 번만 로드하여 공유
+- 지연 로드(lazy load) 및 명시적 warm-up 지원
+- 메모리 예산 기반 LRU 제거
+"""
+
+import gc
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 기본 메모리 예산 (MB) — 환경변수 AIVISIO_MODEL_MEMORY_MB로 조정
+DEFAULT_MEMORY_BUDGET_MB = float(os.getenv("AIVISIO_MODEL_MEMORY_MB", "4096"))
+
+ModelKey = Tuple[str, str, str]
+ModelLoader = Callable[[str, Any], Any]
+
+
+def _estimate_nbytes(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    모델 객체가 차지하는 대략적인 메모리(바이트)를 추정합니다.
+    torch 모듈은 파라미터/버퍼 크기를, pipeline 등은 내부 model 속성을 기준으로 계산합니다.
+    """
+    if obj is None:
+        return 0
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, (tuple, list)):
+        return sum(_estimate_nbytes(o, _seen) for o in obj)
+    if isinstance(obj, dict):
+        return sum(_estimate_nbytes(o, _seen) for o in obj.values())
+
+    if hasattr(obj, "parameters") and callable(getattr(obj, "parameters")):
+        try:
+            total = sum(p.numel() * p.element_size() for p in obj.parameters())
+            if hasattr(obj, "buffers"):
+                total += sum(b.numel() * b.element_size() for b in obj.buffers())
+            return int(total)
+        except Exception:
+            return 0
+
+    # transformers.pipeline 등 래퍼 객체
+    inner = getattr(obj, "model", None)
+    if inner is not None and inner is not obj:
+        return _estimate_nbytes(inner, _seen)
+    return 0
+
+
+class _Entry:
+    """레지스트리에 적재된 모델 항목"""
+
+    def __init__(self, model: Any, nbytes: int):
+        self.model = model
+        self.nbytes = nbytes
+
+
+class ModelRegistry:
+    """
+    스레드 안전한 모델 레지스트리.
+
+    각 모듈은 자신의 task에 대한 로더를 register_loader로 등록하고,
+    get(task, model_name, device)로 모델을 가져옵니다. 동일한 키의 모델은
+    프로세스 내에서 한 번만 로드되며, 메모리 예산을 넘으면 가장 오래 사용되지 않은
+    모델부터 제거합니다.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        budget = DEFAULT_MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+        self.memory_budget_bytes = int(budget * 1024 * 1024)
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[ModelKey, _Entry]" = OrderedDict()
+        self._loaders: Dict[str, ModelLoader] = {}
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+
+    @staticmethod
+    def make_key(task: str, model_name: str, device: Any = None) -> ModelKey:
+        return (str(task), str(model_name), str(device))
+
+    def register_loader(self, task: str, loader: ModelLoader):
+        """task에 대한 로더 함수(model_name, device) -> model 을 등록합니다."""
+        with self._lock:
+            self._loaders[task] = loader
+
+    def has_loader(self, task: str) -> bool:
+        with self._lock:
+            return task in self._loaders
+
+    def get(self, task: str, model_name: str, device: Any = None,
+            loader: Optional[ModelLoader] = None) -> Any:
+        """
+        모델을 반환합니다. 적재되어 있지 않으면 로드합니다.
+
+        Args:
+            task (str): 작업 이름 (예: "summarization")
+            model_name (str): 모델 이름 또는 경로
+            device: 디바이스 식별자
+            loader: 등록된 로더 대신 사용할 로더 (선택)
+
+        Returns:
+            로드된 모델 객체
+        """
+        key = self.make_key(task, model_name, device)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.model
+            load_fn = loader or self._loaders.get(task)
+            if load_fn is None:
+                raise KeyError(f"등록된 로더가 없습니다: task={task}")
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # 같은 키는 한 번만 로드하고, 다른 키는 병렬로 로드할 수 있도록 키 단위 잠금 사용
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    return entry.model
+
+            print(f"📦 모델 로드: task={task}, model={model_name}, device={device}")
+            model = load_fn(model_name, device)
+            nbytes = _estimate_nbytes(model)
+
+            with self._lock:
+                self._entries[key] = _Entry(model, nbytes)
+                self._entries.move_to_end(key)
+                self._evict_over_budget(keep=key)
+            print(f"✅ 모델 로드 완료: {model_name} ({nbytes / (1024 * 1024):.1f} MB)")
+            return model
+
+    def warm_up(self, specs: Iterable[Tuple[str, str, Any]]) -> List[ModelKey]:
+        """
+        (task, model_name, device) 목록의 모델을 미리 로드합니다.
+        실패한 항목은 건너뛰고, 로드에 성공한 키 목록을 반환합니다.
+        """
+        loaded = []
+        for task, model_name, device in specs:
+            try:
+                self.get(task, model_name, device)
+                loaded.append(self.make_key(task, model_name, device))
+            except Exception as e:
+                print(f"⚠️ 모델 warm-up 실패 ({task}, {model_name}): {e}")
+        return loaded
+
+    def evict(self, task: str, model_name: str, device: Any = None) -> bool:
+        """지정한 모델을 레지스트리에서 제거합니다."""
+        key = self.make_key(task, model_name, device)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        del entry
+        self._release_memory()
+        return True
+
+    def clear(self):
+        """적재된 모든 모델을 제거합니다."""
+        with self._lock:
+            self._entries.clear()
+        self._release_memory()
+
+    def loaded_models(self) -> List[dict]:
+        """적재된 모델 목록 (오래 사용되지 않은 순)"""
+        with self._lock:
+            return [
+                {"task": k[0], "model_name": k[1], "device": k[2], "nbytes": e.nbytes}
+                for k, e in self._entries.items()
+            ]
+
+    @property
+    def memory_usage_bytes(self) -> int:
+        with self._lock:
+            return sum(e.nbytes for e in self._entries.values())
+
+    def _evict_over_budget(self, keep: ModelKey):
+        """메모리 예산을 넘으면 LRU 순서로 모델을 제거합니다. (self._lock 보유 상태에서 호출)"""
+        evicted = False
+        while self.memory_usage_bytes > self.memory_budget_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            if oldest_key == keep:
+                break
+            self._entries.pop(oldest_key)
+            evicted = True
+            print(f"♻️ 메모리 예산 초과로 모델 제거: task={oldest_key[0]}, model={oldest_key[1]}")
+        if evicted:
+            self._release_memory()
+
+    @staticmethod
+    def _release_memory():
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+
+_default_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """프로세스 전역 기본 레지스트리를 반환합니다."""
+    return _default_registry
@@ -0,0 +1,234 @@
+"""
+단계(Stage) DAG 기반 분석 파이프라인 실행기
+- 각 단계는 입력 단계와 파라미터를 명시적으로 선언
+- 단계 결과는 ResultCache에 저장되어, 입력 내용이 바뀐 단계만 다시 실행
+- 서로 의존하지 않는 단계는 스레드 풀에서 동시에 실행
+- 일부 항목이 실패한 결과는 Uncached로 감싸 반환하면 이번 실행에만 쓰고 캐시하지 않음
+"""
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from Backend.controllers.result_cache import ResultCache, hash_inputs
+
+# 단계 상태
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_CACHED = "cached"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class Stage:
+    """
+    파이프라인 단계 정의
+
+    Attributes:
+        name: 단계 이름 (다른 단계의 inputs에서 참조)
+        func: 실행 함수. inputs 이름을 키워드 인자로 받아 결과를 반환
+        inputs: 입력으로 사용하는 상위 단계 이름 목록
+        params: 결과에 영향을 주는 파라미터 (캐시 키에 포함)
+        version: 단계 구현 버전 (바뀌면 캐시 무효화)
+        encode / decode: 결과 <-> JSON 변환 함수
+        cacheable: 결과를 캐시에 저장할지 여부 (가벼운 단계는 False)
+        required: True이면 결과가 None이거나 실패했을 때 하위 단계를 건너뜀
+    """
+    name: str
+    func: Callable[..., Any]
+    inputs: List[str] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    version: str = "1"
+    encode: Optional[Callable[[Any], Any]] = None
+    decode: Optional[Callable[[Any], Any]] = None
+    cacheable: bool = True
+    required: bool = True
+
+
+@dataclass
+class Uncached:
+    """
+    이번 실행의 하위 단계에는 전달하지만 캐시에는 저장하지 않을 단계 결과
+    (예: 일부 배치가 실패해 대체 값이 들어간 결과 → 다음 실행에서 다시 계산)
+    """
+    value: Any
+
+
+@dataclass
+class PipelineResult:
+    """파이프라인 실행 결과"""
+    outputs: Dict[str, Any]
+    statuses: Dict[str, str]
+    errors: Dict[str, BaseException]
+
+    def ok(self, name: str) -> bool:
+        return self.statuses.get(name) in (STATUS_DONE, STATUS_CACHED)
+
+
+class PipelineRunner:
+    """
+    Stage DAG 실행기.
+
+    단계의 캐시 키는 (이름, 버전, 파라미터, 입력 단계 결과의 내용 해시)로 계산되므로,
+    상위 단계를 다시 실행하더라도 결과 내용이 같으면 하위 단계는 캐시를 재사용합니다.
+    """
+
+    def __init__(self, stages: List[Stage], cache: Optional[ResultCache] = None, max_workers: int = 2,
+                 on_event: Optional[Callable[[str, str, Any], None]] = None):
+        """
+        Args:
+            stages: 단계 목록
+            cache: 결과 캐시 (None이면 기본 캐시)
+            max_workers: 동시에 실행할 최대 단계 수
+            on_event: 단계 상태 변경 콜백 on_event(stage_name, status, output)
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("단계 이름이 중복되었습니다.")
+        self.cache = cache if cache is not None else ResultCache()
+        self.max_workers = max(1, max_workers)
+        self.on_event = on_event
+        self._order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """단계 이름을 위상 정렬합니다. 알 수 없는 입력이나 순환이 있으면 ValueError"""
+        order, visiting, visited = [], set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"파이프라인에 순환 의존이 있습니다: {name}")
+            if name not in self.stages:
+                raise ValueError(f"알 수 없는 단계: {name}")
+            visiting.add(name)
+            for dep in self.stages[name].inputs:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _required_stages(self, targets: Optional[List[str]]) -> List[str]:
+        """targets 실행에 필요한 단계만 위상 순서로 반환"""
+        if not targets:
+            return list(self._order)
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"알 수 없는 단계: {name}")
+            needed.add(name)
+            stack.extend(self.stages[name].inputs)
+        return [name for name in self._order if name in needed]
+
+    def _emit(self, name: str, status: str, output: Any = None):
+        if self.on_event:
+            try:
+                self.on_event(name, status, output)
+            except Exception as e:
+                print(f"[WARN] 파이프라인 이벤트 콜백 오류 ({name}): {e}")
+
+    def _stage_key(self, stage: Stage, content_hashes: Dict[str, str]) -> str:
+        return self.cache.key(
+            stage.name,
+            version=stage.version,
+            params=stage.params,
+            inputs={dep: content_hashes.get(dep) for dep in stage.inputs}
+        )
+
+    def _execute(self, stage: Stage, key: str, kwargs: Dict[str, Any]):
+        """단계 하나를 실행하거나 캐시에서 불러옵니다. (output, encoded, cached) 반환"""
+        if stage.cacheable:
+            cached = self.cache.get(stage.name, key)
+            if cached is not None:
+                return (stage.decode(cached) if stage.decode else cached), cached, True
+
+        self._emit(stage.name, STATUS_RUNNING)
+        output = stage.func(**kwargs)
+        cacheable = stage.cacheable
+        if isinstance(output, Uncached):
+            output, cacheable = output.value, False
+        if output is None:
+            return None, None, False
+        encoded = stage.encode(output) if stage.encode else output
+        if cacheable:
+            self.cache.put(stage.name, key, encoded)
+        return output, encoded, False
+
+    def run(self, targets: Optional[List[str]] = None) -> PipelineResult:
+        """
+        파이프라인을 실행합니다.
+
+        Args:
+            targets: 실행할 최종 단계 이름 목록 (None이면 전체)
+
+        Returns:
+            PipelineResult
+        """
+        names = self._required_stages(targets)
+        statuses = {name: STATUS_PENDING for name in names}
+        outputs: Dict[str, Any] = {}
+        content_hashes: Dict[str, str] = {}
+        errors: Dict[str, BaseException] = {}
+        running = {}
+
+        def ready(name: str) -> bool:
+            return statuses[name] == STATUS_PENDING and all(
+                statuses[dep] in (STATUS_DONE, STATUS_CACHED, STATUS_SKIPPED, STATUS_FAILED)
+                for dep in self.stages[name].inputs
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                for name in names:
+                    if not ready(name):
+                        continue
+                    stage = self.stages[name]
+                    # 필수 입력이 실패했거나 결과가 없으면 건너뜀 (선택 입력은 None으로 전달)
+                    blocked = [
+                        dep for dep in stage.inputs
+                        if self.stages[dep].required and outputs.get(dep) is None
+                    ]
+                    if blocked:
+                        statuses[name] = STATUS_SKIPPED
+                        print(f"⏭️ 단계 건너뜀: {name} (입력 없음: {', '.join(blocked)})")
+                        self._emit(name, STATUS_SKIPPED)
+                        continue
+                    key = self._stage_key(stage, content_hashes)
+                    kwargs = {dep: outputs.get(dep) for dep in stage.inputs}
+                    statuses[name] = STATUS_RUNNING
+                    running[executor.submit(self._execute, stage, key, kwargs)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        output, encoded, cached = future.result()
+                    except Exception as e:
+                        statuses[name] = STATUS_FAILED
+                        errors[name] = e
+                        print(f"❌ 단계 실패: {name} ({e})")
+                        self._emit(name, STATUS_FAILED, e)
+                        continue
+                    outputs[name] = output
+                    content_hashes[name] = hash_inputs(value=encoded)
+                    if output is None:
+                        statuses[name] = STATUS_SKIPPED
+                    else:
+                        statuses[name] = STATUS_CACHED if cached else STATUS_DONE
+                    if cached:
+                        print(f"♻️ 캐시 재사용: {name}")
+                    self._emit(name, statuses[name], output)
+
+        return PipelineResult(outputs=outputs, statuses=statuses, errors=errors)
@@ -0,0 +1,447 @@
+"""
+Bloom 인지단계별 마이크로러닝 챕터 추천
+- 카탈로그에 기록된 모든 영상의 챕터(제목 + 요약)를 임베딩하여 하나의 색인으로 관리
+- IVF(Inverted File) 근사 최근접 탐색: k-means 중심으로 챕터를 묶고, 질의와 가까운 묶음만 비교
+- Bloom 단계, 과목, 길이, 제외할 영상 조건은 탐색 전에 마스크로 적용
+- 색인은 output/recommendation/ 에 저장하고, 카탈로그가 바뀌었을 때만 분석 워커에서 다시 만듦
+  (임베딩은 임베딩 저장소를 거치므로 새로 추가된 챕터만 계산, UI는 저장된 색인을 읽기만 함)
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from Backend.controllers.catalog import Catalog, get_catalog
+from Backend.controllers.embedding_store import EmbeddingStore, encode_query, get_embedding_store
+from Backend.controllers.file_io import get_output_root
+from Backend.controllers.segment_store import SegmentStore
+from Backend.controllers.semantic_segmentation import load_embedding_model
+
+RECOMMENDATION_DIRNAME = "recommendation"
+RECOMMENDATION_INDEX_VERSION = 1
+
+# Bloom 단계 (진행 순서). 철자 변형은 BLOOM_ALIASES로 맞춤
+BLOOM_STAGES = ("Remember", "Understand", "Apply", "Analyse", "Evaluate", "Create")
+BLOOM_ALIASES = {"Analyze": "Analyse"}
+
+# 마이크로러닝 권장 최대 길이(초)
+MICRO_LEARNING_MAX_SECONDS = 420
+
+# 챕터 수가 이보다 적으면 묶지 않고 전체를 비교
+IVF_MIN_ITEMS = 2048
+# 조건에 맞는 챕터가 이보다 적으면 묶음 대신 해당 챕터를 모두 비교
+FLAT_SEARCH_MAX = 4096
+# 질의마다 비교할 묶음 수 (결과가 부족하면 두 배씩 늘림)
+DEFAULT_NPROBE = 8
+KMEANS_ITERS = 12
+KMEANS_SAMPLE_PER_LIST = 64
+
+
+def normalize_bloom(category: Optional[str]) -> Optional[str]:
+    if not category:
+        return None
+    category = category.strip()
+    return BLOOM_ALIASES.get(category, category)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """각 벡터를 코사인 유사도가 가장 큰 중심에 배정합니다. (메모리를 위해 나눠서 계산)"""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        labels[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(vectors: np.ndarray, nlist: int, iters: int = KMEANS_ITERS, seed: int = 0) -> np.ndarray:
+    """정규화된 벡터의 구면 k-means. 학습은 nlist * KMEANS_SAMPLE_PER_LIST개 표본으로 합니다."""
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample_size = min(n, nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = vectors[rng.choice(n, sample_size, replace=False)] if sample_size < n else vectors
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iters):
+        labels = _assign(sample, centroids)
+        onehot = np.zeros((nlist, len(sample)), dtype=np.float32)
+        onehot[labels, np.arange(len(sample))] = 1.0
+        sums = onehot @ sample
+        counts = np.bincount(labels, minlength=nlist)
+        # 비어 있는 묶음은 임의의 표본으로 다시 시작
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    정규화된 벡터의 IVF 색인.
+    벡터를 묶음 순서대로 재배열해 두어, 묶음 하나의 후보는 연속 구간 [offsets[l], offsets[l+1]) 입니다.
+    """
+
+    def __init__(self, vectors: np.ndarray, centroids: Optional[np.ndarray], order: np.ndarray, offsets: np.ndarray):
+        self.vectors = vectors      # (N, D) 묶음 순서로 재배열된 벡터
+        self.centroids = centroids  # (L, D) 또는 None (전체 비교)
+        self.order = order          # 재배열 위치 -> 원래 항목 번호
+        self.offsets = offsets      # (L + 1,) 묶음별 시작 위치
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, nlist: Optional[int] = None, seed: int = 0) -> "IVFIndex":
+        vectors = _normalize_rows(vectors)
+        n = len(vectors)
+        if n < IVF_MIN_ITEMS:
+            return cls(vectors, None, np.arange(n), np.array([0, n], dtype=np.int64))
+
+        nlist = nlist or int(np.sqrt(n))
+        centroids = spherical_kmeans(vectors, nlist, seed=seed)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+        return cls(np.ascontiguousarray(vectors[order]), centroids, order, offsets)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _candidates(self, query: np.ndarray, mask: Optional[np.ndarray], k: int, nprobe: int) -> np.ndarray:
+        """질의와 가까운 묶음부터 후보 위치를 모읍니다. 조건을 만족하는 후보가 k개가 될 때까지 묶음을 늘립니다."""
+        if self.centroids is None:
+            positions = np.arange(len(self))
+            return positions if mask is None else positions[mask]
+
+        ranked_lists = np.argsort(-(self.centroids @ query))
+        probed = 0
+        chunks = []
+        found = 0
+        while probed < len(ranked_lists):
+            for l in ranked_lists[probed:probed + nprobe]:
+                positions = np.arange(self.offsets[l], self.offsets[l + 1])
+                if mask is not None:
+                    positions = positions[mask[positions]]
+                chunks.append(positions)
+                found += len(positions)
+            probed += nprobe
+            if found >= k:
+                break
+            nprobe *= 2
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+    def search(self, query: np.ndarray, k: int = 5, mask: Optional[np.ndarray] = None,
+               nprobe: int = DEFAULT_NPROBE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        질의와 코사인 유사도가 높은 항목을 찾습니다.
+
+        Args:
+            query: (D,) 질의 벡터
+            mask: 원래 항목 번호 기준의 조건 마스크 (None이면 전체)
+
+        Returns:
+            (항목 번호 배열, 유사도 배열) — 유사도 내림차순
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        sorted_mask = None
+        if mask is not None:
+            sorted_mask = mask[self.order]
+            if sorted_mask.sum() <= FLAT_SEARCH_MAX:
+                # 조건에 맞는 항목이 적으면 묶음을 거치지 않고 모두 비교 (정확한 결과)
+                candidates = np.flatnonzero(sorted_mask)
+            else:
+                candidates = self._candidates(query, sorted_mask, k, nprobe)
+        else:
+            candidates = self._candidates(query, None, k, nprobe)
+
+        if len(candidates) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = self.vectors[candidates] @ query
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return self.order[candidates[top]], scores[top]
+
+
+def _load_summaries(video_id: str, language_code: str, analysis: Optional[Dict[str, Any]]) -> List[str]:
+    """챕터 순서대로 요약을 불러옵니다. 세그먼트 저장소가 없으면 JSON 파일에서 읽습니다."""
+    chapters = SegmentStore(video_id).load_chapters(language_code)
+    if not chapters and analysis and analysis.get("json_path") and os.path.exists(analysis["json_path"]):
+        with open(analysis["json_path"], "r", encoding="utf-8") as f:
+            data = json.load(f)
+        chapters = data.get("segments", []) if isinstance(data, dict) else data
+    return [str(ch.get("summary") or "") for ch in chapters]
+
+
+def get_recommendation_dir() -> str:
+    return os.path.join(get_output_root(), RECOMMENDATION_DIRNAME)
+
+
+class RecommendationIndex:
+    """모든 분석 영상의 챕터를 대상으로 한 Bloom 단계별 추천 색인"""
+
+    def __init__(self, items: List[Dict[str, Any]], index: IVFIndex, model_name: Optional[str], revision: str):
+        self.items = items
+        self.index = index
+        self.model_name = model_name
+        self.revision = revision
+        self._build_filters()
+
+    def _build_filters(self):
+        """조건 마스크를 만들기 위한 열 배열"""
+        self.durations = np.array([it["duration"] for it in self.items], dtype=np.float64)
+        self.bloom_codes = np.array(
+            [BLOOM_STAGES.index(it["bloom_category"]) if it["bloom_category"] in BLOOM_STAGES else -1
+             for it in self.items], dtype=np.int8
+        )
+        self.subjects = sorted({it["subject"] for it in self.items if it["subject"]})
+        self.subject_codes = np.array(
+            [self.subjects.index(it["subject"]) if it["subject"] else -1 for it in self.items], dtype=np.int32
+        )
+        self.video_ids = sorted({it["video_id"] for it in self.items})
+        video_lookup = {vid: i for i, vid in enumerate(self.video_ids)}
+        self.video_codes = np.array([video_lookup[it["video_id"]] for it in self.items], dtype=np.int32)
+        self._positions = {
+            (it["video_id"], it["language_code"], it["position"]): i for i, it in enumerate(self.items)
+        }
+        # 원래 항목 번호 -> 색인 안의 재배열 위치
+        self._sorted_positions = np.empty(len(self.items), dtype=np.int64)
+        self._sorted_positions[self.index.order] = np.arange(len(self.items))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # ------------------------------------------------------------------ 생성 / 저장
+
+    @classmethod
+    def empty(cls, revision: str = "") -> "RecommendationIndex":
+        return cls([], IVFIndex.build(np.zeros((0, 1), dtype=np.float32)), None, revision)
+
+    @classmethod
+    def build(cls, catalog: Optional[Catalog] = None, store: Optional[EmbeddingStore] = None,
+              language_code: Optional[str] = None) -> "RecommendationIndex":
+        """카탈로그의 모든 챕터로 색인을 만듭니다. 임베딩 텍스트는 "제목. 요약" 입니다."""
+        catalog = catalog or get_catalog()
+        revision = catalog.revision()
+        chapters = catalog.find_chapters(language_code=language_code)
+
+        summaries: Dict[Tuple[str, str], List[str]] = {}
+        items, texts = [], []
+        for ch in chapters:
+            key = (ch["video_id"], ch["language_code"])
+            if key not in summaries:
+                try:
+                    summaries[key] = _load_summaries(*key, catalog.get_analysis(*key, include_incomplete=True))
+                except Exception as e:
+                    print(f"⚠️ 요약을 불러오지 못했습니다: {key[0]} ({key[1]}) ({e})")
+                    summaries[key] = []
+            video_summaries = summaries[key]
+            summary = video_summaries[ch["position"]] if ch["position"] < len(video_summaries) else ""
+            items.append({
+                "video_id": ch["video_id"],
+                "language_code": ch["language_code"],
+                "position": ch["position"],
+                "title": ch["title"],
+                "start_time": ch["start_time"],
+                "end_time": ch["end_time"],
+                "duration": ch["duration"],
+                "bloom_category": normalize_bloom(ch["bloom_category"]),
+                "subject": ch["subject"],
+                "video_title": ch["video_title"],
+            })
+            texts.append(f"{ch['title']}. {summary}".strip())
+
+        if not items:
+            return cls.empty(revision)
+
+        model, model_name = load_embedding_model()
+        if model is None:
+            raise RuntimeError("Embedding 모델을 로드할 수 없어 추천 색인을 만들 수 없습니다.")
+        store = store if store is not None else get_embedding_store()
+        vectors = store.encode(model, model_name, texts)
+        print(f"🧭 추천 색인 생성: 챕터 {len(items)}개")
+        return cls(items, IVFIndex.build(vectors), model_name, revision)
+
+    def save(self, directory: Optional[str] = None):
+        directory = directory or get_recommendation_dir()
+        os.makedirs(directory, exist_ok=True)
+        npz_path = os.path.join(directory, "index.npz")
+        meta_path = os.path.join(directory, "index.json")
+
+        tmp_npz = f"{npz_path}.{os.getpid()}.tmp"
+        with open(tmp_npz, "wb") as f:
+            np.savez(
+                f,
+                vectors=self.index.vectors.astype(np.float16),
+                centroids=self.index.centroids if self.index.centroids is not None else np.zeros((0, 0), np.float32),
+                order=self.index.order,
+                offsets=self.index.offsets,
+            )
+        os.replace(tmp_npz, npz_path)
+
+        tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": RECOMMENDATION_INDEX_VERSION,
+                "model": self.model_name,
+                "revision": self.revision,
+                "items": self.items,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+
+    @classmethod
+    def load(cls, directory: Optional[str] = None) -> Optional["RecommendationIndex"]:
+        directory = directory or get_recommendation_dir()
+        npz_path = os.path.join(directory, "index.npz")
+        meta_path = os.path.join(directory, "index.json")
+        if not (os.path.exists(npz_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != RECOMMENDATION_INDEX_VERSION:
+                return None
+            with np.load(npz_path) as data:
+                centroids = data["centroids"]
+                index = IVFIndex(
+                    data["vectors"].astype(np.float32),
+                    centroids if centroids.size else None,
+                    data["order"],
+                    data["offsets"],
+                )
+        except Exception as e:
+            print(f"⚠️ 추천 색인을 읽지 못했습니다: {e}")
+            return None
+        return cls(meta["items"], index, meta.get("model"), meta.get("revision", ""))
+
+    # ------------------------------------------------------------------ 조회
+
+    def filter_mask(self, bloom_category: Optional[str] = None, subject: Optional[str] = None,
+                    max_duration: Optional[float] = None, min_duration: Optional[float] = None,
+                    exclude_video_id: Optional[str] = None) -> Optional[np.ndarray]:
+        """조건에 맞는 항목의 마스크. 조건이 없으면 None"""
+        mask = np.ones(len(self), dtype=bool)
+        filtered = False
+        if bloom_category:
+            category = normalize_bloom(bloom_category)
+            code = BLOOM_STAGES.index(category) if category in BLOOM_STAGES else -2
+            mask &= self.bloom_codes == code
+            filtered = True
+        if subject:
+            code = self.subjects.index(subject) if subject in self.subjects else -2
+            mask &= self.subject_codes == code
+            filtered = True
+        if max_duration is not None:
+            mask &= self.durations <= max_duration
+            filtered = True
+        if min_duration is not None:
+            mask &= self.durations >= min_duration
+            filtered = True
+        if exclude_video_id and exclude_video_id in self.video_ids:
+            mask &= self.video_codes != self.video_ids.index(exclude_video_id)
+            filtered = True
+        return mask if filtered else None
+
+    def chapter_vector(self, video_id: str, position: int, language_code: Optional[str] = None) -> Optional[np.ndarray]:
+        """색인에 있는 챕터의 임베딩 (현재 보고 있는 챕터와 비슷한 챕터를 찾을 때 질의로 사용)"""
+        if language_code is None:
+            i = next((i for (vid, _, pos), i in self._positions.items() if vid == video_id and pos == position), None)
+        else:
+            i = self._positions.get((video_id, language_code, position))
+        if i is None:
+            return None
+        return self.index.vectors[self._sorted_positions[i]]
+
+    def item_vectors(self) -> np.ndarray:
+        """items 순서로 정렬한 정규화된 임베딩 (N, D)"""
+        return self.index.vectors[self._sorted_positions]
+
+    def encode_query(self, text: str) -> np.ndarray:
+        """질의 임베딩 (영구 임베딩 저장소에는 기록하지 않음)"""
+        model, model_name = load_embedding_model()
+        if model is None:
+            raise RuntimeError("Embedding 모델을 로드할 수 없습니다.")
+        if self.model_name and model_name != self.model_name:
+            raise RuntimeError(f"색인 모델({self.model_name})과 질의 모델({model_name})이 다릅니다.")
+        return encode_query(model, model_name, text)
+
+    def recommend(self, query: Union[str, np.ndarray], k: int = 5,
+                  bloom_category: Optional[str] = None, subject: Optional[str] = None,
+                  max_duration: Optional[float] = None, min_duration: Optional[float] = None,
+                  exclude_video_id: Optional[str] = None, nprobe: int = DEFAULT_NPROBE) -> List[Dict[str, Any]]:
+        """
+        주제(질의 텍스트 또는 벡터)와 가까운 챕터를 조건에 맞게 추천합니다.
+        예) 과목 X에서 7분 이하인 Analyse 단계 챕터:
+            recommend("역전파", bloom_category="Analyse", subject="X", max_duration=420)
+
+        Returns:
+            챕터 정보 dict 리스트 ("score": 코사인 유사도 포함), 유사도 내림차순
+        """
+        if len(self) == 0:
+            return []
+        vector = self.encode_query(query) if isinstance(query, str) else query
+        mask = self.filter_mask(bloom_category, subject, max_duration, min_duration, exclude_video_id)
+        if mask is not None and not mask.any():
+            return []
+        ids, scores = self.index.search(vector, k=k, mask=mask, nprobe=nprobe)
+        return [dict(self.items[i], score=float(s)) for i, s in zip(ids.tolist(), scores.tolist())]
+
+
+_default_index = None
+_default_index_mtime = None
+_default_index_lock = threading.Lock()
+
+
+def _index_meta_mtime(directory: Optional[str] = None) -> Optional[float]:
+    try:
+        return os.path.getmtime(os.path.join(directory or get_recommendation_dir(), "index.json"))
+    except OSError:
+        return None
+
+
+def refresh_recommendation_index(catalog: Optional[Catalog] = None, force: bool = False) -> RecommendationIndex:
+    """
+    저장된 색인이 카탈로그와 다르면 다시 만들어 저장합니다.
+    (k-means와 모든 영상의 요약 읽기가 포함되므로 분석 워커/배치에서 호출하고, UI 요청 경로에서는 호출하지 않음)
+    """
+    catalog = catalog or get_catalog()
+    revision = catalog.revision()
+    index = None if force else RecommendationIndex.load()
+    if index is None or index.revision != revision:
+        index = RecommendationIndex.build(catalog)
+        index.save()
+    return index
+
+
+def get_recommendation_index(catalog: Optional[Catalog] = None, refresh: bool = True) -> RecommendationIndex:
+    """
+    프로세스 전역 추천 색인을 반환합니다. 저장된 색인을 읽기만 하고 만들지는 않습니다.
+    refresh이면 카탈로그가 바뀌었고 저장된 색인 파일이 갱신되었을 때 다시 읽습니다.
+    (색인은 분석 워커가 refresh_recommendation_index로 갱신하며, 그 전까지는 이전 색인을 사용)
+    """
+    global _default_index, _default_index_mtime
+    with _default_index_lock:
+        if _default_index is not None and not refresh:
+            return _default_index
+        catalog = catalog or get_catalog()
+        if _default_index is not None and _default_index.revision == catalog.revision():
+            return _default_index
+
+        mtime = _index_meta_mtime()
+        if _default_index is not None and mtime == _default_index_mtime:
+            return _default_index
+        index = RecommendationIndex.load() if mtime is not None else None
+        if index is None:
+            index = _default_index or RecommendationIndex.empty()
+        _default_index, _default_index_mtime = index, mtime
+        return _default_index
@@ -0,0 +1,144 @@
+"""
+분석 파이프라인 단계별 결과 캐시 (content-addressed)
+- 각 단계의 출력은 입력(영상 ID, 자막 해시, 모델 이름/버전, 파라미터)의 해시로 저장
+- 입력이 같으면 이전 결과를 재사용하고, 바뀐 단계만 다시 계산
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional
+from Backend.models.video_segment import VideoSegment
+from Backend.models.transcript import Transcript
+
+# 캐시 포맷이 바뀌면 올려서 기존 항목을 무효화
+CACHE_FORMAT_VERSION = 1
+
+# VideoSegment 필드 외에 파이프라인 중 동적으로 추가되는 속성
+SEGMENT_EXTRA_ATTRS = ("bloom_category", "bloom_probabilities")
+
+
+def get_cache_root() -> str:
+    """기본 캐시 폴더 (Backend/output/cache)"""
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(current_dir, 'output', 'cache')
+
+
+def hash_inputs(**inputs) -> str:
+    """입력 값들을 정규화된 JSON으로 직렬화하여 SHA-256 해시를 만듭니다."""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path) -> str:
+    """모델 가중치 파일 등의 버전 식별자 (경로, 크기, 수정 시각)"""
+    try:
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}"
+    except OSError:
+        return f"{path}:missing"
+
+
+def snippets_to_dicts(transcript_data) -> List[Dict[str, Any]]:
+    """자막 구간 리스트(또는 Transcript)를 JSON 저장 가능한 dict 리스트로 변환"""
+    return Transcript.from_snippets(transcript_data).to_dicts()
+
+
+def snippets_from_dicts(items: List[Dict[str, Any]]) -> Transcript:
+    return Transcript.from_dicts(items)
+
+
+def segments_to_dicts(segments: List[VideoSegment]) -> List[Dict[str, Any]]:
+    """VideoSegment 리스트를 dict 리스트로 변환 (Bloom 분류 등 추가 속성 포함)"""
+    items = []
+    for seg in segments:
+        item = asdict(seg)
+        for attr in SEGMENT_EXTRA_ATTRS:
+            if hasattr(seg, attr):
+                item[attr] = getattr(seg, attr)
+        items.append(item)
+    return items
+
+
+def segments_from_dicts(items: List[Dict[str, Any]]) -> List[VideoSegment]:
+    segments = []
+    for item in items:
+        fields = {k: v for k, v in item.items() if k not in SEGMENT_EXTRA_ATTRS}
+        seg = VideoSegment(**fields)
+        for attr in SEGMENT_EXTRA_ATTRS:
+            if attr in item:
+                setattr(seg, attr, item[attr])
+        segments.append(seg)
+    return segments
+
+
+class ResultCache:
+    """
+    단계별 결과를 {root}/{stage}/{key[:2]}/{key}.json 에 저장하는 캐시.
+    키는 단계 이름과 입력 값의 해시입니다.
+    """
+
+    def __init__(self, root: Optional[str] = None, enabled: bool = True):
+        self.root = os.path.join(root or get_cache_root(), 'results')
+        self.enabled = enabled
+
+    def key(self, stage: str, **inputs) -> str:
+        return hash_inputs(_stage=stage, _version=CACHE_FORMAT_VERSION, **inputs)
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.root, stage, key[:2], f"{key}.json")
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        path = self._path(stage, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["value"]
+        except Exception as e:
+            print(f"[WARN] 캐시 항목을 읽을 수 없어 무시합니다: {path} ({e})")
+            return None
+
+    def put(self, stage: str, key: str, value: Any):
+        if not self.enabled:
+            return
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "key": key, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def contains(self, stage: str, key: str) -> bool:
+        return self.enabled and os.path.exists(self._path(stage, key))
+
+    def get_or_compute(self, stage: str, inputs: Dict[str, Any], compute: Callable[[], Any],
+                       encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None) -> Any:
+        """
+        캐시에 결과가 있으면 반환하고, 없으면 compute()로 계산한 뒤 저장합니다.
+        compute()가 None을 반환하면 (실패로 간주) 저장하지 않습니다.
+
+        Args:
+            stage: 단계 이름
+            inputs: 키 계산에 사용할 입력 값
+            compute: 결과 계산 함수
+            encode: 결과 → JSON 변환 함수 (선택)
+            decode: JSON → 결과 변환 함수 (선택)
+        """
+        key = self.key(stage, **inputs)
+        cached = self.get(stage, key)
+        if cached is not None:
+            print(f"♻️ 캐시 재사용: {stage} ({key[:12]})")
+            return decode(cached) if decode else cached
+
+        value = compute()
+        if value is not None:
+            self.put(stage, key, encode(value) if encode else value)
+        return value
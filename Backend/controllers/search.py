@@ -0,0 +1,445 @@
+"""
+분석된 강의 내용 검색 (BM25 + 임베딩 하이브리드)
+- 검색 단위(문서): 챕터 요약(제목 + 요약)과 자막 구간(PASSAGE_SECONDS 초 단위로 묶은 자막)
+- 영상/언어마다 output/{video_id}/search/{lang}/ 에 샤드를 따로 만들어, 새 영상이 분석될 때 그 영상만 색인
+- 샤드 배열(.npy)은 memory-map으로 열어 시작 시 전체를 읽지 않음
+  (용어는 64비트 해시를 정렬해 저장하므로 용어 사전을 메모리에 만들 필요가 없음)
+- BM25 순위와 임베딩 유사도 순위를 Reciprocal Rank Fusion으로 합침
+- 모든 결과에 시작 시각(초)이 있어 영상의 해당 위치로 바로 이동 가능
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from Backend.models.transcript import Transcript
+from Backend.controllers.file_io import get_output_root
+from Backend.controllers.embedding_store import EmbeddingStore, encode_query, get_embedding_store
+from Backend.controllers.semantic_segmentation import group_transcript_indices_by_time, load_embedding_model
+
+try:
+    from konlpy.tag import Okt  # type: ignore
+    KONLPY_AVAILABLE = True
+except ImportError:
+    KONLPY_AVAILABLE = False
+
+SEARCH_DIRNAME = "search"
+SEARCH_INDEX_VERSION = 1
+
+# 자막 구간 문서 길이(초)
+PASSAGE_SECONDS = 30
+# 결과 미리보기 최대 길이
+SNIPPET_LENGTH = 200
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Reciprocal Rank Fusion 상수와 방식별 후보 수
+RRF_K = 60
+DEFAULT_CANDIDATES = 50
+
+DOC_KIND_SUMMARY = "summary"
+DOC_KIND_SUBTITLE = "subtitle"
+
+SEARCH_MODES = ("hybrid", "bm25", "dense")
+
+# 새 샤드를 확인하는 최소 간격(초)
+SEARCH_REFRESH_SECONDS = 5.0
+
+_WORD_PATTERN = re.compile(r"[0-9A-Za-z]+|[가-힣]+")
+_HANGUL_PATTERN = re.compile(r"^[가-힣]+$")
+_OKT_POS = ("Noun", "Verb", "Adjective", "Alpha", "Number")
+ENGLISH_STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i in is it its of on or so that the this to was we were what
+when which will with you your they them then there these those do does did not can just about into than
+""".split())
+
+_okt = None
+_okt_lock = threading.Lock()
+
+
+def _get_okt():
+    """Okt는 생성 시 JVM을 띄우므로 처음 사용할 때 한 번만 만듭니다."""
+    global _okt
+    with _okt_lock:
+        if _okt is None:
+            _okt = Okt()  # type: ignore
+        return _okt
+
+
+def tokenize(text: str, language_code: str = "en") -> List[str]:
+    """
+    검색용 토큰 목록을 만듭니다.
+    - 한국어: konlpy Okt 형태소(명사/동사/형용사 원형). 없으면 한글 어절과 글자 bigram
+    - 그 외: 소문자 영숫자 단어 (불용어 제외)
+    """
+    if not text:
+        return []
+    if language_code == "ko" and KONLPY_AVAILABLE:
+        return [word.lower() for word, pos in _get_okt().pos(text, norm=True, stem=True) if pos in _OKT_POS]
+
+    tokens = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if _HANGUL_PATTERN.match(word):
+            tokens.append(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif word not in ENGLISH_STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+def hash_terms(terms: Iterable[str]) -> np.ndarray:
+    """용어를 안정적인 64비트 해시로 변환합니다. (프로세스마다 달라지는 hash() 대신 blake2b 사용)"""
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little") for t in terms],
+        dtype=np.uint64
+    )
+
+
+def _snippet(text: str) -> str:
+    return text if len(text) <= SNIPPET_LENGTH else text[:SNIPPET_LENGTH] + "..."
+
+
+def build_documents(transcript, segments, summaries: Optional[Sequence[str]] = None,
+                    passage_seconds: int = PASSAGE_SECONDS) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    영상 하나의 검색 문서를 만듭니다.
+
+    Returns:
+        (문서 정보 리스트, 문서 본문 리스트)
+        문서 정보: {"kind", "chapter", "title", "start", "end", "snippet"}
+    """
+    segments = list(segments or [])
+    chapter_starts = np.array([float(seg.start_time) for seg in segments], dtype=np.float64)
+    docs, texts = [], []
+
+    for position, seg in enumerate(segments):
+        summary = summaries[position] if summaries and position < len(summaries) else getattr(seg, "summary", "")
+        text = f"{seg.title}. {summary or ''}".strip()
+        docs.append({"kind": DOC_KIND_SUMMARY, "chapter": position, "title": seg.title,
+                     "start": float(seg.start_time), "end": float(seg.end_time), "snippet": _snippet(summary or seg.title)})
+        texts.append(text)
+
+    if transcript is not None and len(transcript):
+        transcript = Transcript.from_snippets(transcript)
+        ends = transcript.ends
+        for s, e in group_transcript_indices_by_time(transcript, passage_seconds):
+            text = transcript.join(s, e).strip()
+            if not text:
+                continue
+            start = float(transcript.starts[s])
+            if segments:
+                # 구간 시작 시각이 속한 챕터
+                position = max(int(np.searchsorted(chapter_starts, start, side="right")) - 1, 0)
+                title = segments[position].title
+            else:
+                position, title = -1, ""
+            docs.append({"kind": DOC_KIND_SUBTITLE, "chapter": position, "title": title,
+                         "start": start, "end": float(ends[s:e].max()), "snippet": _snippet(text)})
+            texts.append(text)
+    return docs, texts
+
+
+def _build_postings(texts: Sequence[str], language_code: str) -> Dict[str, np.ndarray]:
+    """문서 본문으로 역색인 배열(CSR)을 만듭니다."""
+    doc_terms = [tokenize(text, language_code) for text in texts]
+    doc_len = np.array([len(terms) for terms in doc_terms], dtype=np.float32)
+
+    vocab: Dict[str, int] = {}
+    pairs: Dict[Tuple[int, int], int] = {}
+    for doc_id, terms in enumerate(doc_terms):
+        for term in terms:
+            term_id = vocab.setdefault(term, len(vocab))
+            pairs[(term_id, doc_id)] = pairs.get((term_id, doc_id), 0) + 1
+
+    hashes = hash_terms(vocab.keys())
+    # 해시 순으로 용어 번호를 다시 매겨 searchsorted로 찾을 수 있게 함
+    order = np.argsort(hashes, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    if pairs:
+        keys = np.array(list(pairs.keys()), dtype=np.int64)
+        tfs = np.array(list(pairs.values()), dtype=np.float32)
+        term_rank = rank[keys[:, 0]]
+        sort = np.lexsort((keys[:, 1], term_rank))
+        postings, tfs, term_rank = keys[sort, 1].astype(np.int32), tfs[sort], term_rank[sort]
+    else:
+        postings, tfs, term_rank = np.zeros(0, np.int32), np.zeros(0, np.float32), np.zeros(0, np.int64)
+
+    offsets = np.zeros(len(order) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(term_rank, minlength=len(order)), out=offsets[1:])
+    return {"terms": hashes[order], "offsets": offsets, "postings": postings, "tfs": tfs, "doc_len": doc_len}
+
+
+def get_search_dir(video_id: str, language_code: str) -> str:
+    return os.path.join(get_output_root(), video_id, SEARCH_DIRNAME, language_code)
+
+
+def index_video(video_id: str, language_code: str, transcript, segments,
+                summaries: Optional[Sequence[str]] = None, store: Optional[EmbeddingStore] = None) -> str:
+    """
+    영상 하나의 검색 샤드를 만들어 저장합니다. 같은 영상/언어의 기존 샤드는 교체합니다.
+    임베딩 모델을 불러올 수 없으면 BM25 색인만 만듭니다.
+
+    Returns:
+        샤드 폴더 경로
+    """
+    docs, texts = build_documents(transcript, segments, summaries)
+    arrays = _build_postings(texts, language_code)
+
+    model_name = None
+    if texts:
+        model, model_name = load_embedding_model()
+        if model is not None:
+            store = store if store is not None else get_embedding_store()
+            embeddings = store.encode(model, model_name, texts).astype(np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            # 정규화해서 저장하여 검색 시 내적만 계산
+            arrays["embeddings"] = (embeddings / np.where(norms > 0, norms, 1.0)).astype(np.float16)
+
+    directory = get_search_dir(video_id, language_code)
+    os.makedirs(directory, exist_ok=True)
+    build = uuid.uuid4().hex
+    for name, array in arrays.items():
+        tmp_path = os.path.join(directory, f"{build}.{name}.npy.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, os.path.join(directory, f"{build}.{name}.npy"))
+
+    # 메타 파일을 마지막에 교체하므로, 읽는 쪽은 항상 완전히 기록된 샤드만 봄
+    meta_path = os.path.join(directory, "meta.json")
+    tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": SEARCH_INDEX_VERSION,
+            "build": build,
+            "video_id": video_id,
+            "language_code": language_code,
+            "model": model_name if "embeddings" in arrays else None,
+            "num_docs": len(docs),
+            "total_len": float(arrays["doc_len"].sum()),
+            "docs": docs,
+        }, f, ensure_ascii=False)
+    os.replace(tmp_meta, meta_path)
+
+    # 이전 빌드 파일 정리 (이미 열려 있는 memory-map은 계속 유효)
+    for path in glob.glob(os.path.join(glob.escape(directory), "*.npy")):
+        if not os.path.basename(path).startswith(build):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    print(f"🔎 검색 색인 저장 완료: {directory} (문서 {len(docs)}개)")
+    return directory
+
+
+class _Shard:
+    """영상/언어 하나의 검색 샤드 (배열은 memory-map)"""
+
+    def __init__(self, directory: str, meta: Dict[str, Any], mtime: float):
+        self.directory = directory
+        self.meta = meta
+        self.mtime = mtime
+        self.video_id = meta["video_id"]
+        self.language_code = meta["language_code"]
+        self.docs = meta["docs"]
+        self.model = meta.get("model")
+        build = meta["build"]
+
+        def load(name):
+            return np.load(os.path.join(directory, f"{build}.{name}.npy"), mmap_mode="r")
+
+        self.terms = load("terms")
+        self.offsets = load("offsets")
+        self.postings = load("postings")
+        self.tfs = load("tfs")
+        self.doc_len = load("doc_len")
+        self.embeddings = load("embeddings") if self.model else None
+
+    def lookup(self, term_hashes: np.ndarray) -> np.ndarray:
+        """용어 해시별 용어 번호 (없으면 -1)"""
+        if len(self.terms) == 0:
+            return np.full(len(term_hashes), -1, dtype=np.int64)
+        pos = np.searchsorted(self.terms, term_hashes)
+        pos = np.minimum(pos, len(self.terms) - 1)
+        return np.where(self.terms[pos] == term_hashes, pos, -1)
+
+
+class SearchIndex:
+    """모든 영상의 검색 샤드를 모아 검색합니다. 새로 만들어진 샤드는 refresh()에서 읽습니다."""
+
+    def __init__(self, output_root: Optional[str] = None):
+        self.output_root = output_root or get_output_root()
+        self._shards: Dict[Tuple[str, str], _Shard] = {}
+        self._lock = threading.RLock()
+        self._last_refresh = 0.0
+
+    def refresh(self, force: bool = False):
+        """메타 파일이 새로 생기거나 바뀐 샤드만 다시 엽니다. (SEARCH_REFRESH_SECONDS 간격)"""
+        pattern = os.path.join(glob.escape(self.output_root), "*", SEARCH_DIRNAME, "*", "meta.json")
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < SEARCH_REFRESH_SECONDS:
+                return
+            self._last_refresh = time.monotonic()
+            for meta_path in glob.glob(pattern):
+                try:
+                    mtime = os.path.getmtime(meta_path)
+                    directory = os.path.dirname(meta_path)
+                    key = (os.path.basename(os.path.dirname(os.path.dirname(directory))), os.path.basename(directory))
+                    shard = self._shards.get(key)
+                    if shard is not None and shard.mtime == mtime:
+                        continue
+                    with open(meta_path, "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                    if meta.get("version") != SEARCH_INDEX_VERSION:
+                        continue
+                    self._shards[key] = _Shard(directory, meta, mtime)
+                except Exception as e:
+                    print(f"[WARN] 검색 샤드를 읽을 수 없어 무시합니다: {meta_path} ({e})")
+
+    def shards(self, language_code: Optional[str] = None, video_id: Optional[str] = None) -> List[_Shard]:
+        with self._lock:
+            return [
+                s for s in self._shards.values()
+                if (language_code is None or s.language_code == language_code)
+                and (video_id is None or s.video_id == video_id)
+            ]
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def _bm25(self, shards: List[_Shard], query: str, k: int) -> List[Tuple[float, int, int]]:
+        """BM25 상위 k개 (점수, 샤드 번호, 문서 번호). idf와 평균 길이는 전체 샤드 기준"""
+        term_ids = {}
+        total_docs = sum(s.meta["num_docs"] for s in shards)
+        if total_docs == 0:
+            return []
+        avgdl = max(sum(s.meta["total_len"] for s in shards) / total_docs, 1e-9)
+
+        # 샤드 언어별로 질의를 토큰화하고 용어 번호를 찾음
+        hashes_by_lang = {}
+        df = {}
+        for si, shard in enumerate(shards):
+            lang = shard.language_code
+            if lang not in hashes_by_lang:
+                tokens = list(dict.fromkeys(tokenize(query, lang)))
+                hashes_by_lang[lang] = hash_terms(tokens)
+            hashes = hashes_by_lang[lang]
+            ids = shard.lookup(hashes)
+            term_ids[si] = ids
+            for h, t in zip(hashes.tolist(), ids.tolist()):
+                if t >= 0:
+                    df[h] = df.get(h, 0) + int(shard.offsets[t + 1] - shard.offsets[t])
+
+        results = []
+        for si, shard in enumerate(shards):
+            hashes = hashes_by_lang[shard.language_code]
+            ids = term_ids[si]
+            if not (ids >= 0).any():
+                continue
+            scores = np.zeros(shard.meta["num_docs"], dtype=np.float32)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * np.asarray(shard.doc_len) / avgdl)
+            for h, t in zip(hashes.tolist(), ids.tolist()):
+                if t < 0:
+                    continue
+                idf = np.log(1 + (total_docs - df[h] + 0.5) / (df[h] + 0.5))
+                lo, hi = int(shard.offsets[t]), int(shard.offsets[t + 1])
+                docs = np.asarray(shard.postings[lo:hi])
+                tf = np.asarray(shard.tfs[lo:hi])
+                scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm[docs])
+            for d in self._top(scores, k):
+                if scores[d] > 0:
+                    results.append((float(scores[d]), si, int(d)))
+        results.sort(key=lambda r: -r[0])
+        return results[:k]
+
+    def _dense(self, shards: List[_Shard], query: str, k: int) -> List[Tuple[float, int, int]]:
+        """임베딩 코사인 유사도 상위 k개 (점수, 샤드 번호, 문서 번호)"""
+        models = {s.model for s in shards if s.model}
+        if not models:
+            return []
+        model, model_name = load_embedding_model()
+        if model is None or model_name not in models:
+            return []
+        q = encode_query(model, model_name, query)
+        q = q / (np.linalg.norm(q) or 1.0)
+
+        results = []
+        for si, shard in enumerate(shards):
+            if shard.embeddings is None or shard.model != model_name or len(shard.embeddings) == 0:
+                continue
+            scores = np.asarray(shard.embeddings, dtype=np.float32) @ q
+            for d in self._top(scores, k):
+                results.append((float(scores[d]), si, int(d)))
+        results.sort(key=lambda r: -r[0])
+        return results[:k]
+
+    def search(self, query: str, k: int = 10, language_code: Optional[str] = None,
+               video_id: Optional[str] = None, mode: str = "hybrid",
+               candidates: int = DEFAULT_CANDIDATES) -> List[Dict[str, Any]]:
+        """
+        강의 내용을 검색합니다.
+
+        Args:
+            query: 검색어
+            k: 결과 수
+            language_code / video_id: 검색 대상 제한
+            mode: "hybrid" (BM25 + 임베딩), "bm25", "dense"
+            candidates: 방식별로 융합에 사용할 후보 수
+
+        Returns:
+            {"video_id", "language_code", "kind", "chapter", "title", "start", "end", "snippet", "score"} 리스트
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"알 수 없는 검색 방식입니다: {mode} (가능: {', '.join(SEARCH_MODES)})")
+        query = (query or "").strip()
+        if not query:
+            return []
+        self.refresh()
+        shards = self.shards(language_code, video_id)
+        if not shards:
+            return []
+
+        rankings = []
+        if mode in ("hybrid", "bm25"):
+            rankings.append(self._bm25(shards, query, candidates))
+        if mode in ("hybrid", "dense"):
+            try:
+                rankings.append(self._dense(shards, query, candidates))
+            except Exception as e:
+                print(f"⚠️ 임베딩 검색 실패, BM25 결과만 사용합니다: {e}")
+
+        fused: Dict[Tuple[int, int], float] = {}
+        for ranking in rankings:
+            for rank, (_, si, d) in enumerate(ranking):
+                fused[(si, d)] = fused.get((si, d), 0.0) + 1.0 / (RRF_K + rank + 1)
+
+        hits = []
+        for (si, d), score in sorted(fused.items(), key=lambda kv: -kv[1])[:k]:
+            shard = shards[si]
+            hits.append(dict(shard.docs[d], video_id=shard.video_id, language_code=shard.language_code, score=score))
+        return hits
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """프로세스 전역 검색 색인을 반환합니다."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SearchIndex()
+        return _default_index
@@ -0,0 +1,265 @@
+"""
+영상별 분석 결과 저장소 (SQLite)
+- output/{video_id}/segments.sqlite 에 언어별 챕터 메타데이터, 자막, 원본 자막(Transcript)을 저장
+- 챕터 메타데이터(제목, 시간, Bloom 분류, 요약)와 자막 본문을 별도 테이블에 두어,
+  UI는 자막을 읽지 않고 챕터 목록만 불러올 수 있음
+- JSON 파일(segments_with_subtitles_*.json)은 호환용 내보내기로 계속 지원
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+from Backend.models.transcript import Transcript
+from Backend.controllers.file_io import get_output_root
+from Backend.controllers.utils import seconds_to_time_str
+
+SEGMENT_STORE_FILENAME = "segments.sqlite"
+
+# UI 챕터 목록에 필요한 열 (자막 본문 제외)
+CHAPTER_COLUMNS = ("id", "title", "start_time", "end_time", "summary", "bloom_category")
+
+
+def get_segment_store_path(video_id: str) -> str:
+    return os.path.join(get_output_root(), video_id, SEGMENT_STORE_FILENAME)
+
+
+class SegmentStore:
+    """한 영상의 분석 결과를 저장하는 SQLite 저장소"""
+
+    def __init__(self, video_id: str, db_path: Optional[str] = None):
+        self.video_id = video_id
+        self.db_path = db_path or get_segment_store_path(video_id)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.db_path)
+
+    @contextmanager
+    def _connect(self, create: bool = False) -> Iterator[sqlite3.Connection]:
+        if create:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if create:
+                self._create_tables(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection):
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                language_code TEXT PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                total_segments INTEGER NOT NULL,
+                extraction_time TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS segments (
+                language_code TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                start_time REAL NOT NULL,
+                end_time REAL NOT NULL,
+                summary TEXT,
+                bloom_category TEXT,
+                bloom_probabilities TEXT,
+                tags TEXT NOT NULL DEFAULT '[]',
+                keywords TEXT NOT NULL DEFAULT '[]',
+                PRIMARY KEY (language_code, position)
+            );
+            CREATE TABLE IF NOT EXISTS subtitles (
+                language_code TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (language_code, position)
+            );
+            CREATE TABLE IF NOT EXISTS transcripts (
+                language_code TEXT PRIMARY KEY,
+                num_lines INTEGER NOT NULL,
+                starts BLOB NOT NULL,
+                durations BLOB NOT NULL,
+                text_starts BLOB NOT NULL,
+                text_ends BLOB NOT NULL,
+                text TEXT NOT NULL,
+                extraction_time TEXT NOT NULL
+            );
+        """)
+
+    def languages(self) -> List[str]:
+        """저장된 분석 결과의 언어 코드 목록"""
+        if not self.exists():
+            return []
+        with self._connect() as conn:
+            try:
+                rows = conn.execute("SELECT language_code FROM analyses ORDER BY language_code").fetchall()
+            except sqlite3.OperationalError:
+                return []
+        return [row["language_code"] for row in rows]
+
+    def _resolve_language(self, language_code: Optional[str]) -> Optional[str]:
+        languages = self.languages()
+        if language_code:
+            return language_code if language_code in languages else None
+        return languages[0] if languages else None
+
+    def save_segments(self, segments, language_code: str, summaries: List[str]):
+        """세그먼트와 요약을 저장합니다. 같은 언어의 기존 결과는 교체합니다."""
+        seg_rows, sub_rows = [], []
+        for position, (segment, summary) in enumerate(zip(segments, summaries)):
+            seg_rows.append((
+                language_code, position, segment.id, segment.title,
+                float(segment.start_time), float(segment.end_time), summary,
+                getattr(segment, 'bloom_category', 'Unknown'),
+                json.dumps(getattr(segment, 'bloom_probabilities', {}) or {}, ensure_ascii=False),
+                json.dumps(segment.tags or [], ensure_ascii=False),
+                json.dumps(segment.keywords or [], ensure_ascii=False)
+            ))
+            sub_rows.append((language_code, position, segment.subtitles or ""))
+
+        with self._connect(create=True) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM segments WHERE language_code = ?", (language_code,))
+                conn.execute("DELETE FROM subtitles WHERE language_code = ?", (language_code,))
+                conn.executemany("INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", seg_rows)
+                conn.executemany("INSERT INTO subtitles VALUES (?, ?, ?)", sub_rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)",
+                    (language_code, self.video_id, len(seg_rows), str(datetime.now()))
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        print(f"✅ 세그먼트 저장소 저장 완료: {self.db_path} ({language_code}, {len(seg_rows)}개)")
+
+    def update_bloom(self, language_code: str, predictions: Dict[int, Dict[str, Any]]) -> int:
+        """
+        저장된 세그먼트의 Bloom 분류 결과만 교체합니다.
+
+        Args:
+            predictions: {세그먼트 위치: {"label", "probabilities"}}
+
+        Returns:
+            갱신된 세그먼트 수
+        """
+        if not predictions or language_code not in self.languages():
+            return 0
+        rows = [
+            (prediction["label"], json.dumps(prediction.get("probabilities") or {}, ensure_ascii=False),
+             language_code, int(position))
+            for position, prediction in predictions.items()
+        ]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = conn.executemany(
+                    "UPDATE segments SET bloom_category = ?, bloom_probabilities = ? "
+                    "WHERE language_code = ? AND position = ?", rows
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return cur.rowcount
+
+    def load_chapters(self, language_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        챕터 메타데이터만 불러옵니다. (자막 본문은 읽지 않음)
+        language_code가 없으면 저장된 첫 번째 언어를 사용합니다.
+        """
+        lang = self._resolve_language(language_code)
+        if lang is None:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(CHAPTER_COLUMNS)} FROM segments WHERE language_code = ? ORDER BY position",
+                (lang,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def load_segments(self, language_code: Optional[str] = None, with_subtitles: bool = True) -> List[Dict[str, Any]]:
+        """segments_with_subtitles JSON의 "segments"와 같은 형태로 불러옵니다."""
+        lang = self._resolve_language(language_code)
+        if lang is None:
+            return []
+        query = "SELECT s.*" + (", t.text AS subtitles" if with_subtitles else "") + " FROM segments s"
+        if with_subtitles:
+            query += " LEFT JOIN subtitles t ON t.language_code = s.language_code AND t.position = s.position"
+        query += " WHERE s.language_code = ? ORDER BY s.position"
+        with self._connect() as conn:
+            rows = conn.execute(query, (lang,)).fetchall()
+
+        items = []
+        for row in rows:
+            item = {
+                "id": row["id"],
+                "title": row["title"],
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+                "start_time_formatted": seconds_to_time_str(row["start_time"]),
+                "end_time_formatted": seconds_to_time_str(row["end_time"]),
+                "duration": row["end_time"] - row["start_time"],
+                "summary": row["summary"],
+            }
+            if with_subtitles:
+                item["subtitles"] = row["subtitles"] or ""
+            item["bloom_category"] = row["bloom_category"]
+            item["tags"] = json.loads(row["tags"])
+            item["keywords"] = json.loads(row["keywords"])
+            items.append(item)
+        return items
+
+    def export_json(self, output_path: str, language_code: Optional[str] = None):
+        """저장된 결과를 기존 segments_with_subtitles JSON 형식으로 내보냅니다."""
+        items = self.load_segments(language_code)
+        data = {
+            "video_id": self.video_id,
+            "total_segments": len(items),
+            "extraction_time": str(datetime.now()),
+            "segments": items
+        }
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def save_transcript(self, transcript_data, language_code: str):
+        """원본 자막을 열 단위 바이너리(float64 배열 + 텍스트 버퍼)로 저장합니다."""
+        transcript = Transcript.from_snippets(transcript_data)
+        starts, durations, buffer, text_starts, text_ends = transcript.buffer_columns()
+        with self._connect(create=True) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    language_code, len(transcript),
+                    np.ascontiguousarray(starts, dtype="<f8").tobytes(),
+                    np.ascontiguousarray(durations, dtype="<f8").tobytes(),
+                    np.ascontiguousarray(text_starts, dtype="<i8").tobytes(),
+                    np.ascontiguousarray(text_ends, dtype="<i8").tobytes(),
+                    buffer, str(datetime.now())
+                )
+            )
+
+    def load_transcript(self, language_code: str) -> Optional[Transcript]:
+        if not self.exists():
+            return None
+        with self._connect() as conn:
+            try:
+                row = conn.execute("SELECT * FROM transcripts WHERE language_code = ?", (language_code,)).fetchone()
+            except sqlite3.OperationalError:
+                return None
+        if row is None:
+            return None
+        return Transcript.from_buffer(
+            np.frombuffer(row["starts"], dtype="<f8"),
+            np.frombuffer(row["durations"], dtype="<f8"),
+            row["text"],
+            np.frombuffer(row["text_starts"], dtype="<i8"),
+            np.frombuffer(row["text_ends"], dtype="<i8")
+        )
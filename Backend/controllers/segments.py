@@ -3,8 +3,10 @@
 """
 
 import re
+import numpy as np
 from typing import List, Optional
 from Backend.models.video_segment import VideoSegment
+from Backend.models.transcript import Transcript
 from Backend.controllers.utils import time_str_to_seconds, seconds_to_time_str
 
 def segment_video_by_description(video_id: str, description: str) -> Optional[List[VideoSegment]]:
@@ -68,33 +70,69 @@ def segment_video_by_description(video_id: str, description: str) -> Optional[Li
     return segments
 
 
+def _build_subtitle_index(starts: np.ndarray, durations: np.ndarray):
+    """
+    자막 구간 검색용 인덱스를 만듭니다.
+
+    자막을 시작 시각 기준으로 (안정) 정렬하고, 정렬 순서에서의 종료 시각 누적 최댓값을 함께 저장합니다.
+    두 배열 모두 단조 증가하므로 searchsorted로 세그먼트와 겹칠 수 있는 범위를 바로 찾을 수 있습니다.
+
+    Returns:
+        (order, sorted_starts, sorted_ends, running_max_ends)
+    """
+    ends = starts + durations
+
+    order = np.argsort(starts, kind="stable")
+    sorted_starts = starts[order]
+    sorted_ends = ends[order]
+    running_max_ends = np.maximum.accumulate(sorted_ends) if len(sorted_ends) else sorted_ends
+    return order, sorted_starts, sorted_ends, running_max_ends
+
+
+def _find_overlapping_subtitles(index, start_time: float, end_time: float) -> np.ndarray:
+    """
+    [start_time, end_time) 구간과 겹치는 자막의 원래 인덱스를 자막 순서대로 반환합니다.
+    겹침 조건은 (자막 시작 < 세그먼트 끝) and (자막 끝 > 세그먼트 시작) 입니다.
+    """
+    order, sorted_starts, sorted_ends, running_max_ends = index
+    # 시작 시각이 세그먼트 끝보다 앞선 자막: [0, hi)
+    hi = int(np.searchsorted(sorted_starts, end_time, side="left"))
+    # lo 이전 자막은 모두 세그먼트 시작 이전에 끝남
+    lo = int(np.searchsorted(running_max_ends[:hi], start_time, side="right"))
+    if lo >= hi:
+        return order[:0]
+
+    candidates = order[lo:hi]
+    selected = candidates[sorted_ends[lo:hi] > start_time]
+    # 원래 자막 순서 유지
+    return np.sort(selected)
+
+
 def map_subtitles_to_segments(segments: List[VideoSegment], transcript_data) -> List[VideoSegment]:
     """
     세그먼트에 해당하는 자막을 매핑합니다.
     
     Args:
         segments: 세그먼트 리스트
-        transcript_data: 자막 데이터
+        transcript_data: 자막 데이터 (Transcript 또는 자막 구간 리스트)
     
     Returns:
         자막이 매핑된 세그먼트 리스트
     """
     print(f"🔗 자막 매핑 시작...")
-    
+
+    transcript = Transcript.from_snippets(transcript_data)
+    index = _build_subtitle_index(transcript.starts, transcript.durations)
+
     for segment in segments:
-        segment_subtitles = []
-        
-        # 세그먼트 시간 범위에 해당하는 자막 찾기
-        for subtitle in transcript_data:
-            subtitle_start = subtitle.start
-            subtitle_end = subtitle.start + subtitle.duration
-            
-            # 자막이 세그먼트 시간 범위와 겹치는지 확인
-            if (subtitle_start < segment.end_time and subtitle_end > segment.start_time):
-                segment_subtitles.append(subtitle.text)
-        
-        # 매핑된 자막을 세그먼트에 저장
-        segment.subtitles = " ".join(segment_subtitles)
-        print(f"   📌 {segment.title}: {len(segment_subtitles)}개 자막 매핑됨")
-    
-    return segments 
+        # 세그먼트 시간 범위와 겹치는 자막 찾기
+        matched = _find_overlapping_subtitles(index, segment.start_time, segment.end_time)
+
+        # 매핑된 자막을 세그먼트에 저장 (연속 구간이면 텍스트 버퍼 슬라이스 한 번으로 이어 붙임)
+        if len(matched) and matched[-1] - matched[0] + 1 == len(matched):
+            segment.subtitles = transcript.join(int(matched[0]), int(matched[-1]) + 1)
+        else:
+            segment.subtitles = " ".join(transcript.text_at(i) for i in matched)
+        print(f"   📌 {segment.title}: {len(matched)}개 자막 매핑됨")
+
+    return segments
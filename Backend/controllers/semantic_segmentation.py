@@ -2,13 +2,17 @@
 Semantic Segmentation을 이용한 자동 챕터 생성 (목표 챕터 수 범위 자동조정 포함)
 - centroid 기반 주제 변화 감지
 - 짧은 챕터 병합
-- 영상 길이에 따른 목표 챕터 수 범위 산정 및 threshold 조정(반복 탐색)
+- 영상 길이에 따른 목표 챕터 수 범위 산정 및 threshold 조정(여러 threshold를 한 번에 탐색)
+- 챕터 수/최소 길이 제약을 둔 최적 분할(DP) 엔진 선택 가능
 """
 
 from typing import List, Tuple, Optional
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
 from Backend.models.video_segment import VideoSegment
+from Backend.models.transcript import Transcript
+from Backend.controllers.model_registry import get_model_registry
+from Backend.controllers.embedding_store import EmbeddingStore, get_embedding_store
+from Backend.controllers.changepoint import optimal_segment_ranges
 
 try:
     from sentence_transformers import SentenceTransformer  # type: ignore
@@ -17,6 +21,58 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     print("⚠️ sentence-transformers가 설치되지 않았습니다. pip install sentence-transformers를 실행해주세요.")
 
+EMBEDDING_TASK = "sentence-embedding"
+EMBEDDING_MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+FALLBACK_EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# 임베딩 방식
+# - "window": 창마다 자막을 이어 붙여 임베딩
+# - "line": 자막 줄마다 한 번 임베딩하고 창 임베딩은 글자 수 가중 평균으로 계산
+EMBEDDING_MODES = ("window", "line")
+DEFAULT_EMBEDDING_MODE = "window"
+
+# 분할 엔진 (SEGMENTATION_ENGINES 참고)
+DEFAULT_SEGMENTATION_ENGINE = "centroid"
+
+# threshold 탐색 범위
+THRESHOLD_SEARCH_LOW = 0.3  # 하한선 확장: 0.55 -> 0.3으로 낮춰서 더 많은 병합 시도
+THRESHOLD_SEARCH_HIGH = 0.92
+
+
+def _load_sentence_transformer(model_name: str, device):
+    """레지스트리용 SentenceTransformer 로더"""
+    return SentenceTransformer(model_name, device=device)  # type: ignore
+
+
+if SENTENCE_TRANSFORMERS_AVAILABLE:
+    get_model_registry().register_loader(EMBEDDING_TASK, _load_sentence_transformer)
+
+
+def load_embedding_model():
+    """
+    임베딩 모델을 레지스트리에서 가져옵니다. 다국어 모델 로드에 실패하면 영어 모델로 대체합니다.
+
+    Returns:
+        (model, model_name) 튜플. 두 모델 모두 실패하면 (None, None)
+    """
+    registry = get_model_registry()
+    try:
+        return registry.get(EMBEDDING_TASK, EMBEDDING_MODEL_NAME), EMBEDDING_MODEL_NAME
+    except Exception as e:
+        print(f"⚠️ 다국어 모델 로드 실패: {e}. 영어 모델로 대체 시도.")
+        try:
+            return registry.get(EMBEDDING_TASK, FALLBACK_EMBEDDING_MODEL_NAME), FALLBACK_EMBEDDING_MODEL_NAME
+        except Exception as e2:
+            print(f"❌ Embedding 모델 로드 실패: {e2}")
+            return None, None
+
+
+def warm_up_embedding_model():
+    """임베딩 모델을 미리 로드합니다."""
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return []
+    return get_model_registry().warm_up([(EMBEDDING_TASK, EMBEDDING_MODEL_NAME, None)])
+
 
 def compute_target_chapter_range(video_duration: float) -> Tuple[int, int]:
     """
@@ -44,75 +100,195 @@ def compute_target_chapter_range(video_duration: float) -> Tuple[int, int]:
     return (30, 80)
 
 
-def group_transcripts_by_time(transcript_data, window_seconds: int = 60) -> List[Tuple[float, float, str]]:
-    if not transcript_data:
-        return []
-
-    grouped_segments = []
+def group_transcript_indices_by_time(transcript_data, window_seconds: int = 60) -> List[Tuple[int, int]]:
+    """
+    자막 줄을 시간 창으로 묶어 각 창의 줄 인덱스 범위 [start_idx, end_idx)를 반환합니다.
+    창은 (창 안 자막의 최대 종료 시각 - 첫 자막 시작 시각) >= window_seconds 가 되면 닫힙니다.
+    """
+    transcript = Transcript.from_snippets(transcript_data)
+    ranges = []
+    window_start_idx = None
     current_window_start = None
-    current_window_texts = []
     current_window_end = None
 
-    for idx, transcript in enumerate(transcript_data):
-        start_time = float(transcript.start)
-        end_time = float(transcript.start + transcript.duration)
-        text = transcript.text.strip() if getattr(transcript, "text", None) else ""
-
-        if current_window_start is None:
+    n = len(transcript)
+    for idx, (start_time, end_time) in enumerate(zip(transcript.starts.tolist(), transcript.ends.tolist())):
+        if window_start_idx is None:
+            window_start_idx = idx
             current_window_start = start_time
             current_window_end = end_time
-
-        current_window_texts.append(text)
-        if current_window_end is not None:
-            current_window_end = max(current_window_end, end_time)
         else:
-            current_window_end = end_time
+            current_window_end = max(current_window_end, end_time)
+
+        if (current_window_end - current_window_start >= window_seconds) or idx == n - 1:
+            ranges.append((window_start_idx, idx + 1))
+            window_start_idx = None
+
+    return ranges
 
-        is_last = (idx == len(transcript_data) - 1)
-        if (current_window_end - current_window_start >= window_seconds) or is_last:
-            combined_text = " ".join([t for t in current_window_texts if t])
-            grouped_segments.append((current_window_start, current_window_end, combined_text))
-            current_window_start = None
-            current_window_end = None
-            current_window_texts = []
 
+def build_windows(transcript_data, ranges: List[Tuple[int, int]]) -> List[Tuple[float, float, str]]:
+    """줄 인덱스 범위를 (시작 시각, 종료 시각, 이어 붙인 텍스트) 창 목록으로 변환합니다."""
+    transcript = Transcript.from_snippets(transcript_data)
+    ends = transcript.ends
+    grouped_segments = []
+    for s_idx, e_idx in ranges:
+        window_start = float(transcript.starts[s_idx])
+        window_end = float(ends[s_idx:e_idx].max())
+        line_texts = (transcript.text_at(i).strip() for i in range(s_idx, e_idx))
+        combined_text = " ".join([t for t in line_texts if t])
+        grouped_segments.append((window_start, window_end, combined_text))
     return grouped_segments
 
 
-def calculate_embeddings(text_segments: List[str], model) -> np.ndarray:
+def group_transcripts_by_time(transcript_data, window_seconds: int = 60) -> List[Tuple[float, float, str]]:
+    if not transcript_data:
+        return []
+    transcript = Transcript.from_snippets(transcript_data)
+    return build_windows(transcript, group_transcript_indices_by_time(transcript, window_seconds))
+
+
+def calculate_embeddings(text_segments: List[str], model,
+                         store: Optional[EmbeddingStore] = None,
+                         model_name: Optional[str] = None) -> np.ndarray:
+    """
+    텍스트 구간의 임베딩을 계산합니다.
+    store와 model_name이 주어지면 저장소에 없는 텍스트만 인코딩하고 결과를 저장합니다.
+    """
     if not text_segments:
         return np.array([])
+    if store is not None and model_name:
+        return store.encode(model, model_name, text_segments)
     embeddings = model.encode(text_segments, show_progress_bar=False)
     return np.array(embeddings)
 
 
-def detect_topic_changes_centroid(embeddings: np.ndarray,
-                                  similarity_threshold: float = 0.75,
-                                  min_segment_len: int = 1) -> List[int]:
+def calculate_line_embeddings(transcript_data, model,
+                              store: Optional[EmbeddingStore] = None,
+                              model_name: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    자막 줄마다 임베딩을 한 번만 계산합니다. 빈 줄은 0 벡터, 가중치 0으로 둡니다.
+
+    Returns:
+        (줄 임베딩 (N, D), 줄 가중치(글자 수) (N,))
+    """
+    texts = [t.strip() for t in Transcript.from_snippets(transcript_data).texts()]
+    weights = np.array([len(t) for t in texts], dtype=np.float64)
+    non_empty = [i for i, t in enumerate(texts) if t]
+    if not non_empty:
+        return np.array([]), weights
+
+    encoded = calculate_embeddings([texts[i] for i in non_empty], model, store=store, model_name=model_name)
+    line_embeddings = np.zeros((len(texts), encoded.shape[1]), dtype=np.float64)
+    line_embeddings[non_empty] = encoded
+    return line_embeddings, weights
+
+
+def pool_window_embeddings(line_embeddings: np.ndarray, line_weights: np.ndarray,
+                           ranges: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    줄 임베딩의 가중 누적합으로 각 범위 [start_idx, end_idx)의 가중 평균 임베딩을 계산합니다.
+    누적합은 한 번만 만들므로 창 크기를 바꿔도 O(창 수) 배열 연산으로 끝납니다.
+    가중치 합이 0인 범위(빈 줄만 있는 창)는 0 벡터가 됩니다.
+    """
+    if len(ranges) == 0 or len(line_embeddings) == 0:
+        return np.array([])
+
+    weights = np.asarray(line_weights, dtype=np.float64)
+    prefix = np.zeros((len(line_embeddings) + 1, line_embeddings.shape[1]), dtype=np.float64)
+    np.cumsum(line_embeddings * weights[:, None], axis=0, out=prefix[1:])
+    weight_prefix = np.concatenate(([0.0], np.cumsum(weights)))
+
+    bounds = np.asarray(ranges, dtype=np.int64)
+    starts, ends = bounds[:, 0], bounds[:, 1]
+    totals = weight_prefix[ends] - weight_prefix[starts]
+    sums = prefix[ends] - prefix[starts]
+    return sums / np.where(totals > 0, totals, 1.0)[:, None]
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """임베딩을 행 단위 단위벡터(float64)로 정규화합니다. 길이가 0인 행은 그대로 0으로 둡니다."""
+    emb = np.asarray(embeddings, dtype=np.float64)
+    if emb.ndim == 1:
+        emb = emb.reshape(1, -1)
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb / np.where(norms > 0, norms, 1.0)
+
+
+def sweep_topic_change_thresholds(embeddings: np.ndarray,
+                                  thresholds,
+                                  min_segment_len: int = 1,
+                                  normalized: bool = False) -> List[List[int]]:
+    """
+    여러 similarity_threshold에 대한 centroid 기반 주제 변화 지점을 한 번의 순회로 계산합니다.
+
+    threshold마다 현재 구간의 임베딩 합(centroid 방향)과 개수를 (K, D) 행렬로 유지하고,
+    각 구간에 대해 K개의 유사도를 한 번의 행렬-벡터 곱으로 계산합니다.
+    centroid는 원본 임베딩의 평균이므로 방향은 합과 같고, 코사인 유사도는
+    dot(정규화된 임베딩, 합) / |합| 으로 구합니다.
+
+    Args:
+        embeddings: (N, D) 임베딩
+        thresholds: threshold 목록 (K개)
+        min_segment_len: 분할 전 현재 구간의 최소 길이
+        normalized: True이면 embeddings가 이미 정규화되어 있다고 가정 (centroid도 정규화 벡터의 평균)
+
+    Returns:
+        threshold 순서대로 change_points 리스트
+    """
+    thresholds = np.asarray(list(thresholds), dtype=np.float64)
     n = len(embeddings)
     if n == 0:
-        return []
+        return [[] for _ in thresholds]
     if n == 1:
-        return [0, 0]
+        return [[0, 0] for _ in thresholds]
+
+    raw = np.asarray(embeddings, dtype=np.float64)
+    if raw.ndim == 1:
+        raw = raw.reshape(1, -1)
+    unit = raw if normalized else normalize_embeddings(raw)
 
-    change_points = [0]
-    current_centroid = embeddings[0].astype(np.float64).copy()
-    current_count = 1
+    k = len(thresholds)
+    sums = np.tile(raw[0], (k, 1))
+    counts = np.ones(k, dtype=np.int64)
+    change_points = [[0] for _ in range(k)]
 
     for i in range(1, n):
-        sim = float(cosine_similarity(embeddings[i:i+1], current_centroid.reshape(1, -1))[0][0])
-        if sim < similarity_threshold and current_count >= min_segment_len:
-            change_points.append(i)
-            current_centroid = embeddings[i].astype(np.float64).copy()
-            current_count = 1
-        else:
-            current_count += 1
-            current_centroid = (current_centroid * (current_count - 1) + embeddings[i]) / current_count
+        norms = np.linalg.norm(sums, axis=1)
+        dots = sums @ unit[i]
+        sims = np.divide(dots, norms, out=np.zeros(k), where=norms > 0)
+
+        split = (sims < thresholds) & (counts >= min_segment_len)
+        if split.any():
+            for t in np.flatnonzero(split):
+                change_points[t].append(i)
+            sums[split] = raw[i]
+            counts[split] = 1
+        keep = ~split
+        sums[keep] += raw[i]
+        counts[keep] += 1
+
+    for cps in change_points:
+        if cps[-1] != n - 1:
+            cps.append(n - 1)
+    return change_points
 
-    if change_points[-1] != n - 1:
-        change_points.append(n - 1)
 
-    return change_points
+def detect_topic_changes_centroid(embeddings: np.ndarray,
+                                  similarity_threshold: float = 0.75,
+                                  min_segment_len: int = 1) -> List[int]:
+    return sweep_topic_change_thresholds(embeddings, [similarity_threshold], min_segment_len)[0]
+
+
+def build_threshold_grid(initial_threshold: float, max_adjust_iters: int,
+                         low: float = THRESHOLD_SEARCH_LOW, high: float = THRESHOLD_SEARCH_HIGH) -> np.ndarray:
+    """
+    [low, high] 구간을 이분 탐색 max_adjust_iters회와 같은 해상도(2**iters + 1개)로 나눈 threshold 목록.
+    초기 threshold도 항상 포함합니다.
+    """
+    num = 2 ** max(1, max_adjust_iters) + 1
+    grid = np.linspace(low, high, num)
+    return np.unique(np.append(grid, initial_threshold))
 
 
 def merge_short_segments(grouped_segments: List[Tuple[float, float, str]],
@@ -172,30 +348,113 @@ def generate_chapter_title(text: str, max_length: int = 50) -> str:
     return cleaned_text
 
 
+def segment_with_centroid(embeddings: np.ndarray,
+                          grouped_segments: List[Tuple[float, float, str]],
+                          min_ch: int,
+                          max_ch: int,
+                          desired_min_duration: float,
+                          initial_similarity_threshold: float = 0.75,
+                          max_adjust_iters: int = 6,
+                          **_) -> List[Tuple[int, int]]:
+    """
+    centroid 엔진: 여러 similarity_threshold를 한 번에 평가(sweep_topic_change_thresholds)하고
+    짧은 챕터를 병합한 뒤, 목표 챕터 범위에 드는 결과를 선택합니다.
+    """
+    thresholds = build_threshold_grid(initial_similarity_threshold, max_adjust_iters)
+    all_change_points = sweep_topic_change_thresholds(embeddings, thresholds, min_segment_len=1)
+
+    best_result = None  # (num_segments, threshold, merged_ranges)
+    best_rank = None
+    merged_by_points = {}
+    for thresh, change_points in zip(thresholds, all_change_points):
+        # 같은 change point는 병합 결과도 같으므로 재사용
+        points_key = tuple(change_points)
+        if points_key not in merged_by_points:
+            merged_by_points[points_key] = merge_short_segments(grouped_segments, change_points,
+                                                                min_duration=desired_min_duration)
+        merged_ranges = merged_by_points[points_key]
+        num_segments = len(merged_ranges)
+
+        # 목표 범위 내 결과를 우선하고, 그 다음은 범위와의 거리, 초기 threshold와의 거리 순
+        diff = 0 if min_ch <= num_segments <= max_ch else min(abs(num_segments - min_ch), abs(num_segments - max_ch))
+        rank = (diff, abs(float(thresh) - initial_similarity_threshold))
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+            best_result = (num_segments, float(thresh), merged_ranges)
+
+    print(f"  threshold {len(thresholds)}개 탐색 ({thresholds[0]:.3f} ~ {thresholds[-1]:.3f}), "
+          f"서로 다른 분할 {len(merged_by_points)}개")
+    if best_rank is not None and best_rank[0] == 0:
+        print("✅ 목표 범위 내에 들었습니다.")
+    else:
+        print("⚠️ 목표 범위에 도달하지 못했지만 가장 근접한 결과를 사용합니다.")
+
+    final_num, final_thresh, final_ranges = best_result
+    print(f"🔚 최종 선택: threshold={final_thresh:.3f}, 챕터수={final_num}")
+    return final_ranges
+
+
+def segment_with_optimal(embeddings: np.ndarray,
+                         grouped_segments: List[Tuple[float, float, str]],
+                         min_ch: int,
+                         max_ch: int,
+                         desired_min_duration: float,
+                         **_) -> List[Tuple[int, int]]:
+    """
+    optimal 엔진: 챕터 수와 최소 길이를 제약으로 한 DP 최적 분할을 한 번에 계산합니다.
+    """
+    window_times = [(seg[0], seg[1]) for seg in grouped_segments]
+    ranges = optimal_segment_ranges(embeddings, window_times, min_ch, max_ch, min_duration=desired_min_duration)
+    print(f"🔚 최적 분할 선택: 챕터수={len(ranges)}")
+    return ranges
+
+
+# 분할 엔진: engine(embeddings, grouped_segments, min_ch, max_ch, desired_min_duration, **options)
+# -> 창 인덱스 범위 (start_idx, end_idx) 목록 (양 끝 포함)
+SEGMENTATION_ENGINES = {
+    "centroid": segment_with_centroid,
+    "optimal": segment_with_optimal,
+}
+
+
 def create_semantic_segments(transcript_data,
                              video_id: str,
                              video_duration: Optional[float] = None,
                              initial_window_seconds: int = 60,
                              desired_min_duration: float = 15.0,
                              initial_similarity_threshold: float = 0.75,
-                             max_adjust_iters: int = 6) -> List[VideoSegment]:
+                             max_adjust_iters: int = 6,
+                             embedding_store: Optional[EmbeddingStore] = None,
+                             embedding_mode: str = DEFAULT_EMBEDDING_MODE,
+                             segmentation_engine: str = DEFAULT_SEGMENTATION_ENGINE) -> List[VideoSegment]:
     """
     전체 파이프라인:
     1) 동적 window_seconds 결정(영상 길이에 따라)
     2) grouped_segments 생성
     3) 임베딩 계산 (한 번)
-    4) threshold 조정 반복: detect_topic_changes_centroid -> merge_short_segments
-       목표 챕터 범위(영상 길이 기반)에 들도록 similarity_threshold를 조정
+    4) 분할 엔진으로 목표 챕터 범위(영상 길이 기반) 안의 챕터 경계 결정 (SEGMENTATION_ENGINES 참고)
     5) VideoSegment 리스트 반환
+
+    embedding_store를 지정하지 않으면 기본 임베딩 저장소를 사용합니다.
+    embedding_mode="line"이면 자막 줄 임베딩을 풀링하여 창 임베딩을 만듭니다. (EMBEDDING_MODES 참고)
     """
     print("🔍 Semantic Segmentation (목표 챕터 범위 자동조정 포함) 시작")
 
     if not SENTENCE_TRANSFORMERS_AVAILABLE:
         raise ImportError("sentence-transformers가 설치되어 있지 않습니다. pip install sentence-transformers")
 
+    if embedding_mode not in EMBEDDING_MODES:
+        raise ValueError(f"지원하지 않는 embedding_mode: {embedding_mode} (가능: {', '.join(EMBEDDING_MODES)})")
+
+    engine = SEGMENTATION_ENGINES.get(segmentation_engine)
+    if engine is None:
+        raise ValueError(f"지원하지 않는 segmentation_engine: {segmentation_engine} "
+                         f"(가능: {', '.join(SEGMENTATION_ENGINES)})")
+
     if not transcript_data:
         print("⚠️ 자막 데이터가 없습니다.")
         return []
+    transcript_data = Transcript.from_snippets(transcript_data)
 
     # 1) 동적 윈도우 계산 (video_duration이 있으면)
     window_seconds = initial_window_seconds
@@ -206,7 +465,8 @@ def create_semantic_segments(transcript_data,
         print(f"🔧 동적 윈도우 적용: window_seconds={window_seconds}s (approx_chunks={approx_chunks})")
 
     # 2) 그룹핑
-    grouped_segments = group_transcripts_by_time(transcript_data, window_seconds)
+    window_ranges = group_transcript_indices_by_time(transcript_data, window_seconds)
+    grouped_segments = build_windows(transcript_data, window_ranges)
     if not grouped_segments:
         print("⚠️ grouped_segments가 없습니다.")
         return []
@@ -215,23 +475,19 @@ def create_semantic_segments(transcript_data,
 
     # 3) 임베딩 계산 (한 번만)
     print("🤖 Embedding 모델 로딩 및 임베딩 계산 중...")
-    model = None
-    try:
-        model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')  # type: ignore
-    except Exception as e:
-        print(f"⚠️ 다국어 모델 로드 실패: {e}. 영어 모델로 대체 시도.")
-        try:
-            model = SentenceTransformer('all-MiniLM-L6-v2')  # type: ignore
-        except Exception as e2:
-            print(f"❌ Embedding 모델 로드 실패: {e2}")
-            return []
-    
+    model, model_name = load_embedding_model()
     if model is None:
         print("❌ Embedding 모델을 로드할 수 없습니다.")
         return []
-    
-    text_segments = [seg[2] for seg in grouped_segments]
-    embeddings = calculate_embeddings(text_segments, model)
+
+    store = embedding_store if embedding_store is not None else get_embedding_store()
+    if embedding_mode == "line":
+        line_embeddings, line_weights = calculate_line_embeddings(transcript_data, model, store=store,
+                                                                  model_name=model_name)
+        embeddings = pool_window_embeddings(line_embeddings, line_weights, window_ranges)
+    else:
+        text_segments = [seg[2] for seg in grouped_segments]
+        embeddings = calculate_embeddings(text_segments, model, store=store, model_name=model_name)
     if embeddings.size == 0:
         print("⚠️ 임베딩 계산 실패 또는 텍스트 비어있음")
         return []
@@ -241,55 +497,12 @@ def create_semantic_segments(transcript_data,
     min_ch, max_ch = compute_target_chapter_range(video_duration) if video_duration else (5, 20)
     print(f"🎯 목표 챕터 범위: {min_ch} ~ {max_ch}")
 
-    # 4) threshold 조정 루프
-    lo_thresh = 0.3  # 하한선 확장: 0.55 -> 0.3으로 낮춰서 더 많은 병합 시도
-    hi_thresh = 0.92
-    best_result = None  # (num_segments, threshold, merged_ranges)
-    best_diff = float('inf')
-
-    # 시작 threshold
-    thresh = initial_similarity_threshold
-
-    for it in range(max_adjust_iters):
-        change_points = detect_topic_changes_centroid(embeddings, similarity_threshold=thresh, min_segment_len=1)
-        merged_ranges = merge_short_segments(grouped_segments, change_points, min_duration=desired_min_duration)
-        num_segments = len(merged_ranges)
-
-        print(f"  반복 {it+1}: threshold={thresh:.3f} -> segments={num_segments}")
-
-        # 목표 범위 내이면 바로 채택
-        if min_ch <= num_segments <= max_ch:
-            best_result = (num_segments, thresh, merged_ranges)
-            print("✅ 목표 범위 내에 들었습니다.")
-            break
-
-        # 가장 근접한 결과 저장
-        diff = min(abs(num_segments - min_ch), abs(num_segments - max_ch))
-        if diff < best_diff:
-            best_diff = diff
-            best_result = (num_segments, thresh, merged_ranges)
-
-        # threshold 조정 전략:
-        # - segments가 너무 많으면(과분할): threshold 낮춰서 병합을 유도 (sim < thresh 가 분할 조건이므로 낮추면 덜 분할)
-        # - segments가 너무 적으면(과소분할): threshold 높여서 더 분할
-        if num_segments > max_ch:
-            # 너무 많음 -> 낮춰야 함
-            hi_thresh = thresh
-            thresh = (thresh + lo_thresh) / 2.0
-        elif num_segments < min_ch:
-            # 너무 적음 -> 높여야 함
-            lo_thresh = thresh
-            thresh = (thresh + hi_thresh) / 2.0
-
-    if best_result is None:
-        print("⚠️ 목표 범위에 도달하지 못했지만 가장 근접한 결과를 사용합니다.")
-        # fallback: compute once more with initial threshold if none
-        change_points = detect_topic_changes_centroid(embeddings, similarity_threshold=initial_similarity_threshold, min_segment_len=1)
-        merged_ranges = merge_short_segments(grouped_segments, change_points, min_duration=desired_min_duration)
-        best_result = (len(merged_ranges), initial_similarity_threshold, merged_ranges)
-
-    final_num, final_thresh, final_ranges = best_result
-    print(f"🔚 최종 선택: threshold={final_thresh:.3f}, 챕터수={final_num}")
+    # 4) 분할 엔진 실행
+    final_ranges = engine(embeddings, grouped_segments, min_ch, max_ch, desired_min_duration,
+                          initial_similarity_threshold=initial_similarity_threshold,
+                          max_adjust_iters=max_adjust_iters)
+    if not final_ranges:
+        final_ranges = [(0, len(grouped_segments) - 1)]
 
     # 5) VideoSegment 객체 생성
     video_segments: List[VideoSegment] = []
@@ -316,5 +529,5 @@ def create_semantic_segments(transcript_data,
         video_segments.append(segment)
         print(f"   - 생성: {chapter_title} ({seg_start:.1f}s - {seg_end:.1f}s)")
 
-    print(f"✅ 총 {len(video_segments)}개의 챕터 생성 완료 (threshold={final_thresh:.3f})")
+    print(f"✅ 총 {len(video_segments)}개의 챕터 생성 완료 (engine={segmentation_engine})")
     return video_segments
@@ -0,0 +1,197 @@
+"""
+스트리밍 방식의 자동 챕터 생성
+- 자막 구간 → 시간 창 → 임베딩 → 주제 변화 감지를 제너레이터로 연결
+- 확정된 챕터를 순서대로 바로 내보내므로, 긴 강의도 앞부분 챕터를 먼저 보여줄 수 있음
+- 챕터 판단에 쓰는 임베딩은 (임베딩 배치 크기)와 현재 챕터 길이만큼만 보관
+  (자막 API가 전체 자막을 한 번에 반환하므로 자막 자체는 모두 메모리에 있음)
+
+전체 자막을 보고 threshold를 고르는 create_semantic_segments와 달리, 미래 구간을 볼 수 없으므로
+고정된 similarity_threshold를 사용합니다. 세그먼트 엔진(segmentation_engine) 설정도 따르지 않으므로
+분석 파이프라인에서는 UI 미리보기 챕터(run_analysis의 on_chapter)에만 사용하고, 저장되는 챕터는
+create_semantic_segments로 만듭니다.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from Backend.models.video_segment import VideoSegment
+from Backend.controllers.embedding_store import EmbeddingStore, get_embedding_store
+from Backend.controllers.semantic_segmentation import (
+    SENTENCE_TRANSFORMERS_AVAILABLE, load_embedding_model, calculate_embeddings, generate_chapter_title
+)
+
+# 한 번에 임베딩할 창 수 (작을수록 첫 챕터가 빨리 나옴)
+DEFAULT_STREAM_BATCH_SIZE = 8
+
+Window = Tuple[float, float, str]
+
+
+def iter_time_windows(snippets: Iterable, window_seconds: int = 60) -> Iterator[Window]:
+    """
+    자막 구간을 시간 창 (시작 시각, 종료 시각, 이어 붙인 텍스트)으로 묶어 하나씩 내보냅니다.
+    group_transcripts_by_time과 같은 규칙으로 창을 닫습니다.
+    """
+    window_start = None
+    window_end = None
+    texts: List[str] = []
+
+    for snippet in snippets:
+        start_time = float(snippet.start)
+        end_time = float(snippet.start + snippet.duration)
+        text = snippet.text.strip() if getattr(snippet, "text", None) else ""
+
+        if window_start is None:
+            window_start, window_end = start_time, end_time
+        else:
+            window_end = max(window_end, end_time)
+        if text:
+            texts.append(text)
+
+        if window_end - window_start >= window_seconds:
+            yield window_start, window_end, " ".join(texts)
+            window_start, window_end, texts = None, None, []
+
+    if window_start is not None:
+        yield window_start, window_end, " ".join(texts)
+
+
+def iter_window_embeddings(windows: Iterable[Window], model, model_name: Optional[str] = None,
+                           store: Optional[EmbeddingStore] = None,
+                           batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> Iterator[Tuple[Window, np.ndarray]]:
+    """창을 batch_size개씩 임베딩하여 (창, 임베딩)을 순서대로 내보냅니다."""
+    batch: List[Window] = []
+
+    def flush():
+        embeddings = calculate_embeddings([w[2] for w in batch], model, store=store, model_name=model_name)
+        return zip(list(batch), embeddings)
+
+    for window in windows:
+        batch.append(window)
+        if len(batch) >= batch_size:
+            yield from flush()
+            batch.clear()
+    if batch:
+        yield from flush()
+
+
+class _Chapter:
+    """만들어지는 중인 챕터"""
+
+    def __init__(self, window: Window):
+        self.start, self.end = window[0], window[1]
+        self.texts = [window[2]] if window[2] else []
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def extend(self, other: "_Chapter"):
+        self.start = min(self.start, other.start)
+        self.end = max(self.end, other.end)
+        self.texts.extend(other.texts)
+
+
+def _to_segment(chapter: _Chapter, video_id: str, index: int) -> VideoSegment:
+    combined_text = " ".join(chapter.texts)
+    return VideoSegment(
+        id=f"{video_id}_seg_{index}",
+        video_id=video_id,
+        title=generate_chapter_title(combined_text, max_length=50),
+        start_time=chapter.start,
+        end_time=chapter.end,
+        subtitles=combined_text,
+        tags=[],
+        keywords=[],
+        summary=(combined_text[:200] + "...") if len(combined_text) > 200 else combined_text,
+        cognitive_level="Unknown",
+        dok_level="Unknown"
+    )
+
+
+def iter_chapter_boundaries(window_embeddings: Iterable[Tuple[Window, np.ndarray]],
+                            similarity_threshold: float = 0.75,
+                            min_duration: float = 15.0) -> Iterator[_Chapter]:
+    """
+    (창, 임베딩) 스트림에서 centroid 기반으로 주제 변화를 감지하여 확정된 챕터를 내보냅니다.
+
+    - 창 임베딩과 현재 구간 centroid의 코사인 유사도가 threshold 미만이면 새 구간 시작
+    - min_duration보다 짧은 구간은 직전 챕터에 합치고, 첫 구간이 짧으면 다음 구간과 합침
+    - 직전 챕터는 다음 구간이 확정될 때까지 보류한 뒤 내보냄 (뒤쪽 병합을 위해)
+    """
+    held: Optional[_Chapter] = None
+    current: Optional[_Chapter] = None
+    centroid_sum = None
+
+    def settle(chapter: _Chapter) -> Optional[_Chapter]:
+        """구간 하나를 확정하고, 내보낼 수 있게 된 챕터를 반환합니다."""
+        nonlocal held
+        if held is None:
+            held = chapter
+            return None
+        if chapter.duration < min_duration or held.duration < min_duration:
+            held.extend(chapter)
+            return None
+        ready, held = held, chapter
+        return ready
+
+    for window, embedding in window_embeddings:
+        vector = np.asarray(embedding, dtype=np.float64)
+        if current is None:
+            current, centroid_sum = _Chapter(window), vector.copy()
+            continue
+
+        norm = np.linalg.norm(centroid_sum) * np.linalg.norm(vector)
+        sim = float(centroid_sum @ vector / norm) if norm > 0 else 0.0
+        if sim < similarity_threshold:
+            ready = settle(current)
+            if ready is not None:
+                yield ready
+            current, centroid_sum = _Chapter(window), vector.copy()
+        else:
+            current.extend(_Chapter(window))
+            centroid_sum += vector
+
+    if current is not None:
+        ready = settle(current)
+        if ready is not None:
+            yield ready
+    if held is not None:
+        yield held
+
+
+def iter_semantic_chapters(snippets: Iterable,
+                           video_id: str,
+                           window_seconds: int = 30,
+                           similarity_threshold: float = 0.75,
+                           desired_min_duration: float = 15.0,
+                           embedding_store: Optional[EmbeddingStore] = None,
+                           batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> Iterator[VideoSegment]:
+    """
+    자막 구간 스트림에서 챕터(VideoSegment)를 확정되는 순서대로 내보냅니다.
+
+    Args:
+        snippets: .start, .duration, .text 속성을 가진 자막 구간 (리스트 또는 제너레이터)
+        video_id: 영상 ID
+        window_seconds: 시간 창 길이(초)
+        similarity_threshold: 주제 변화 판단 기준
+        desired_min_duration: 챕터 최소 길이(초)
+        embedding_store: 임베딩 저장소 (None이면 기본 저장소)
+        batch_size: 한 번에 임베딩할 창 수
+    """
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        raise ImportError("sentence-transformers가 설치되어 있지 않습니다. pip install sentence-transformers")
+
+    model, model_name = load_embedding_model()
+    if model is None:
+        print("❌ Embedding 모델을 로드할 수 없습니다.")
+        return
+
+    store = embedding_store if embedding_store is not None else get_embedding_store()
+    windows = iter_time_windows(snippets, window_seconds)
+    embedded = iter_window_embeddings(windows, model, model_name=model_name, store=store, batch_size=batch_size)
+
+    index = 0
+    for chapter in iter_chapter_boundaries(embedded, similarity_threshold, desired_min_duration):
+        segment = _to_segment(chapter, video_id, index)
+        print(f"   - 생성: {segment.title} ({segment.start_time:.1f}s - {segment.end_time:.1f}s)")
+        index += 1
+        yield segment
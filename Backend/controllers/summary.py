@@ -10,9 +10,73 @@ except ImportError:
     SUMMARIZATION_AVAILABLE = False
     print("⚠️ transformers 라이브러리가 설치되지 않아 요약 기능을 사용할 수 없습니다.")
 
+from typing import List, Optional
+from Backend.controllers.model_registry import get_model_registry
+
+SUMMARIZATION_TASK = "summarization"
+SUMMARIZATION_DEVICE = -1  # CPU 사용 (GPU가 없거나 메모리 부족 시)
+
+# 입력/출력 길이 제한 (모델 제한 고려)
+MAX_INPUT_CHARS = 1024
+MAX_INPUT_TOKENS = 1024
+SUMMARY_MAX_LENGTH = 130
+SUMMARY_MIN_LENGTH = 30
+
+# 배치 요약 기본값
+DEFAULT_SUMMARY_BATCH_SIZE = 8
+DEFAULT_MAX_BATCH_TOKENS = 8192
+
+# 이 길이 이하의 자막은 요약하지 않음
+MIN_SUMMARY_INPUT_CHARS = 50
+INSUFFICIENT_SUBTITLES_MESSAGE = "자막이 부족하여 요약할 수 없습니다."
+# 요약에 실패한 세그먼트에 이번 실행에서만 표시하는 문구 (캐시하지 않음)
+SUMMARY_FAILED_MESSAGE = "요약 생성 중 오류가 발생했습니다."
+
+
+def _load_summarizer(model_name: str, device):
+    """레지스트리용 요약 pipeline 로더"""
+    return pipeline(
+        SUMMARIZATION_TASK,
+        model=model_name,
+        tokenizer=model_name,
+        device=device
+    )
+
+
+if SUMMARIZATION_AVAILABLE:
+    get_model_registry().register_loader(SUMMARIZATION_TASK, _load_summarizer)
+
+
+def get_summary_model_name(language_code: str = 'ko') -> str:
+    """언어에 따른 요약 모델 이름을 반환합니다."""
+    if language_code == 'ko':
+        return "digit82/kobart-summarization"  # 한국어 요약 모델
+    return "facebook/bart-large-cnn"  # 영어 요약 모델
+
+
+def get_summarizer(language_code: str = 'ko'):
+    """
+    언어에 맞는 요약 pipeline을 모델 레지스트리에서 가져옵니다.
+    프로세스 내에서 모델당 한 번만 로드됩니다.
+    """
+    return get_model_registry().get(
+        SUMMARIZATION_TASK,
+        get_summary_model_name(language_code),
+        SUMMARIZATION_DEVICE
+    )
+
+
+def warm_up_summarizers(language_codes=('ko', 'en')):
+    """지정한 언어의 요약 모델을 미리 로드합니다."""
+    if not SUMMARIZATION_AVAILABLE:
+        return []
+    return get_model_registry().warm_up(
+        (SUMMARIZATION_TASK, get_summary_model_name(lang), SUMMARIZATION_DEVICE)
+        for lang in language_codes
+    )
+
 
 def generate_summary(text: str, language_code: str = 'ko') -> str:
-    import torch
     """
     주어진 텍스트를 AI 모델을 사용하여 요약합니다.
     
@@ -27,28 +91,17 @@ def generate_summary(text: str, language_code: str = 'ko') -> str:
         return "요약 생성에 필요한 라이브러리가 설치되어 있지 않습니다."
     
     try:
-        # 언어에 따른 모델 선택
-        if language_code == 'ko':
-            model_name = "digit82/kobart-summarization"  # 한국어 요약 모델
-        else:
-            model_name = "facebook/bart-large-cnn"  # 영어 요약 모델
-        
-        summarizer = pipeline(
-            "summarization",
-            model=model_name,
-            tokenizer=model_name,
-            device=-1  # CPU 사용 (GPU가 없거나 메모리 부족 시)
-        )
+        # 언어에 따른 모델 선택 (레지스트리에서 공유)
+        summarizer = get_summarizer(language_code)
         
         # 텍스트 길이 제한 (모델 제한 고려)
-        max_input_length = 1024
-        if len(text) > max_input_length:
-            text = text[:max_input_length]
+        if len(text) > MAX_INPUT_CHARS:
+            text = text[:MAX_INPUT_CHARS]
         
         summary = summarizer(
             text, 
-            max_length=130, 
-            min_length=30, 
+            max_length=SUMMARY_MAX_LENGTH, 
+            min_length=SUMMARY_MIN_LENGTH, 
             do_sample=False,
             truncation=True
         )
@@ -58,24 +111,140 @@ def generate_summary(text: str, language_code: str = 'ko') -> str:
         return f"요약 생성 중 오류 발생: {str(e)}"
 
 
-def batch_generate_summaries(texts: list, language_code: str = 'ko') -> list:
+def batch_generate_summaries(texts: list, language_code: str = 'ko',
+                             batch_size: int = DEFAULT_SUMMARY_BATCH_SIZE,
+                             max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS) -> list:
     """
-    여러 텍스트를 일괄적으로 요약합니다.
+    여러 텍스트를 배치 단위로 한 번에 요약합니다.
+
+    모든 텍스트를 함께 토큰화한 뒤 길이순으로 정렬하여 패딩이 최소가 되도록
+    마이크로 배치를 구성하고, 배치마다 한 번의 generate 호출로 요약을 생성합니다.
     
     Args:
         texts (list): 요약할 텍스트 리스트
         language_code (str): 언어 코드
+        batch_size (int): 배치당 최대 텍스트 수
+        max_batch_tokens (int): 배치당 최대 토큰 수 (패딩 포함, 배치 크기 x 최장 길이)
     
     Returns:
-        list: 요약된 텍스트 리스트
+        list: 입력 순서와 동일한 요약 텍스트 리스트 (요약에 실패한 항목은 오류 안내 문구)
     """
+    summaries = _summarize_in_batches(texts, language_code, batch_size, max_batch_tokens)
+    return [SUMMARY_FAILED_MESSAGE if summary is None else summary for summary in summaries]
+
+
+def _summarize_in_batches(texts: list, language_code: str, batch_size: int,
+                          max_batch_tokens: int) -> List[Optional[str]]:
+    """batch_generate_summaries의 본체. 요약에 실패한 항목은 None으로 반환합니다."""
     if not SUMMARIZATION_AVAILABLE:
         return ["요약 생성에 필요한 라이브러리가 설치되어 있지 않습니다."] * len(texts)
-    
-    summaries = []
-    for i, text in enumerate(texts):
-        print(f"🤖 텍스트 {i+1}/{len(texts)} 요약 생성 중...")
-        summary = generate_summary(text, language_code)
-        summaries.append(summary)
-    
+    if not texts:
+        return []
+
+    try:
+        import torch
+        summarizer = get_summarizer(language_code)
+        tokenizer = summarizer.tokenizer
+        model = summarizer.model
+
+        # 1) 전체 텍스트 일괄 토큰화 (패딩 없이)
+        max_input_tokens = min(getattr(tokenizer, "model_max_length", MAX_INPUT_TOKENS) or MAX_INPUT_TOKENS,
+                               MAX_INPUT_TOKENS)
+        clipped = [(t or "")[:MAX_INPUT_CHARS] for t in texts]
+        encodings = tokenizer(
+            clipped,
+            truncation=True,
+            max_length=max_input_tokens,
+            return_attention_mask=True,
+            return_token_type_ids=False
+        )
+        input_ids = encodings["input_ids"]
+    except Exception as e:
+        print(f"⚠️ 요약 생성 중 오류: {e}")
+        return [None] * len(texts)
+
+    # 2) 길이순 정렬 후 마이크로 배치 구성
+    batches = _build_length_sorted_batches([len(ids) for ids in input_ids], batch_size, max_batch_tokens)
+
+    summaries = [None] * len(texts)
+    for b, indices in enumerate(batches):
+        print(f"🤖 요약 배치 {b+1}/{len(batches)} ({len(indices)}개) 생성 중...")
+        try:
+            padded = tokenizer.pad(
+                {
+                    "input_ids": [input_ids[i] for i in indices],
+                    "attention_mask": [encodings["attention_mask"][i] for i in indices],
+                },
+                return_tensors="pt"
+            )
+            with torch.inference_mode():
+                output_ids = model.generate(
+                    input_ids=padded["input_ids"].to(model.device),
+                    attention_mask=padded["attention_mask"].to(model.device),
+                    max_length=SUMMARY_MAX_LENGTH,
+                    min_length=SUMMARY_MIN_LENGTH,
+                    do_sample=False
+                )
+            decoded = tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+            for i, summary in zip(indices, decoded):
+                summaries[i] = summary.strip()
+        except Exception as e:
+            # 실패한 배치는 None으로 남겨 호출 측에서 결과를 캐시하지 않도록 함
+            print(f"⚠️ 요약 배치 {b+1} 생성 중 오류: {e}")
+
+    return summaries
+
+
+def _build_length_sorted_batches(lengths: List[int], batch_size: int, max_batch_tokens: int) -> List[List[int]]:
+    """
+    길이 내림차순으로 인덱스를 정렬하고, 배치 크기와 토큰 예산을 넘지 않도록 묶습니다.
+    내림차순이므로 각 배치의 첫 항목이 패딩 길이를 결정합니다.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    padded_len = 0
+    for i in order:
+        if not current:
+            current = [i]
+            padded_len = max(lengths[i], 1)
+            continue
+        if len(current) < batch_size and (len(current) + 1) * padded_len <= max_batch_tokens:
+            current.append(i)
+        else:
+            batches.append(current)
+            current = [i]
+            padded_len = max(lengths[i], 1)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def generate_segment_summaries(segments, language_code: str = 'ko',
+                               batch_size: int = DEFAULT_SUMMARY_BATCH_SIZE,
+                               max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS) -> List[Optional[str]]:
+    """
+    영상의 모든 세그먼트 자막을 한 번의 배치 요약 단계로 처리합니다.
+    자막이 너무 짧은 세그먼트는 요약하지 않습니다.
+
+    Returns:
+        List[Optional[str]]: 세그먼트 순서와 동일한 요약 리스트 (요약에 실패한 세그먼트는 None)
+    """
+    summaries = [INSUFFICIENT_SUBTITLES_MESSAGE] * len(segments)
+    targets = [
+        i for i, seg in enumerate(segments)
+        if seg.subtitles and len(seg.subtitles.strip()) > MIN_SUMMARY_INPUT_CHARS
+    ]
+    if not targets:
+        return summaries
+
+    print(f"🤖 {len(targets)}개 세그먼트 배치 요약 생성 중 (batch_size={batch_size})...")
+    batch_summaries = _summarize_in_batches(
+        [segments[i].subtitles for i in targets],
+        language_code,
+        batch_size=batch_size,
+        max_batch_tokens=max_batch_tokens
+    )
+    for i, summary in zip(targets, batch_summaries):
+        summaries[i] = summary
     return summaries
@@ -4,9 +4,14 @@ YouTube 자막 추출 관련 함수들
 
 import json
 import os
+import time
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
 from Backend.controllers.utils import seconds_to_time_str
+from Backend.models.transcript import Transcript
+from Backend.controllers.segment_store import SegmentStore
+from Backend.controllers.file_io import get_output_root
 
 
 def ensure_output_dir(video_id: str ):
@@ -40,137 +45,185 @@ def ensure_output_dir(video_id: str ):
     return output_dir
 
 
-def extract_transcript(video_id : str, lang='ko'):
+# 자막 목록 캐시 파일 (영상 폴더 안)
+TRANSCRIPT_LIST_FILENAME = "transcript_list.json"
+# 저장된 자막 목록의 유효 기간 (초, http_cache의 transcript_list 신선 기간과 같음)
+# 자막이 꺼져 있던 영상도 나중에 자막이 추가될 수 있으므로 빈 목록도 만료됨
+# (자막 유무 확인에만 적용. 고른 자막이 이미 저장되어 있으면 만료된 목록으로도 재사용)
+TRANSCRIPT_LIST_TTL = 12 * 3600
+
+
+def list_transcripts(video_id: str):
+    """youtube_transcript_api 버전에 맞춰 자막 목록을 가져옵니다. (1.x: list, 0.x: list_transcripts)"""
+    api = YouTubeTranscriptApi()
+    if hasattr(api, "list"):
+        return api.list(video_id)
+    return YouTubeTranscriptApi.list_transcripts(video_id)
+
+
+def get_transcript_path(video_id: str, language_code: str) -> str:
+    return os.path.join(get_output_root(), video_id, f'{video_id}_{language_code}_transcript.json')
+
+
+def negotiate_language(tracks: List[Dict[str, Any]], lang: str) -> Optional[Dict[str, Any]]:
+    """
+    사용 가능한 자막 중 하나를 고릅니다. 우선순위:
+    요청 언어 수동 > 다른 언어(ko/en) 수동 > 요청 언어 자동 생성 > 다른 언어 자동 생성
+    (같은 순위면 'en-US'보다 'en'처럼 코드가 정확히 일치하는 자막 우선)
+    """
+    other = 'en' if lang == 'ko' else 'ko'
+    rank = {(lang, False): 0, (other, False): 1, (lang, True): 2, (other, True): 3}
+    best, best_key = None, None
+    for track in tracks:
+        base = track["language_code"].split("-")[0]
+        order = rank.get((base, bool(track["is_generated"])))
+        if order is None:
+            continue
+        key = (order, base != track["language_code"])
+        if best_key is None or key < best_key:
+            best, best_key = track, key
+    return best
+
+
+class TranscriptStore:
+    """
+    영상 하나의 자막 목록과 내려받은 자막을 디스크에 캐시합니다.
+    - 자막 목록: output/{video_id}/transcript_list.json
+    - 자막: output/{video_id}/{video_id}_{언어}_transcript.json (수동/자동 생성 여부 기록)
+    이미 분석한 영상을 다시 분석할 때는 네트워크 요청 없이 저장된 자막을 사용합니다.
+    """
+
+    def __init__(self, video_id: str):
+        self.video_id = video_id
+        self.video_dir = os.path.join(get_output_root(), video_id)
+
+    @property
+    def list_path(self) -> str:
+        return os.path.join(self.video_dir, TRANSCRIPT_LIST_FILENAME)
+
+    def _read_tracks(self) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """저장된 자막 목록과 받은 시각 (없으면 None)"""
+        try:
+            with open(self.list_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["tracks"], float(data.get("fetched_ts", 0))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def cached_tracks(self, max_age: float = TRANSCRIPT_LIST_TTL) -> Optional[List[Dict[str, Any]]]:
+        """
+        저장된 자막 목록 (없거나 max_age초보다 오래되었으면 None, 자막이 꺼진 영상은 빈 리스트)
+        """
+        saved = self._read_tracks()
+        if saved is None or time.time() - saved[1] > max_age:
+            return None
+        return saved[0]
+
+    def _save_tracks(self, tracks: List[Dict[str, Any]]):
+        os.makedirs(self.video_dir, exist_ok=True)
+        tmp_path = f"{self.list_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"video_id": self.video_id, "fetched_at": str(datetime.now()), "fetched_ts": time.time(),
+                       "tracks": tracks},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.list_path)
+
+    def load_saved(self, language_code: str, is_generated: Optional[bool] = None) -> Optional[Transcript]:
+        """
+        저장된 자막을 읽습니다. is_generated가 주어지면 저장된 자막의 종류(수동/자동 생성)도 일치해야 합니다.
+        (종류가 기록되지 않은 이전 파일은 해당 언어의 자막으로 간주)
+        """
+        path = get_transcript_path(self.video_id, language_code)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        saved_kind = data.get("is_generated")
+        if is_generated is not None and saved_kind is not None and saved_kind != is_generated:
+            return None
+        segments = data.get("segments") or []
+        return Transcript.from_dicts(segments) if segments else None
+
+    def get(self, lang: str = 'ko', refresh: bool = False) -> Tuple[Optional[Transcript], Optional[str], Optional[bool]]:
+        """
+        선호 언어에 맞는 자막을 반환합니다.
+
+        Returns:
+            (자막, 실제 언어 코드, 자동 생성 여부) - 자막이 없으면 (None, None, None)
+        """
+        saved = None if refresh else self._read_tracks()
+
+        if saved is not None:
+            tracks, fetched_ts = saved
+            choice = negotiate_language(tracks, lang)
+            if choice is not None:
+                # 고른 자막이 저장되어 있으면 목록이 만료되었어도 네트워크 요청 없이 재사용
+                transcript = self.load_saved(choice["language_code"], choice["is_generated"])
+                if transcript is not None:
+                    return transcript, choice["language_code"], choice["is_generated"]
+            elif time.time() - fetched_ts <= TRANSCRIPT_LIST_TTL:
+                # 유효 기간 안의 목록에 맞는 자막이 없으면 자막 없음 (만료되었으면 자막이 추가되었을 수 있어 다시 조회)
+                return None, None, None
+        elif not refresh and not os.path.exists(self.list_path):
+            # 목록이 없던 시절에 저장된 요청 언어 자막은 네트워크 요청 전에 재사용
+            # (다른 언어 자막은 요청 언어 자막이 생겼을 수 있으므로 목록을 받아 다시 고름)
+            transcript = self.load_saved(lang)
+            if transcript is not None:
+                return transcript, lang, None
+
+        # 네트워크: 목록 요청 한 번 + 고른 자막 내려받기 한 번
+        try:
+            transcript_list = list(list_transcripts(self.video_id))
+        except TranscriptsDisabled:
+            self._save_tracks([])
+            raise
+        tracks = [{"language_code": t.language_code, "language": getattr(t, "language", ""),
+                   "is_generated": bool(t.is_generated)} for t in transcript_list]
+        self._save_tracks(tracks)
+
+        choice = negotiate_language(tracks, lang)
+        if choice is None:
+            return None, None, None
+        code, is_generated = choice["language_code"], choice["is_generated"]
+        transcript = None if refresh else self.load_saved(code, is_generated)
+        if transcript is None:
+            remote = next(t for t in transcript_list
+                          if t.language_code == code and bool(t.is_generated) == is_generated)
+            transcript = Transcript.from_snippets(remote.fetch())
+            save_transcript_to_file(transcript, self.video_id, code, is_generated=is_generated)
+        return transcript, code, is_generated
+
+
+def extract_transcript(video_id : str, lang='ko', refresh: bool = False):
     """
     YouTube 영상에서 자막을 추출합니다.
     수동 자막을 우선적으로 찾고, 없으면 자동 생성 자막을 사용합니다.
     요청한 언어가 없으면 다른 언어도 시도합니다.
+    이미 받아둔 자막 목록과 자막 파일이 있으면 네트워크 요청 없이 재사용합니다.
     
     Args:
         video_id (str): YouTube 영상 ID
         lang (str): 언어 선택 ('en' 또는 'ko')
+        refresh (bool): 저장된 목록/자막을 무시하고 다시 가져올지
     
     Returns:
-        list: 자막 데이터 리스트
+        Transcript: 자막 데이터 (실패 시 None)
     """
     try:
         print(f"📺 영상 ID: {video_id}")
         print(f"🌐 선택 언어: {'한국어' if lang == 'ko' else '영어'}")
         print("🔍 자막을 가져오는 중...")
         
-        transcript_data = None
-        final_lang = lang
-        transcript_type = None
+        transcript_data, final_lang, is_generated = TranscriptStore(video_id).get(lang, refresh=refresh)
+        if transcript_data is None:
+            print("❌ 수동 자막과 자동 생성 자막 모두를 찾을 수 없습니다.")
+            return None
         
-        try:
-            # 1단계: 사용 가능한 자막 목록 가져오기 (인스턴스 메서드로 호출)
-            ytt_api = YouTubeTranscriptApi()
-            transcript_list = ytt_api.list(video_id) 
-            
-            # 2단계: 수동 자막 우선 찾기
-            manual_transcript = None
-            auto_transcript = None
-            
-            # 요청한 언어의 수동 자막 찾기
-            try:
-                if lang == 'ko':
-                    manual_transcript = transcript_list.find_manually_created_transcript(['ko'])
-                    print("✅ 한국어 수동 자막을 찾았습니다.")
-                else:
-                    manual_transcript = transcript_list.find_manually_created_transcript(['en'])
-                    print("✅ 영어 수동 자막을 찾았습니다.")
-            except:
-                pass
-            
-            # 요청한 언어의 수동 자막이 없으면 다른 언어의 수동 자막 찾기
-            if not manual_transcript:
-                try:
-                    if lang == 'ko':
-                        manual_transcript = transcript_list.find_manually_created_transcript(['en'])
-                        final_lang = 'en'
-                        print("✅ 영어 수동 자막을 찾았습니다.")
-                    else:
-                        manual_transcript = transcript_list.find_manually_created_transcript(['ko'])
-                        final_lang = 'ko'
-                        print("✅ 한국어 수동 자막을 찾았습니다.")
-                except:
-                    pass
-            
-            # 3단계: 수동 자막이 있으면 사용
-            if manual_transcript:
-                transcript_data = manual_transcript.fetch()
-                transcript_type = "수동"
-            else:
-                # 4단계: 수동 자막이 없으면 자동 생성 자막 사용
-                print("⚠️ 수동 자막을 찾을 수 없어 자동 생성 자막을 찾는 중...")
-                
-                # 요청한 언어의 자동 생성 자막 찾기
-                try:
-                    if lang == 'ko':
-                        auto_transcript = transcript_list.find_generated_transcript(['ko'])
-                        final_lang = 'ko'
-                        print("✅ 한국어 자동 생성 자막을 찾았습니다.")
-                    else:
-                        auto_transcript = transcript_list.find_generated_transcript(['en'])
-                        final_lang = 'en'
-                        print("✅ 영어 자동 생성 자막을 찾았습니다.")
-                except:
-                    pass
-                
-                # 요청한 언어의 자동 생성 자막이 없으면 다른 언어의 자동 생성 자막 찾기
-                if not auto_transcript:
-                    try:
-                        if lang == 'ko':
-                            auto_transcript = transcript_list.find_generated_transcript(['en'])
-                            final_lang = 'en'
-                            print("✅ 영어 자동 생성 자막을 찾았습니다.")
-                        else:
-                            auto_transcript = transcript_list.find_generated_transcript(['ko'])
-                            final_lang = 'ko'
-                            print("✅ 한국어 자동 생성 자막을 찾았습니다.")
-                    except:
-                        pass
-                
-                if auto_transcript:
-                    transcript_data = auto_transcript.fetch()
-                    transcript_type = "자동 생성"
-                else:
-                    raise Exception("수동 자막과 자동 생성 자막 모두를 찾을 수 없습니다.")
-            
-            lang_name = "한국어" if final_lang == 'ko' else "영어"
-            print(f"✅ {lang_name} {transcript_type} 자막을 성공적으로 가져왔습니다.")
-            
-        except Exception as e:
-            print(f"❌ {lang} 자막을 가져올 수 없습니다: {e}")
-            # 최후의 수단: 직접 fetch 시도 (기존 방식)
-            try:
-                print("🔄 직접 fetch 방식으로 재시도...")
-                ytt_api = YouTubeTranscriptApi()
-                # 한국어와 영어 모두 시도
-                for try_lang in ['ko', 'en']:
-                    if try_lang == lang:
-                        continue  # 이미 시도했으므로 스킵
-                    try:
-                        # 직접 자막 가져오기 시도
-                        transcript_data = ytt_api.get_transcript(video_id, languages=[try_lang])  # type: ignore
-                        final_lang = try_lang
-                        lang_name = "한국어" if try_lang == 'ko' else "영어"
-                        print(f"✅ {lang_name} 자막을 직접 fetch로 가져왔습니다.")
-                        transcript_type = "직접 fetch"
-                        break
-                    except:
-                        continue
-                
-                if not transcript_data:
-                    raise Exception("모든 방법으로 자막을 가져올 수 없습니다.")
-            except Exception as e2:
-                print(f"❌ 직접 fetch도 실패: {e2}")
-                return None
-        
-        if transcript_data:
-            print(f"📊 추출된 자막 구간 수: {len(transcript_data)}")
-            # 자막 데이터를 JSON 파일로 저장
-            save_transcript_to_file(transcript_data, video_id, final_lang)
+        lang_name = "한국어" if final_lang.startswith('ko') else "영어"
+        transcript_type = {True: "자동 생성", False: "수동", None: "저장된"}[is_generated]
+        print(f"✅ {lang_name} {transcript_type} 자막을 사용합니다.")
+        print(f"📊 추출된 자막 구간 수: {len(transcript_data)}")
         
         return transcript_data
         
@@ -182,8 +235,8 @@ def extract_transcript(video_id : str, lang='ko'):
         return None
 
 
-def save_transcript_to_file(transcript_data, video_id, language_code):
-    """자막 데이터를 JSON 파일로 저장"""
+def save_transcript_to_file(transcript_data, video_id, language_code, is_generated: Optional[bool] = None):
+    """자막 데이터를 JSON 파일로 저장 (is_generated: 자동 생성 자막 여부, TranscriptStore가 재사용할 때 확인)"""
     try:
         # 영상 ID별 폴더 생성
         video_dir = ensure_output_dir(video_id)
@@ -199,20 +252,14 @@ def save_transcript_to_file(transcript_data, video_id, language_code):
         save_data = {
             'video_id': video_id,
             'language_code': language_code,
+            'is_generated': is_generated,
             'total_segments': len(transcript_data),
             'extraction_time': str(datetime.now()),
             'segments': []
         }
         
         # 각 자막 구간을 딕셔너리로 변환
-        for segment in transcript_data:
-            segment_dict = {
-                'start': segment.start,
-                'duration': segment.duration,
-                'end': segment.start + segment.duration,
-                'text': segment.text
-            }
-            save_data['segments'].append(segment_dict)
+        save_data['segments'] = Transcript.from_snippets(transcript_data).to_dicts(include_end=True)
         
         # 파일명 생성 (영상 ID 폴더 안에 저장)
         filename = os.path.join(video_dir, f'{video_id}_{language_code}_transcript.json')
@@ -222,6 +269,9 @@ def save_transcript_to_file(transcript_data, video_id, language_code):
             json.dump(save_data, f, ensure_ascii=False, indent=2)
         
         print(f"💾 자막 데이터가 '{filename}' 파일로 저장되었습니다.")
+
+        # 세그먼트 저장소에도 열 단위 바이너리로 저장
+        SegmentStore(video_id).save_transcript(transcript_data, language_code)
         
         # 파일 크기 정보도 출력
         file_size = os.path.getsize(filename) / 1024  # KB
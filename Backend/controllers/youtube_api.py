@@ -4,10 +4,13 @@ YouTube API 관련 함수들
 
 import os
 import re
-import requests
-from typing import List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 from Backend.models.video_segment import VideoSegment
 from Backend.controllers.utils import time_str_to_seconds, seconds_to_time_str
+from Backend.controllers.youtube_client import get_youtube_client, YouTubeAPIError
 
 # .env 파일 로드
 try:
@@ -24,6 +27,87 @@ except Exception as e:
     print(f"[WARNING] .env 파일 로드 실패: {e}")
 
 
+# videos.list 한 번에 조회할 수 있는 최대 ID 수
+VIDEOS_BATCH_SIZE = 50
+VIDEO_INFO_PARTS = 'snippet,contentDetails'
+# 비디오 정보 캐시 유지 시간(초). 없는 영상은 짧게 기억
+VIDEO_INFO_TTL_SECONDS = 6 * 3600
+MISSING_VIDEO_TTL_SECONDS = 600
+VIDEO_INFO_CACHE_MAX = 4096
+
+# video_id -> (만료 시각, 비디오 정보 또는 None)
+_video_info_cache: "OrderedDict[str, Tuple[float, Optional[dict]]]" = OrderedDict()
+_video_info_lock = threading.Lock()
+
+
+def _cached_video_info(video_id: str) -> Tuple[bool, Optional[dict]]:
+    """캐시에서 (찾음 여부, 비디오 정보)를 반환합니다. 만료된 항목은 제거합니다."""
+    with _video_info_lock:
+        entry = _video_info_cache.get(video_id)
+        if entry is None:
+            return False, None
+        expires_at, info = entry
+        if expires_at < time.time():
+            del _video_info_cache[video_id]
+            return False, None
+        _video_info_cache.move_to_end(video_id)
+        return True, info
+
+
+def _store_video_info(video_id: str, info: Optional[dict]):
+    ttl = VIDEO_INFO_TTL_SECONDS if info is not None else MISSING_VIDEO_TTL_SECONDS
+    with _video_info_lock:
+        _video_info_cache[video_id] = (time.time() + ttl, info)
+        _video_info_cache.move_to_end(video_id)
+        while len(_video_info_cache) > VIDEO_INFO_CACHE_MAX:
+            _video_info_cache.popitem(last=False)
+
+
+def get_youtube_video_infos(video_ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+    """
+    여러 비디오의 정보(snippet, contentDetails)를 한꺼번에 가져옵니다.
+    캐시에 없는 ID만 최대 50개씩 묶어 videos.list 한 번으로 요청하므로,
+    영상 N개를 조회할 때 API 호출과 쿼터 사용량이 약 N/50로 줄어듭니다.
+
+    Args:
+        video_ids: YouTube 비디오 ID 목록
+    
+    Returns:
+        Dict[str, Optional[dict]]: video_id -> 비디오 정보 (찾지 못했거나 요청에 실패하면 None)
+    """
+    ordered = list(dict.fromkeys(vid for vid in video_ids if vid))
+    infos: Dict[str, Optional[dict]] = {}
+    missing = []
+    for vid in ordered:
+        found, info = _cached_video_info(vid)
+        if found:
+            infos[vid] = info
+        else:
+            missing.append(vid)
+
+    if missing:
+        client = get_youtube_client()
+        if not client.has_keys:
+            print("[WARNING] YouTube API 키가 설정되지 않았습니다.")
+            print("   .env 파일에 YOUTUBE_API_KEY를 설정해주세요.")
+            missing = []
+
+        for start in range(0, len(missing), VIDEOS_BATCH_SIZE):
+            chunk = missing[start:start + VIDEOS_BATCH_SIZE]
+            try:
+                data = client.videos(chunk, part=VIDEO_INFO_PARTS)
+            except YouTubeAPIError as e:
+                # 실패한 묶음은 캐시하지 않고 다음 호출에서 다시 시도
+                print(f"[ERROR] YouTube API 요청 중 오류 ({len(chunk)}개 영상): {e}")
+                continue
+            items = {item['id']: item for item in data.get('items', [])}
+            for vid in chunk:
+                infos[vid] = items.get(vid)
+                _store_video_info(vid, infos[vid])
+
+    return {vid: infos.get(vid) for vid in ordered}
+
+
 def get_youtube_video_info(video_id: str) -> Optional[dict]:
     """
     YouTube Data API v3를 사용하여 비디오 정보를 가져옵니다.
@@ -35,41 +119,16 @@ def get_youtube_video_info(video_id: str) -> Optional[dict]:
         Optional[dict]: 비디오 정보 (챕터 정보 포함)
     """
     try:
-        # YouTube Data API v3 엔드포인트
-        url = f"https://www.googleapis.com/youtube/v3/videos"
-        
-        # API 키는 환경변수에서 가져오기
-        api_key = os.getenv('YOUTUBE_API_KEY', '')
-
-        if not api_key:
-            print("[WARNING] YouTube API 키가 설정되지 않았습니다.")
-            print("   .env 파일에 YOUTUBE_API_KEY를 설정해주세요.")
+        video_info = get_youtube_video_infos([video_id]).get(video_id)
+        if not video_info:
+            print(f"[ERROR] 비디오 ID {video_id}의 정보를 가져올 수 없습니다.")
             return None
         
-        params = {
-            'part': 'snippet,contentDetails',
-            'id': video_id,
-            'key': api_key
-        }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if not data.get('items'):
-            print(f"[ERROR] 비디오 ID {video_id}를 찾을 수 없습니다.")
-            return None
-        
-        video_info = data['items'][0]
         print(f"[OK] YouTube 비디오 정보를 성공적으로 가져왔습니다.")
         print(f"   제목: {video_info['snippet']['title']}")
         
         return video_info
         
-    except requests.exceptions.RequestException as e:
-        print(f"[ERROR] YouTube API 요청 중 오류: {e}")
-        return None
     except Exception as e:
         print(f"[ERROR] 비디오 정보 가져오기 중 오류: {e}")
         return None
@@ -101,35 +160,21 @@ def extract_chapters_from_description(description: str) -> List[tuple]:
     return chapters
 
 
-def get_youtube_chapters(video_id: str) -> Optional[List[VideoSegment]]:
-    """
-    YouTube 영상에서 실제 챕터 정보를 가져와서 VideoSegment 객체로 변환합니다.
-    
-    Args:
-        video_id (str): YouTube 비디오 ID
-    
-    Returns:
-        Optional[List[VideoSegment]]: 챕터 세그먼트 리스트
-    """
-    print(f"[INFO] YouTube 챕터 추출 중: {video_id}")
-    
-    # 1. YouTube API로 비디오 정보 가져오기
-    video_info = get_youtube_video_info(video_id)
-    if not video_info:
-        print("[WARNING] YouTube API를 사용할 수 없어 설명에서 챕터를 추출합니다.")
-        return None
-    
-    # 2. 설명에서 챕터 정보 추출
+def _segments_from_video_info(video_id: str, video_info: dict, verbose: bool = True) -> Optional[List[VideoSegment]]:
+    """비디오 정보의 설명에서 챕터를 추출하여 VideoSegment 리스트로 변환합니다. (verbose=False면 챕터별 출력 생략)"""
+    # 설명에서 챕터 정보 추출
     description = video_info['snippet'].get('description', '')
     chapters = extract_chapters_from_description(description)
     
     if not chapters:
-        print("[WARNING] 설명에서 챕터 정보를 찾을 수 없습니다.")
+        if verbose:
+            print(f"[WARNING] {video_id}: 설명에서 챕터 정보를 찾을 수 없습니다.")
         return None
     
-    print(f"[OK] {len(chapters)}개의 챕터를 찾았습니다.")
+    if verbose:
+        print(f"[OK] {video_id}: {len(chapters)}개의 챕터를 찾았습니다.")
     
-    # 3. VideoSegment 객체로 변환
+    # VideoSegment 객체로 변환
     segments = []
     for idx, (time_str, title) in enumerate(chapters):
         start_sec = time_str_to_seconds(time_str)
@@ -150,11 +195,53 @@ def get_youtube_chapters(video_id: str) -> Optional[List[VideoSegment]]:
             subtitles="",
             tags=[],
             keywords=[],
-            summary=video_info['snippet'].get('description', '')[:200] + "...",
+            summary=description[:200] + "...",
             cognitive_level="Understand",
             dok_level="Level 2"
         )
         segments.append(segment)
-        print(f"   - {title} ({seconds_to_time_str(start_sec)} - {seconds_to_time_str(end_sec)})")
+        if verbose:
+            print(f"   - {title} ({seconds_to_time_str(start_sec)} - {seconds_to_time_str(end_sec)})")
+    
+    return segments
+
+
+def get_youtube_chapters(video_id: str) -> Optional[List[VideoSegment]]:
+    """
+    YouTube 영상에서 실제 챕터 정보를 가져와서 VideoSegment 객체로 변환합니다.
+    
+    Args:
+        video_id (str): YouTube 비디오 ID
     
-    return segments 
+    Returns:
+        Optional[List[VideoSegment]]: 챕터 세그먼트 리스트
+    """
+    print(f"[INFO] YouTube 챕터 추출 중: {video_id}")
+    
+    # 1. YouTube API로 비디오 정보 가져오기 (배치로 미리 받아둔 경우 캐시에서)
+    video_info = get_youtube_video_info(video_id)
+    if not video_info:
+        print("[WARNING] YouTube API를 사용할 수 없어 설명에서 챕터를 추출합니다.")
+        return None
+    
+    # 2. 설명에서 챕터를 추출하여 VideoSegment로 변환
+    return _segments_from_video_info(video_id, video_info)
+
+
+def get_youtube_chapters_batch(video_ids: Iterable[str]) -> Dict[str, Optional[List[VideoSegment]]]:
+    """
+    여러 영상의 YouTube 챕터를 한꺼번에 가져옵니다. (카탈로그 백필 등)
+    비디오 정보는 50개씩 묶어 요청합니다.
+    
+    Args:
+        video_ids: YouTube 비디오 ID 목록
+    
+    Returns:
+        Dict[str, Optional[List[VideoSegment]]]: video_id -> 챕터 세그먼트 리스트 (챕터가 없으면 None)
+    """
+    infos = get_youtube_video_infos(video_ids)
+    chapters = {vid: _segments_from_video_info(vid, info, verbose=False) if info else None
+                for vid, info in infos.items()}
+    found = sum(1 for segments in chapters.values() if segments)
+    print(f"[OK] YouTube 챕터 일괄 추출: {len(chapters)}개 영상 중 {found}개에서 챕터 발견")
+    return chapters
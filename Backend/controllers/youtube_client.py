@@ -0,0 +1,345 @@
+"""
+YouTube Data API v3 공용 클라이언트
+- 연결을 재사용하는 requests.Session (커넥션 풀) 하나를 프로세스 전체에서 공유
+- API 키별 토큰 버킷으로 초당 요청 수를 제한 (프로세스별)
+- API 키별 일일 쿼터(단위) 사용량은 응답 캐시의 SQLite 파일에 기록하여 모든 워커 프로세스가 함께 계산하고,
+  쿼터가 남은 키로 자동 전환 (응답 캐시를 끄면 프로세스별 토큰 버킷으로 근사)
+- 429/5xx, 연결 오류, 시간 초과는 지수 백오프(jitter 포함)로 재시도 (Retry-After 헤더 우선)
+- 같은 요청이 동시에 여러 번 들어오면 한 번만 보내고 결과를 공유 (request coalescing)
+- 모든 요청에 연결/응답 시간 제한 적용
+- 응답은 SQLite 캐시(http_cache)에 저장하여 재시작/다른 워커 프로세스에서도 재사용
+  (엔드포인트별 TTL, ETag 재검증, stale-while-revalidate, 요청 실패 시 캐시된 응답으로 대체)
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from Backend.controllers.http_cache import CachedResponse, ResponseCache, cache_key, get_response_cache
+
+YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
+
+# (연결, 응답) 시간 제한(초)
+DEFAULT_TIMEOUT = (3.05, 10)
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 16.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+POOL_MAXSIZE = 16
+
+# 엔드포인트별 쿼터 비용 (YouTube Data API 단위)
+QUOTA_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+    "captions": 50,
+}
+DEFAULT_DAILY_QUOTA = 10000
+# 키 하나당 초당 요청 수
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+# 쿼터 소진으로 판단하는 403 사유
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+# 잠시 후 재시도하면 되는 403 사유
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+class YouTubeAPIError(Exception):
+    """YouTube API 요청 실패"""
+
+    def __init__(self, message: str, status: Optional[int] = None, reason: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class QuotaExceededError(YouTubeAPIError):
+    """사용 가능한 모든 API 키의 쿼터가 소진됨"""
+
+
+class TokenBucket:
+    """용량 capacity, 초당 rate만큼 채워지는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """토큰을 가져오면 0, 부족하면 가져오지 않고 기다려야 할 시간(초)을 반환합니다."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """토큰이 찰 때까지 기다렸다가 가져옵니다. timeout 안에 못 가져오면 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(min(wait, 1.0))
+
+    def drain(self):
+        """남은 토큰을 모두 비웁니다. (서버가 쿼터 소진을 알려온 경우)"""
+        with self._lock:
+            self._refill()
+            self._tokens = 0.0
+
+
+class _KeyState:
+    """API 키 하나의 요청 속도/쿼터 버킷 (버킷은 프로세스별, 공유 쿼터는 YouTubeClient가 캐시에 기록)"""
+
+    def __init__(self, key: str, daily_quota: float, requests_per_second: float):
+        self.key = key
+        # 공유 쿼터 기록에 쓰는 키 식별자 (키 원문은 저장하지 않음)
+        self.key_id = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        self.daily_quota = daily_quota
+        self.rate = TokenBucket(capacity=max(1.0, requests_per_second), rate=requests_per_second)
+        # 응답 캐시가 없을 때만 사용: 하루에 걸쳐 균등하게 다시 채워지는 것으로 근사
+        self.quota = TokenBucket(capacity=daily_quota, rate=daily_quota / 86400.0)
+
+
+def _load_api_keys() -> List[str]:
+    """YOUTUBE_API_KEYS(쉼표 구분) 또는 YOUTUBE_API_KEY 환경변수에서 키 목록을 읽습니다."""
+    raw = os.getenv("YOUTUBE_API_KEYS") or os.getenv("YOUTUBE_API_KEY", "")
+    return [k.strip() for k in raw.split(",") if k.strip()]
+
+
+def _error_reason(response: requests.Response) -> Optional[str]:
+    try:
+        errors = response.json().get("error", {}).get("errors", [])
+        return errors[0].get("reason") if errors else None
+    except ValueError:
+        return None
+
+
+class YouTubeClient:
+    """YouTube Data API v3 클라이언트"""
+
+    def __init__(self, api_keys: Optional[Sequence[str]] = None, session: Optional[requests.Session] = None,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, max_retries: int = MAX_RETRIES,
+                 daily_quota: Optional[float] = None, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 cache: Optional[ResponseCache] = None):
+        keys = list(api_keys) if api_keys is not None else _load_api_keys()
+        daily_quota = daily_quota or float(os.getenv("YOUTUBE_DAILY_QUOTA", DEFAULT_DAILY_QUOTA))
+        self._keys = [_KeyState(k, daily_quota, requests_per_second) for k in keys]
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = session or self._create_session()
+        self.cache = cache
+        self._inflight: Dict[Tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        session = requests.Session()
+        # 재시도는 클라이언트에서 직접 처리하므로 어댑터 재시도는 끔
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def has_keys(self) -> bool:
+        return bool(self._keys)
+
+    def remaining_quota(self) -> Dict[str, float]:
+        """키별 남은 쿼터 추정치 (키는 끝 4자리만 표시)"""
+        if self.cache is not None:
+            return {f"...{state.key[-4:]}": max(0.0, state.daily_quota - self.cache.quota_used(state.key_id))
+                    for state in self._keys}
+        return {f"...{state.key[-4:]}": state.quota.tokens for state in self._keys}
+
+    def _consume_quota(self, state: _KeyState, cost: float) -> bool:
+        if self.cache is not None:
+            return self.cache.consume_quota(state.key_id, cost, state.daily_quota)
+        return state.quota.try_acquire(cost) == 0.0
+
+    def _exhaust_quota(self, state: _KeyState):
+        if self.cache is not None:
+            self.cache.exhaust_quota(state.key_id, state.daily_quota)
+        else:
+            state.quota.drain()
+
+    def _pick_key(self, cost: float) -> _KeyState:
+        """쿼터가 남은 첫 번째 키를 고르고 비용만큼 차감합니다."""
+        for state in self._keys:
+            if self._consume_quota(state, cost):
+                return state
+        raise QuotaExceededError("사용 가능한 YouTube API 쿼터가 없습니다.", status=403, reason="quotaExceeded")
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+    def _request(self, endpoint: str, params: Dict[str, Any],
+                 etag: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        요청을 보내고 (JSON 응답, ETag)를 반환합니다.
+        etag를 주면 If-None-Match로 보내며, 304 Not Modified이면 응답 대신 None을 반환합니다.
+        """
+        if not self._keys:
+            raise YouTubeAPIError("YouTube API 키가 지정되지 않았습니다.")
+        url = f"{YOUTUBE_API_BASE}/{endpoint}"
+        cost = QUOTA_COSTS.get(endpoint, 1)
+        last_error: Optional[Exception] = None
+        headers = {"If-None-Match": etag} if etag else None
+
+        attempt = 0
+        while attempt <= self.max_retries:
+            state = self._pick_key(cost)
+            state.rate.acquire()
+            try:
+                response = self.session.get(url, params={**params, "key": state.key}, headers=headers,
+                                            timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                last_error = e
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code == 200:
+                body = response.json()
+                return body, response.headers.get("ETag") or body.get("etag")
+            if response.status_code == 304 and etag:
+                return None, response.headers.get("ETag") or etag
+
+            reason = _error_reason(response)
+            if response.status_code == 403 and reason in QUOTA_REASONS:
+                # 이 키는 쿼터 소진: 버킷을 비우고 다음 키로 바로 재시도
+                print(f"⚠️ YouTube API 키 ...{state.key[-4:]} 쿼터 소진, 다른 키로 전환합니다.")
+                self._exhaust_quota(state)
+                continue
+            if response.status_code in RETRY_STATUS or (response.status_code == 403 and reason in RATE_LIMIT_REASONS):
+                last_error = YouTubeAPIError(f"YouTube API 일시 오류 ({response.status_code})",
+                                             status=response.status_code, reason=reason)
+                time.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+            raise YouTubeAPIError(f"YouTube API 요청 실패 ({response.status_code}, {reason})",
+                                  status=response.status_code, reason=reason)
+
+        raise YouTubeAPIError(f"YouTube API 요청 재시도 횟수 초과: {last_error}")
+
+    def _fetch(self, endpoint: str, params: Dict[str, Any],
+               cached: Optional[CachedResponse] = None) -> Dict[str, Any]:
+        """API를 호출하고 캐시를 갱신합니다. 캐시된 응답이 있으면 ETag로 재검증합니다."""
+        body, etag = self._request(endpoint, params, etag=cached.etag if cached else None)
+        if body is None:
+            # 304: 바뀌지 않았으므로 캐시된 본문을 그대로 사용
+            self.cache.touch(cached.key, endpoint, etag)
+            return cached.body
+        if self.cache is not None:
+            self.cache.put(cache_key(endpoint, params), endpoint, body, etag)
+        return body
+
+    def _fetch_coalesced(self, endpoint: str, params: Dict[str, Any],
+                         cached: Optional[CachedResponse] = None) -> Dict[str, Any]:
+        """같은 (endpoint, params) 요청이 이미 진행 중이면 새로 보내지 않고 그 결과를 기다립니다."""
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._fetch(endpoint, params, cached)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _revalidate(self, endpoint: str, params: Dict[str, Any], cached: CachedResponse):
+        try:
+            self._fetch_coalesced(endpoint, params, cached)
+        except Exception as e:
+            print(f"⚠️ YouTube API 캐시 재검증 실패 ({endpoint}): {e}")
+
+    def get(self, endpoint: str, params: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        GET {YOUTUBE_API_BASE}/{endpoint} 요청을 보내고 JSON 응답을 반환합니다.
+        - 신선한 캐시 응답이 있으면 API를 호출하지 않음
+        - 신선 기간이 지났지만 stale 기간 안이면 캐시 응답을 바로 반환하고 백그라운드에서 재검증
+        - 그보다 오래됐으면 ETag로 재검증하고, 요청이 실패하면 캐시된 응답으로 대체
+        """
+        if self.cache is None or not use_cache:
+            return self._fetch_coalesced(endpoint, params)
+
+        cached = self.cache.get(cache_key(endpoint, params))
+        if cached is not None:
+            now = time.time()
+            if cached.is_fresh(now):
+                return cached.body
+            if cached.is_usable_stale(now):
+                if self.cache.claim_revalidation(cached.key):
+                    threading.Thread(target=self._revalidate, args=(endpoint, params, cached), daemon=True).start()
+                return cached.body
+
+        try:
+            return self._fetch_coalesced(endpoint, params, cached)
+        except YouTubeAPIError as e:
+            if cached is None:
+                raise
+            print(f"⚠️ YouTube API 요청 실패, 캐시된 응답을 사용합니다 ({endpoint}): {e}")
+            return cached.body
+
+    def search(self, q: str, **params) -> Dict[str, Any]:
+        return self.get("search", {"part": "snippet", "q": q, **params})
+
+    def videos(self, video_ids: Sequence[str], part: str = "snippet,contentDetails") -> Dict[str, Any]:
+        return self.get("videos", {"part": part, "id": ",".join(video_ids)})
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_youtube_client() -> YouTubeClient:
+    """프로세스 전역 YouTube API 클라이언트를 반환합니다. (처음 호출할 때 환경변수의 키를 읽음)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            # YOUTUBE_API_CACHE=0이면 응답 캐시를 사용하지 않음
+            cache = None if os.getenv("YOUTUBE_API_CACHE", "1") == "0" else get_response_cache()
+            _default_client = YouTubeClient(cache=cache)
+        return _default_client
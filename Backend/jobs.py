@@ -0,0 +1,367 @@
+"""
+백그라운드 영상 분석 작업 큐 (SQLite 기반)
+
+- Frontend는 분석 작업을 제출(submit)하고 상태/단계별 진행도를 조회(get)
+- 워커 프로세스(python -m Backend.jobs)가 큐에서 작업을 꺼내 분석 파이프라인을 실행
+- 챕터가 생성되면 부분 결과(챕터 목록)를 먼저 기록하여 UI에서 바로 표시 가능
+
+사용 예:
+    python -m Backend.jobs            # 워커 실행
+    python -m Backend.jobs --once     # 대기 중인 작업을 모두 처리한 뒤 종료
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# UI 진행도 표시용 단계 순서와 이름
+ANALYSIS_STAGES = [
+    ("transcript", "자막 추출"),
+    ("youtube_chapters", "YouTube 챕터 조회"),
+    ("chapters", "챕터 생성"),
+    ("mapped", "자막 매핑"),
+    ("bloom", "Bloom 인지단계 분류"),
+    ("summaries", "AI 요약"),
+    ("save", "결과 저장"),
+    ("search_index", "검색 색인"),
+]
+
+# 부분 결과로 기록할 단계 (챕터가 확정되는 시점)
+PARTIAL_RESULT_STAGE = "chapters"
+
+# 워커 heartbeat 주기와 유효 시간 (초)
+WORKER_HEARTBEAT_INTERVAL = 5.0
+WORKER_HEARTBEAT_TIMEOUT = 15.0
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def get_default_db_path() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'jobs.sqlite')
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class JobQueue:
+    """SQLite 파일 기반 분석 작업 큐. 여러 Streamlit 프로세스와 워커가 공유합니다."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_default_db_path()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    video_id TEXT NOT NULL,
+                    lang TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    current_stage TEXT,
+                    stages TEXT NOT NULL DEFAULT '{}',
+                    partial_result TEXT,
+                    error TEXT,
+                    worker_pid INTEGER,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+                CREATE INDEX IF NOT EXISTS idx_jobs_video ON jobs(video_id, lang, id);
+                CREATE TABLE IF NOT EXISTS workers (
+                    pid INTEGER PRIMARY KEY,
+                    heartbeat REAL NOT NULL
+                );
+            """)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_job(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["stages"] = json.loads(job["stages"] or "{}")
+        job["partial_result"] = json.loads(job["partial_result"]) if job["partial_result"] else None
+        return job
+
+    def submit(self, video_id: str, lang: str = 'en') -> int:
+        """
+        분석 작업을 제출합니다. 같은 영상/언어의 작업이 이미 대기 중이거나 실행 중이면
+        새로 만들지 않고 기존 작업 ID를 반환합니다.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE video_id = ? AND lang = ? AND status IN (?, ?) ORDER BY id DESC LIMIT 1",
+                (video_id, lang, JOB_QUEUED, JOB_RUNNING)
+            ).fetchone()
+            if row:
+                conn.execute("COMMIT")
+                return int(row["id"])
+            cur = conn.execute(
+                "INSERT INTO jobs (video_id, lang, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (video_id, lang, JOB_QUEUED, _now(), _now())
+            )
+            conn.execute("COMMIT")
+            print(f"📥 분석 작업 등록: job={cur.lastrowid}, video_id={video_id}")
+            return int(cur.lastrowid)
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            return self._row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def latest_for_video(self, video_id: str, lang: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        query = "SELECT * FROM jobs WHERE video_id = ?"
+        params: List[Any] = [video_id]
+        if lang:
+            query += " AND lang = ?"
+            params.append(lang)
+        with self._connect() as conn:
+            return self._row_to_job(conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone())
+
+    def claim_next(self, worker_pid: int) -> Optional[Dict[str, Any]]:
+        """가장 오래된 대기 작업을 원자적으로 가져와 실행 중으로 표시합니다."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_pid = ?, updated_at = ? WHERE id = ?",
+                (JOB_RUNNING, worker_pid, _now(), row["id"])
+            )
+            conn.execute("COMMIT")
+        return self.get(int(row["id"]))
+
+    def update_stage(self, job_id: int, stage: str, status: str, partial_result: Any = None):
+        """단계 상태(및 부분 결과)를 기록합니다."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT stages FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return
+            stages = json.loads(row["stages"] or "{}")
+            stages[stage] = status
+            if partial_result is not None:
+                conn.execute(
+                    "UPDATE jobs SET stages = ?, current_stage = ?, partial_result = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(stages), stage, json.dumps(partial_result, ensure_ascii=False), _now(), job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET stages = ?, current_stage = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(stages), stage, _now(), job_id)
+                )
+            conn.execute("COMMIT")
+
+    def finish(self, job_id: int, ok: bool, error: Optional[str] = None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (JOB_DONE if ok else JOB_FAILED, error, _now(), job_id)
+            )
+
+    def heartbeat(self, worker_pid: int):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO workers (pid, heartbeat) VALUES (?, ?) "
+                "ON CONFLICT(pid) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (worker_pid, time.time())
+            )
+
+    def remove_worker(self, worker_pid: int):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM workers WHERE pid = ?", (worker_pid,))
+
+    def has_live_worker(self) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(heartbeat) AS hb FROM workers").fetchone()
+        return bool(row and row["hb"] and time.time() - row["hb"] < WORKER_HEARTBEAT_TIMEOUT)
+
+    def requeue_orphaned(self) -> int:
+        """heartbeat가 끊긴 워커가 실행 중이던 작업을 다시 대기 상태로 돌립니다."""
+        cutoff = time.time() - WORKER_HEARTBEAT_TIMEOUT
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ? AND "
+                "(worker_pid IS NULL OR worker_pid NOT IN (SELECT pid FROM workers WHERE heartbeat >= ?))",
+                (JOB_QUEUED, _now(), JOB_RUNNING, cutoff)
+            )
+            return cur.rowcount
+
+
+def _chapters_preview(segments) -> List[Dict[str, Any]]:
+    """UI에 먼저 보여줄 챕터 목록 (제목과 시간만)"""
+    return [
+        {"title": seg.title, "start_sec": int(seg.start_time), "end_sec": int(seg.end_time)}
+        for seg in segments
+    ]
+
+
+def process_job(queue: JobQueue, job: Dict[str, Any]) -> bool:
+    """작업 하나를 실행하고 단계별 진행도를 큐에 기록합니다."""
+    from .main import run_analysis
+    from .controllers.pipeline import STATUS_RUNNING
+
+    job_id = job["id"]
+
+    streamed_chapters = []
+
+    def on_event(stage, status, output):
+        partial = _chapters_preview(output) if stage == PARTIAL_RESULT_STAGE and output else None
+        queue.update_stage(job_id, stage, status, partial_result=partial)
+
+    def on_chapter(segment):
+        # 미리보기 자동 챕터가 확정될 때마다 지금까지의 챕터를 UI에 공개 (최종 챕터는 chapters 단계 완료 시 교체)
+        streamed_chapters.append(segment)
+        queue.update_stage(job_id, PARTIAL_RESULT_STAGE, STATUS_RUNNING,
+                           partial_result=_chapters_preview(streamed_chapters))
+
+    print(f"🎬 작업 시작: job={job_id}, video_id={job['video_id']}")
+    try:
+        result = run_analysis(job["video_id"], lang=job["lang"], on_event=on_event, on_chapter=on_chapter)
+    except Exception as e:
+        queue.finish(job_id, ok=False, error=str(e))
+        print(f"❌ 작업 실패: job={job_id} ({e})")
+        return False
+
+    if result.ok("save"):
+        queue.finish(job_id, ok=True)
+        print(f"✅ 작업 완료: job={job_id}")
+        return True
+
+    if not result.ok("transcript"):
+        error = "자막을 추출할 수 없습니다."
+    else:
+        error = "; ".join(f"{name}: {err}" for name, err in result.errors.items()) or "세그먼트를 추출할 수 없습니다."
+    queue.finish(job_id, ok=False, error=error)
+    print(f"❌ 작업 실패: job={job_id} ({error})")
+    return False
+
+
+def refresh_indexes():
+    """
+    분석 결과가 바뀌었으면 영상 전체를 대상으로 한 파생 색인(추천 색인, 챕터 유사도 그래프)을 다시 만듭니다.
+    UI 요청 경로에서 만들지 않도록 워커가 대기열이 빌 때 실행합니다.
+    """
+    try:
+        from .controllers.recommendation import refresh_recommendation_index
+        from .controllers.learning_path import refresh_similarity_graph
+        refresh_similarity_graph(refresh_recommendation_index())
+    except Exception as e:
+        print(f"⚠️ 추천 색인 갱신 실패: {e}")
+
+
+def run_worker(db_path: Optional[str] = None, poll_interval: float = 1.0, once: bool = False):
+    """
+    큐에서 작업을 꺼내 순서대로 처리하는 워커 루프.
+    모델은 프로세스 전역 레지스트리에 남아 있으므로 다음 작업에서 재사용됩니다.
+    """
+    queue = JobQueue(db_path)
+    worker_pid = os.getpid()
+    queue.heartbeat(worker_pid)
+    queue.remove_worker(0)  # ensure_worker가 남긴 임시 heartbeat 제거
+    requeued = queue.requeue_orphaned()
+    if requeued:
+        print(f"🔁 중단된 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+    print(f"👷 분석 워커 시작 (pid={worker_pid}, db={queue.db_path})")
+
+    # 한 단계가 오래 걸려도 살아 있음을 알리도록 별도 스레드에서 heartbeat 기록
+    stop_event = threading.Event()
+
+    def heartbeat_loop():
+        while not stop_event.wait(WORKER_HEARTBEAT_INTERVAL):
+            try:
+                queue.heartbeat(worker_pid)
+            except sqlite3.Error as e:
+                print(f"[WARN] 워커 heartbeat 기록 실패: {e}")
+
+    threading.Thread(target=heartbeat_loop, daemon=True).start()
+
+    # 시작할 때 한 번, 이후에는 분석이 끝난 뒤 대기열이 비면 색인 갱신
+    indexes_dirty = True
+    try:
+        while True:
+            job = queue.claim_next(worker_pid)
+            if job is None:
+                if indexes_dirty:
+                    refresh_indexes()
+                    indexes_dirty = False
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+            if process_job(queue, job):
+                indexes_dirty = True
+    finally:
+        stop_event.set()
+        queue.remove_worker(worker_pid)
+
+
+def ensure_worker(db_path: Optional[str] = None) -> bool:
+    """
+    살아 있는 워커가 없으면 백그라운드 워커 프로세스를 시작합니다.
+
+    Returns:
+        bool: 새 워커를 시작했으면 True
+    """
+    queue = JobQueue(db_path)
+    if queue.has_live_worker():
+        return False
+
+    log_path = os.path.join(os.path.dirname(queue.db_path), 'jobs_worker.log')
+    cmd = [sys.executable, "-m", "Backend.jobs"]
+    if db_path:
+        cmd += ["--db", db_path]
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        subprocess.Popen(cmd, cwd=str(ROOT_DIR), stdout=log_file, stderr=subprocess.STDOUT, **kwargs)
+    # 시작 직후 중복 실행을 막기 위해 임시 heartbeat 기록
+    queue.heartbeat(0)
+    print(f"👷 분석 워커 프로세스 시작 (log: {log_path})")
+    return True
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="영상 분석 작업 워커")
+    parser.add_argument("--db", help="작업 큐 SQLite 파일 경로")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="대기 작업 확인 주기(초)")
+    parser.add_argument("--once", action="store_true", help="대기 중인 작업을 모두 처리한 뒤 종료")
+    args = parser.parse_args(argv)
+    run_worker(args.db, poll_interval=args.poll_interval, once=args.once)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
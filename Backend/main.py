@@ -5,13 +5,35 @@ YouTube 영상 분석 메인 스크립트
 
 import json
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from .controllers.transcript import extract_transcript
 from .controllers.youtube_api import get_youtube_chapters
 from .controllers.segments import map_subtitles_to_segments
 from .controllers.file_io import  save_segments_with_subtitles_to_json
-from .controllers.bloom_classifier import BloomClassifier
-from .controllers.semantic_segmentation import create_semantic_segments
+from .controllers.bloom_classifier import BloomClassifier, get_default_model_path, DEFAULT_AGGREGATION
+from .controllers.semantic_segmentation import (
+    create_semantic_segments, EMBEDDING_MODEL_NAME, DEFAULT_EMBEDDING_MODE, DEFAULT_SEGMENTATION_ENGINE
+)
+from .controllers.embedding_store import get_embedding_store
+from .controllers.catalog import get_catalog
+from .controllers.search import index_video
+from .controllers.streaming_segmentation import iter_semantic_chapters
+from .controllers.summary import (
+    generate_segment_summaries, get_summary_model_name,
+    SUMMARIZATION_AVAILABLE, SUMMARY_MAX_LENGTH, SUMMARY_MIN_LENGTH, SUMMARY_FAILED_MESSAGE
+)
+from .controllers.result_cache import (
+    ResultCache, file_fingerprint,
+    snippets_to_dicts, snippets_from_dicts, segments_to_dicts, segments_from_dicts
+)
+from .controllers.pipeline import Stage, PipelineRunner, PipelineResult, Uncached
+
+# Semantic Segmentation 파라미터
+# desired_min_duration을 25초로 늘려서 더 많은 병합 유도 (기본값 15.0 -> 25.0)
+SEMANTIC_SEGMENTATION_PARAMS = {"initial_window_seconds": 30, "desired_min_duration": 25.0,
+                                "embedding_mode": DEFAULT_EMBEDDING_MODE,
+                                "segmentation_engine": DEFAULT_SEGMENTATION_ENGINE}
 
 """
 def load_selected_video_id(default: str = "E6DuimPZDz8") -> str:
@@ -37,21 +59,212 @@ def load_selected_video_id(default: str = "E6DuimPZDz8") -> str:
         return default
 """
 
-def main(video_id="E6DuimPZDz8", lang='en'):
+def build_analysis_stages(video_id: str, lang: str = 'en', use_cache: bool = True,
+                          on_chapter=None, prefetched: Optional[Dict[str, Any]] = None) -> List[Stage]:
+    """
+    영상 분석 파이프라인의 단계 DAG를 정의합니다.
+
+    transcript ─┬──────────────┐
+                │              ▼
+    youtube_chapters ──▶ chapters ──▶ mapped ─┬─▶ bloom ─────┐
+                                              ├─▶ summaries ─┤
+                                              └──────────────┴─▶ save
+
+    bloom과 summaries는 자막이 매핑된 세그먼트만 필요하므로 동시에 실행됩니다.
+    use_cache가 False이면 임베딩 저장소도 사용하지 않습니다.
+    on_chapter가 주어지면 자동 챕터를 만들기 전에 스트리밍 방식으로 미리보기 챕터를 만들어, 확정되는 즉시
+    on_chapter(segment)를 호출합니다. 저장되는 챕터는 CLI와 같은 create_semantic_segments(SEMANTIC_SEGMENTATION_PARAMS)
+    결과이며, 미리보기에서 계산한 창 임베딩은 임베딩 저장소에서 재사용됩니다.
+    prefetched에 네트워크 단계(transcript, youtube_chapters) 결과가 있으면 다시 가져오지 않고 그대로 사용합니다.
+    (캐시를 사용하지 않는 배치 분석에서 수집 결과를 모델 프로세스로 넘길 때 사용)
+    """
+    # 프로세스 전역 저장소를 재사용하여 실행마다 샤드 목록을 다시 읽지 않음
+    embedding_store = get_embedding_store(enabled=use_cache)
+    # 카탈로그에 기록할 모델 버전 (단계 캐시 키에도 사용)
+    model_versions = {
+        "embedding": EMBEDDING_MODEL_NAME,
+        "bloom": file_fingerprint(get_default_model_path()),
+        "summary": get_summary_model_name(lang),
+    }
+
+    prefetched = prefetched or {}
+
+    def fetch_transcript():
+        if "transcript" in prefetched:
+            return prefetched["transcript"]
+        print(f"\n🌐 선택된 언어: {'한국어' if lang == 'ko' else '영어'}")
+        return extract_transcript(video_id, lang=lang)
+
+    def fetch_youtube_chapters():
+        if "youtube_chapters" in prefetched:
+            return prefetched["youtube_chapters"]
+        # 실제 YouTube 챕터 정보 가져오기
+        print(f"\n" + "=" * 60)
+        print("📋 YouTube 챕터 기반 세그먼트 추출")
+        print("=" * 60)
+        return get_youtube_chapters(video_id)
+
+    def preview_chapters(transcript):
+        # 미리보기 챕터 (UI 표시용, 저장하지 않음): 실패해도 전체 분할은 계속 진행
+        try:
+            for segment in iter_semantic_chapters(
+                    transcript, video_id,
+                    window_seconds=SEMANTIC_SEGMENTATION_PARAMS["initial_window_seconds"],
+                    desired_min_duration=SEMANTIC_SEGMENTATION_PARAMS["desired_min_duration"],
+                    embedding_store=embedding_store):
+                on_chapter(segment)
+        except ImportError:
+            raise
+        except Exception as e:
+            print(f"⚠️ 미리보기 챕터 생성 실패: {e}")
+
+    def build_chapters(transcript, youtube_chapters):
+        if youtube_chapters:
+            return youtube_chapters
+
+        # YouTube 챕터가 없는 경우 Semantic Segmentation으로 자동 생성
+        print("⚠️ YouTube 챕터를 찾을 수 없습니다.")
+        print("🔍 Semantic Segmentation을 이용한 자동 챕터 생성 시도 중...")
+        try:
+            if on_chapter is not None:
+                preview_chapters(transcript)
+            segments = create_semantic_segments(transcript, video_id, embedding_store=embedding_store,
+                                                **SEMANTIC_SEGMENTATION_PARAMS)
+        except ImportError as e:
+            print(f"❌ Semantic Segmentation 모듈을 사용할 수 없습니다: {e}")
+            print("   pip install sentence-transformers scikit-learn을 실행해주세요.")
+            return None
+        if not segments:
+            print("❌ Semantic Segmentation으로도 챕터를 생성할 수 없습니다.")
+            return None
+        return segments
+
+    def map_subtitles(transcript, chapters):
+        # 캐시/다른 단계와 공유되는 객체를 변경하지 않도록 복사 후 매핑
+        segments = segments_from_dicts(segments_to_dicts(chapters))
+        return map_subtitles_to_segments(segments, transcript)
+
+    def classify_bloom(mapped):
+        print(f"\n" + "=" * 60)
+        print("🧠 Bloom 인지단계 분류")
+        print("=" * 60)
+        bloom_classifier = BloomClassifier()
+        classified = bloom_classifier.predict_segments(segments_from_dicts(segments_to_dicts(mapped)))
+        predictions = [
+            {"label": seg.bloom_category, "probabilities": getattr(seg, "bloom_probabilities", {}),
+             "failed": bool(getattr(seg, "bloom_failed", False))}
+            for seg in classified
+        ]
+        # 추론 오류로 Unknown이 된 세그먼트가 있으면 이번 실행에만 사용하고 다음 실행에서 다시 분류
+        if any(prediction["failed"] for prediction in predictions):
+            return Uncached(predictions)
+        return predictions
+
+    def summarize(mapped):
+        # 요약 라이브러리가 없으면 안내 문구가 캐시되지 않도록 None 반환
+        if not SUMMARIZATION_AVAILABLE:
+            return None
+        summaries = generate_segment_summaries(mapped, lang)
+        # 일부 배치가 실패하면(None) 단계 결과를 캐시하지 않아 다음 실행에서 다시 요약
+        if any(summary is None for summary in summaries):
+            return Uncached(summaries)
+        return summaries
+
+    def save_results(mapped, bloom, summaries):
+        segments = segments_from_dicts(segments_to_dicts(mapped))
+        # 요약/Bloom 분류가 없거나 일부 실패하면 미완료로 기록하여 다음 분석(배치, 화면)에서 다시 실행
+        complete = True
+        if bloom is None:
+            print("⚠️ Bloom 분류 결과가 없어 Unknown으로 저장합니다.")
+            bloom = [{"label": "Unknown", "probabilities": {}, "failed": True}] * len(segments)
+        for segment, prediction in zip(segments, bloom):
+            segment.bloom_category = prediction["label"]
+            segment.bloom_probabilities = prediction["probabilities"]
+            complete = complete and not prediction.get("failed", False)
+        if summaries is None:
+            summaries = ["요약 생성에 필요한 라이브러리가 설치되어 있지 않습니다."] * len(segments)
+            complete = False
+        elif any(summary is None for summary in summaries):
+            summaries = [SUMMARY_FAILED_MESSAGE if summary is None else summary for summary in summaries]
+            complete = False
+        json_path = save_segments_with_subtitles_to_json(segments, video_id, language_code=lang, summaries=summaries)
+        get_catalog().record_segments(video_id, lang, segments, models=model_versions, json_path=json_path,
+                                      complete=complete)
+        if not complete:
+            print("⚠️ 요약/Bloom 분류 일부가 실패하여 미완료 분석으로 기록했습니다. 다음 분석에서 다시 실행합니다.")
+        return segments
+
+    def build_search_index(transcript, save, summaries):
+        # 실패한 요약(None)은 제목만으로 색인하여 안내 문구가 검색되지 않도록 함
+        return index_video(video_id, lang, transcript, save, summaries)
+
+    return [
+        Stage("transcript", fetch_transcript,
+              params={"video_id": video_id, "lang": lang},
+              encode=snippets_to_dicts, decode=snippets_from_dicts),
+        Stage("youtube_chapters", fetch_youtube_chapters,
+              params={"video_id": video_id},
+              encode=segments_to_dicts, decode=segments_from_dicts, required=False),
+        Stage("chapters", build_chapters, inputs=["transcript", "youtube_chapters"],
+              params={"video_id": video_id, "embedding_model": model_versions["embedding"], **SEMANTIC_SEGMENTATION_PARAMS},
+              encode=segments_to_dicts, decode=segments_from_dicts),
+        Stage("mapped", map_subtitles, inputs=["transcript", "chapters"],
+              encode=segments_to_dicts, cacheable=False),
+        Stage("bloom", classify_bloom, inputs=["mapped"],
+              params={"model": model_versions["bloom"], "aggregation": DEFAULT_AGGREGATION},
+              required=False),
+        Stage("summaries", summarize, inputs=["mapped"],
+              params={"model": model_versions["summary"],
+                      "max_length": SUMMARY_MAX_LENGTH, "min_length": SUMMARY_MIN_LENGTH},
+              required=False),
+        Stage("save", save_results, inputs=["mapped", "bloom", "summaries"],
+              encode=segments_to_dicts, cacheable=False),
+        Stage("search_index", build_search_index, inputs=["transcript", "save", "summaries"],
+              cacheable=False, required=False),
+    ]
+
+
+def run_analysis(video_id: str, lang: str = 'en', use_cache: bool = True, max_workers: int = 2,
+                 on_event=None, targets: Optional[List[str]] = None, on_chapter=None,
+                 prefetched: Optional[Dict[str, Any]] = None) -> PipelineResult:
+    """
+    분석 파이프라인을 실행합니다. 입력이 바뀌지 않은 단계는 캐시된 결과를 재사용합니다.
+
+    Args:
+        video_id (str): 분석할 YouTube 영상 ID
+        lang (str): 자막 언어 ('ko' 또는 'en')
+        use_cache (bool): 단계별 결과 캐시 사용 여부
+        max_workers (int): 동시에 실행할 최대 단계 수
+        on_event: 단계 상태 변경 콜백 on_event(stage_name, status, output)
+        targets: 실행할 최종 단계 (None이면 전체)
+        on_chapter: 미리보기 자동 챕터가 확정될 때마다 호출되는 콜백 on_chapter(segment)
+                    (최종 챕터는 on_event의 chapters 단계 결과)
+        prefetched: 이미 가져온 네트워크 단계 결과 {"transcript": ..., "youtube_chapters": ...}
+    """
+    runner = PipelineRunner(
+        build_analysis_stages(video_id, lang, use_cache=use_cache, on_chapter=on_chapter, prefetched=prefetched),
+        cache=ResultCache(enabled=use_cache),
+        max_workers=max_workers,
+        on_event=on_event
+    )
+    return runner.run(targets)
+
+
+def main(video_id="E6DuimPZDz8", lang='en', use_cache=True):
     """메인 실행 함수
     
     Args:
         video_id (str, optional): 분석할 YouTube 영상 ID. None이면 selected_video.json에서 로드
         language (str): 자막 언어 ('ko' 또는 'en'). 기본값은 'ko'
+        use_cache (bool): 단계별 결과 캐시 사용 여부. 입력이 같은 단계는 이전 결과를 재사용
     """
     print("=" * 60)
     print(f"🎬 YouTube 영상 분석 시작 - Video ID: {video_id}")
     print("=" * 60)
 
-    # 자막 추출
-    print(f"\n🌐 선택된 언어: {'한국어' if lang == 'ko' else '영어'}")
-    transcript_data = extract_transcript(video_id, lang=lang)
+    result = run_analysis(video_id, lang=lang, use_cache=use_cache)
 
+    transcript_data = result.outputs.get("transcript")
     if transcript_data:
         print(f"\n📊 추출된 자막 구간 수: {len(transcript_data)}")
         print("📝 첫 번째 자막 구간 예시:")
@@ -62,76 +275,31 @@ def main(video_id="E6DuimPZDz8", lang='en'):
         print("❌ 자막을 추출할 수 없습니다.")
         return
 
-    # 세그먼트 추출 (실제 YouTube 챕터 사용)
-    print(f"\n" + "=" * 60)
-    print("📋 YouTube 챕터 기반 세그먼트 추출")
-    print("=" * 60)
-
-    # 실제 YouTube 챕터 정보 가져오기
-    segments = get_youtube_chapters(video_id)
-
-    # YouTube 챕터가 없는 경우 Semantic Segmentation으로 자동 생성
-    if not segments:
-        print("⚠️ YouTube 챕터를 찾을 수 없습니다.")
-        print("🔍 Semantic Segmentation을 이용한 자동 챕터 생성 시도 중...")
-        
-        try:
-            # desired_min_duration을 25초로 늘려서 더 많은 병합 유도 (기본값 15.0 -> 25.0)
-            segments = create_semantic_segments(transcript_data, video_id, initial_window_seconds=30, desired_min_duration=25.0)
-            
-            if not segments:
-                print("❌ Semantic Segmentation으로도 챕터를 생성할 수 없습니다.")
-                return
-        except ImportError as e:
-            print(f"❌ Semantic Segmentation 모듈을 사용할 수 없습니다: {e}")
-            print("   pip install sentence-transformers scikit-learn을 실행해주세요.")
-            return
-        except Exception as e:
-            print(f"❌ Semantic Segmentation 중 오류 발생: {e}")
-            import traceback
-            traceback.print_exc()
-            return
-
+    segments = result.outputs.get("save")
     if segments:
-        # 자막 매핑
-        if transcript_data:
-            segments = map_subtitles_to_segments(segments, transcript_data)
-
-        # Bloom 인지단계 분류
-        print(f"\n" + "=" * 60)
-        print("🧠 Bloom 인지단계 분류")
-        print("=" * 60)
-        
-        try:
-            bloom_classifier = BloomClassifier()
-            segments = bloom_classifier.predict_segments(segments)
-        except Exception as e:
-            print(f"⚠️ Bloom 분류 중 오류 발생: {e}")
-            print("   Bloom 분류 없이 진행합니다.")
-            # 오류가 발생해도 계속 진행
-            for segment in segments:
-                segment.bloom_category = "Unknown"
-
-        # 세그먼트 정보 저장
-        save_segments_with_subtitles_to_json(segments, video_id, language_code=lang)
-
         print(f"\n📈 세그먼트 분석 결과:")
         print(f"   - 총 세그먼트 수: {len(segments)}개")
-        if segments:
-            avg_duration = sum(seg.end_time - seg.start_time for seg in segments) / len(segments)
-            print(f"   - 평균 세그먼트 길이: {avg_duration:.1f}초")
-            
-            # Bloom 분류 결과 요약
-            bloom_counts = {}
-            for seg in segments:
-                category = getattr(seg, 'bloom_category', 'Unknown')
-                bloom_counts[category] = bloom_counts.get(category, 0) + 1
-            
-            print(f"\n🧠 Bloom 인지단계 분포:")
-            for category, count in bloom_counts.items():
-                print(f"   - {category}: {count}개")
+        avg_duration = sum(seg.end_time - seg.start_time for seg in segments) / len(segments)
+        print(f"   - 평균 세그먼트 길이: {avg_duration:.1f}초")
+        
+        # Bloom 분류 결과 요약
+        bloom_counts = {}
+        for seg in segments:
+            category = getattr(seg, 'bloom_category', 'Unknown')
+            bloom_counts[category] = bloom_counts.get(category, 0) + 1
+        
+        print(f"\n🧠 Bloom 인지단계 분포:")
+        for category, count in bloom_counts.items():
+            print(f"   - {category}: {count}개")
     else:
+        for name, error in result.errors.items():
+            print(f"❌ {name} 단계 오류: {error}")
         print("⚠️ 세그먼트를 추출할 수 없습니다.")
+        return
+
+    # 추천 색인 등 영상 전체를 대상으로 한 색인 갱신
+    from .jobs import refresh_indexes
+    refresh_indexes()
 
     print(f"\n✅ 분석 완료!")
 
@@ -3,7 +3,11 @@ Models package for OSC  analysis
 """
 
 from Backend.models.video_segment import VideoSegment
+from Backend.models.transcript_snippet import TranscriptSnippet
+from Backend.models.transcript import Transcript
 
 __all__ = [
-    'VideoSegment'
+    'VideoSegment',
+    'TranscriptSnippet',
+    'Transcript'
 ]
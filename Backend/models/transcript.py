@@ -0,0 +1,178 @@
+"""
+열(column) 기반 자막 데이터 모델
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from Backend.models.transcript_snippet import TranscriptSnippet
+
+# 텍스트 버퍼에서 줄 사이에 두는 구분자 (연속 구간의 텍스트를 슬라이스 한 번으로 이어 붙이기 위함)
+TEXT_SEPARATOR = " "
+
+
+class Transcript:
+    """
+    자막 전체를 열 단위로 저장하는 컨테이너.
+
+    - starts / durations: float64 NumPy 배열
+    - 텍스트: 모든 줄을 TEXT_SEPARATOR로 이어 붙인 문자열 하나와 줄별 (시작, 끝) 오프셋
+
+    슬라이싱(transcript[i:j], time_slice)은 배열 뷰와 같은 텍스트 버퍼를 공유하므로 복사하지 않습니다.
+    순회하면 TranscriptSnippet을 내보내므로, 자막 리스트를 받는 기존 함수에도 그대로 전달할 수 있습니다.
+    """
+
+    __slots__ = ("starts", "durations", "_buffer", "_text_starts", "_text_ends")
+
+    def __init__(self, starts: np.ndarray, durations: np.ndarray, buffer: str,
+                 text_starts: np.ndarray, text_ends: np.ndarray):
+        self.starts = starts
+        self.durations = durations
+        self._buffer = buffer
+        self._text_starts = text_starts
+        self._text_ends = text_ends
+
+    @classmethod
+    def from_columns(cls, starts: Sequence[float], durations: Sequence[float], texts: Sequence[str]) -> "Transcript":
+        """시작 시각, 길이, 텍스트 목록으로 Transcript를 만듭니다."""
+        if not (len(starts) == len(durations) == len(texts)):
+            raise ValueError("starts, durations, texts의 길이가 일치해야 합니다.")
+        texts = [t or "" for t in texts]
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+        # 각 줄 뒤에 구분자 하나씩 (마지막 줄 제외)
+        text_starts = np.zeros(len(texts), dtype=np.int64)
+        if len(texts) > 1:
+            np.cumsum(lengths[:-1] + len(TEXT_SEPARATOR), out=text_starts[1:])
+        return cls(
+            np.asarray(starts, dtype=np.float64),
+            np.asarray(durations, dtype=np.float64),
+            TEXT_SEPARATOR.join(texts),
+            text_starts,
+            text_starts + lengths
+        )
+
+    @classmethod
+    def from_buffer(cls, starts: np.ndarray, durations: np.ndarray, buffer: str,
+                    text_starts: np.ndarray, text_ends: np.ndarray) -> "Transcript":
+        """buffer_columns()로 꺼낸 열 데이터로 Transcript를 다시 만듭니다. (바이너리 저장소용)"""
+        if not (len(starts) == len(durations) == len(text_starts) == len(text_ends)):
+            raise ValueError("열 데이터의 길이가 일치해야 합니다.")
+        return cls(
+            np.asarray(starts, dtype=np.float64),
+            np.asarray(durations, dtype=np.float64),
+            buffer,
+            np.asarray(text_starts, dtype=np.int64),
+            np.asarray(text_ends, dtype=np.int64)
+        )
+
+    def buffer_columns(self) -> Tuple[np.ndarray, np.ndarray, str, np.ndarray, np.ndarray]:
+        """
+        (starts, durations, 텍스트 버퍼, 텍스트 시작 오프셋, 텍스트 끝 오프셋)을 반환합니다.
+        슬라이스 뷰인 경우 이 범위의 버퍼만 잘라 오프셋을 0부터 다시 맞춥니다.
+        """
+        if len(self) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return self.starts, self.durations, "", empty, empty
+        base = int(self._text_starts[0])
+        buffer = self._buffer[base:int(self._text_ends[-1])]
+        return self.starts, self.durations, buffer, self._text_starts - base, self._text_ends - base
+
+    @classmethod
+    def from_snippets(cls, snippets: Iterable) -> "Transcript":
+        """.start, .duration, .text 속성을 가진 자막 구간(또는 dict) 목록으로 Transcript를 만듭니다."""
+        if isinstance(snippets, Transcript):
+            return snippets
+        items = list(snippets)
+        if items and isinstance(items[0], dict):
+            return cls.from_dicts(items)
+        return cls.from_columns(
+            [float(s.start) for s in items],
+            [float(s.duration) for s in items],
+            [s.text for s in items]
+        )
+
+    @classmethod
+    def from_dicts(cls, items: List[Dict[str, Any]]) -> "Transcript":
+        """{"text", "start", "duration"} dict 목록으로 Transcript를 만듭니다."""
+        return cls.from_columns(
+            [float(it["start"]) for it in items],
+            [float(it["duration"]) for it in items],
+            [it["text"] for it in items]
+        )
+
+    def to_dicts(self, include_end: bool = False) -> List[Dict[str, Any]]:
+        """dict 목록으로 변환합니다. include_end이면 "end" 키도 포함합니다."""
+        starts = self.starts.tolist()
+        durations = self.durations.tolist()
+        texts = self.texts()
+        if include_end:
+            ends = self.ends.tolist()
+            return [
+                {"start": s, "duration": d, "end": e, "text": t}
+                for s, d, e, t in zip(starts, durations, ends, texts)
+            ]
+        return [{"text": t, "start": s, "duration": d} for s, d, t in zip(starts, durations, texts)]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.starts + self.durations
+
+    def text_at(self, index: int) -> str:
+        return self._buffer[self._text_starts[index]:self._text_ends[index]]
+
+    def texts(self) -> List[str]:
+        buffer = self._buffer
+        return [buffer[s:e] for s, e in zip(self._text_starts.tolist(), self._text_ends.tolist())]
+
+    def join(self, start_idx: int = 0, end_idx: Optional[int] = None) -> str:
+        """[start_idx, end_idx) 줄의 텍스트를 공백으로 이어 붙인 문자열 (버퍼 슬라이스 한 번)"""
+        end_idx = len(self) if end_idx is None else end_idx
+        if end_idx <= start_idx:
+            return ""
+        return self._buffer[self._text_starts[start_idx]:self._text_ends[end_idx - 1]]
+
+    def index_range(self, start_time: float, end_time: float) -> Tuple[int, int]:
+        """
+        [start_time, end_time) 구간과 겹치는 줄을 모두 포함하는 연속 인덱스 범위 [lo, hi)를 반환합니다.
+        시작 시각이 정렬되어 있다고 가정합니다. (YouTube 자막은 시간순)
+        """
+        hi = int(np.searchsorted(self.starts, end_time, side="left"))
+        if hi == 0:
+            return 0, 0
+        running_max_ends = np.maximum.accumulate(self.ends[:hi])
+        lo = int(np.searchsorted(running_max_ends, start_time, side="right"))
+        return min(lo, hi), hi
+
+    def time_slice(self, start_time: float, end_time: float) -> "Transcript":
+        """[start_time, end_time) 구간과 겹치는 줄의 뷰 (복사 없음)"""
+        lo, hi = self.index_range(start_time, end_time)
+        return self[lo:hi]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError("Transcript는 step이 1인 슬라이스만 지원합니다.")
+            return Transcript(
+                self.starts[key], self.durations[key], self._buffer,
+                self._text_starts[key], self._text_ends[key]
+            )
+        index = int(key)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Transcript 인덱스가 범위를 벗어났습니다.")
+        return TranscriptSnippet(
+            text=self.text_at(index), start=float(self.starts[index]), duration=float(self.durations[index])
+        )
+
+    def __iter__(self) -> Iterator[TranscriptSnippet]:
+        for text, start, duration in zip(self.texts(), self.starts.tolist(), self.durations.tolist()):
+            yield TranscriptSnippet(text=text, start=start, duration=duration)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return f"Transcript(lines={len(self)})"
@@ -0,0 +1,13 @@
+"""
+자막 구간 데이터 모델
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class TranscriptSnippet:
+    """자막 한 줄을 나타내는 데이터 클래스 (youtube_transcript_api의 snippet과 같은 속성)"""
+    text: str
+    start: float
+    duration: float
@@ -2,12 +2,11 @@ import os
 import re
 import json
 import sys
-import requests
+import time
 import streamlit as st
 from datetime import datetime
 from pathlib import Path
 from streamlit import components
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
 from dotenv import load_dotenv
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -17,9 +16,21 @@ if str(ROOT_DIR) not in sys.path:
 # .env 파일 로드
 load_dotenv(ROOT_DIR / ".env")
 
-from Backend import main as backend_main # Backend > main.py 호출
+from Backend.jobs import JobQueue, ensure_worker, ANALYSIS_STAGES, JOB_DONE, JOB_FAILED # 백그라운드 분석 작업 큐
+from Backend.controllers.segment_store import SegmentStore # 영상별 세그먼트 저장소
+from Backend.controllers.catalog import get_catalog # 분석된 영상 카탈로그
+from Backend.controllers.recommendation import get_recommendation_index, MICRO_LEARNING_MAX_SECONDS # 챕터 추천 색인
+from Backend.controllers.learning_path import plan_learning_path # 맞춤 학습 경로
+from Backend.controllers.search import get_search_index # 강의 내용 검색
+from Backend.controllers.youtube_client import get_youtube_client # YouTube API 공용 클라이언트
+from Backend.controllers.caption_probe import get_caption_tracks, has_preferred_captions, probe_captions # 자막 제공 여부 확인
 
-API_KEY = os.getenv("YOUTUBE_API_KEY", "")
+# 검색 결과를 자막 있는 영상으로 거를지 (후보마다 자막 목록 조회가 필요해 첫 화면이 느려지므로 기본값은 끔)
+CAPTION_FILTER_ENABLED = os.getenv("CAPTION_FILTER", "0") == "1"
+
+# 분석 언어와 작업 상태 조회 주기(초)
+ANALYSIS_LANG = "en"
+ANALYSIS_POLL_SECONDS = 2
 
 st.set_page_config(page_title="AIVisio", layout="wide")
 
@@ -36,6 +47,8 @@ def save_selected_video(video_id: str, video_title: str | None = None):
         }
         with open(output_dir / "selected_video.json", "w", encoding="utf-8") as f:
             json.dump(payload, f, ensure_ascii=False, indent=2)
+        # 카탈로그에 영상 제목과 과목 기록
+        get_catalog().register_video(video_id, video_title, st.session_state.get("selected_subject"))
     except Exception as e:
         st.warning(f"선택한 영상 정보를 저장하는 중 경고: {e}")
 
@@ -46,39 +59,25 @@ def load_segments(video_id: str | None):
         return [], "video_id가 지정되지 않았습니다."
     
     try:
-        root_dir = Path(__file__).resolve().parents[1]
-        output_dir = root_dir / "Backend" / "output"
-        
-        # 영상 ID별 폴더 경로
-        video_dir = output_dir / video_id
-
-        # 1. 영상 ID 폴더 안에서 파일 검색 (e.g., segments_with_subtitles_kr.json 또는 segments_with_subtitles_en.json)
-        # 패턴: segments_with_subtitles_*.json
-        pattern = "segments_with_subtitles_*.json"
-        
-        # 영상 ID 폴더 안에서 패턴에 맞는 파일 검색
-        found_files = list(video_dir.glob(pattern)) if video_dir.exists() else []
-        
-        json_path_to_load = None
-        
-        if found_files:
-            # 찾았으면 첫 번째 파일 사용 (보통 en 또는 kr 중 하나)
-            json_path_to_load = found_files[0]
-        else:
-            # 영상 ID 폴더가 없거나 파일이 없으면, 이전 구조 호환성 체크
-            # 이전 구조: output/{video_id}_segments_with_subtitles.json 또는 output/{video_id}_segments_with_subtitles_*.json
-            old_pattern = f"{video_id}_segments_with_subtitles*.json"
-            old_found_files = list(output_dir.glob(old_pattern))
-            
-            if old_found_files:
-                # 이전 구조 파일이 있으면 사용
-                json_path_to_load = old_found_files[0]
-            else:
-                # 두 경우 모두 실패하면 에러 발생
-                raise FileNotFoundError(
-                    f"'{video_dir}' 폴더 내의 '{pattern}' 패턴 파일을 찾을 수 없습니다. "
-                    f"또한 이전 구조의 '{old_pattern}' 패턴 파일도 찾을 수 없습니다."
-                )
+        # 세그먼트 저장소가 있으면 자막 본문 없이 챕터 메타데이터만 읽음
+        chapters = SegmentStore(video_id).load_chapters()
+        if chapters:
+            return [
+                {
+                    "title": str(c["title"]),
+                    "summary": c["summary"],
+                    "start_sec": int(c["start_time"]),
+                    "end_sec": int(c["end_time"]),
+                    "bloom_category": c["bloom_category"]
+                }
+                for c in chapters
+            ], None
+
+        # 저장소가 없으면 카탈로그에 기록된 JSON 파일에서 읽음 (이전 분석 결과 호환)
+        analysis = get_catalog().get_analysis(video_id, include_incomplete=True)
+        json_path_to_load = analysis.get("json_path") if analysis else None
+        if not json_path_to_load or not os.path.exists(json_path_to_load):
+            raise FileNotFoundError(f"카탈로그에서 '{video_id}' 영상의 분석 결과를 찾을 수 없습니다.")
 
         # 찾은 파일 로드
         with open(json_path_to_load, "r", encoding="utf-8") as f:
@@ -138,67 +137,56 @@ def unique_preserve_order(seq):
             out.append(x)
     return out
 
-def display_loading_overlay():
-    st.markdown(
-        """
-        <style>
-            .custom-loading-overlay {
-                position: fixed;
-                inset: 0;
-                background: #ffffff;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                z-index: 9999;
-                margin: 0; padding: 0;
-                width: 100%; height: 100%;
-            }
-            .loader-wrap {
-                display: flex;
-                flex-direction: column;
-                align-items: center;
-                gap: 16px;
-            }
-            /* 점프하는 점 3개 */
-            .dots {
-                display: flex;
-                gap: 10px;
-                height: 12px;
-            }
-            .dot {
-                width: 10px;
-                height: 10px;
-                background: #4f46e5;
-                border-radius: 50%;
-                animation: bounce 1.2s infinite ease-in-out;
-            }
-            .dot:nth-child(2) { animation-delay: 0.2s; }
-            .dot:nth-child(3) { animation-delay: 0.4s; }
+def recommend_chapters(query: str, bloom_category: str | None, exclude_video_id: str | None, k: int = 3):
+    # 다른 분석 영상에서 같은 Bloom 단계의 마이크로러닝 챕터를 주제 유사도 순으로 추천
+    try:
+        index = get_recommendation_index()
+        filters = dict(bloom_category=bloom_category, max_duration=MICRO_LEARNING_MAX_SECONDS, exclude_video_id=exclude_video_id)
+        # 같은 과목에서 먼저 찾고, 없으면 과목 조건 없이 찾음 (과목이 기록되지 않은 이전 분석 결과 대응)
+        return (index.recommend(query, k=k, subject=st.session_state.get("selected_subject"), **filters)
+                or index.recommend(query, k=k, **filters))
+    except Exception as e:
+        print(f"⚠️ 챕터 추천 실패: {e}")
+        return []
 
-            @keyframes bounce {
-                0%, 80%, 100% { transform: translateY(0); opacity: .6; }
-                40% { transform: translateY(-8px); opacity: 1; }
-            }
+def build_learning_path(topic: str):
+    # 퀴즈 기록과 완료한 챕터를 반영하여 기억 → 창조 순서의 학습 경로 구성
+    completed = [(st.session_state.selected_video_id, t) for t in st.session_state.completed_chapters]
+    try:
+        return plan_learning_path(topic, completed=completed, subject=st.session_state.get("selected_subject")) \
+            or plan_learning_path(topic, completed=completed)
+    except Exception as e:
+        print(f"⚠️ 학습 경로 구성 실패: {e}")
+        return []
 
-            .loading-text {
-                font-size: 14px;
-                color: #475569;
-                user-select: none;
-            }
-        </style>
-        <div class="custom-loading-overlay">
-            <div class="loader-wrap">
-                <div class="dots">
-                    <div class="dot"></div>
-                    <div class="dot"></div>
-                    <div class="dot"></div>
-                </div>
-                <div class="loading-text">영상 분석 중입니다…</div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+def search_content(query: str, k: int = 8):
+    # 분석된 모든 영상의 요약/자막에서 검색 (BM25 + 임베딩)
+    try:
+        return get_search_index().search(query, k=k)
+    except Exception as e:
+        print(f"⚠️ 강의 내용 검색 실패: {e}")
+        return []
+
+def render_analysis_progress(job: dict):
+    # 백그라운드 분석 작업의 단계별 진행도와 부분 결과(생성된 챕터) 표시
+    st.markdown('<div class="section-title">영상 분석 중입니다…</div>', unsafe_allow_html=True)
+
+    stages = job.get("stages") or {}
+    finished = sum(1 for name, _ in ANALYSIS_STAGES if stages.get(name) in ("done", "cached", "skipped"))
+    st.progress(finished / len(ANALYSIS_STAGES), text=f"{finished}/{len(ANALYSIS_STAGES)} 단계 완료")
+
+    status_icons = {"done": "✅", "cached": "♻️", "running": "⏳", "skipped": "⏭️", "failed": "⚠️"}
+    for name, label in ANALYSIS_STAGES:
+        st.markdown(f"{status_icons.get(stages.get(name), '•')} {label}")
+
+    chapters = job.get("partial_result") or []
+    if chapters:
+        st.markdown("---")
+        st.markdown('<div class="section-title">생성된 챕터</div>', unsafe_allow_html=True)
+        st.caption("요약과 학습 단계 분류가 끝나면 학습 화면으로 전환됩니다.")
+        render_video(job["video_id"], height=360)
+        for c in chapters:
+            st.markdown(f"📌 {c['title']} ({format_duration(int(c['start_sec']))} ~ {format_duration(int(c['end_sec']))})")
 
 
 # ------------------ 스타일 ------------------
@@ -384,6 +372,9 @@ if "selected_bloom_stage" not in st.session_state:
 # [추가] 영상 분석 중 상태
 if "is_analyzing" not in st.session_state:
     st.session_state.is_analyzing = False
+# [추가] 백그라운드 분석 작업 ID
+if "analysis_job_id" not in st.session_state:
+    st.session_state.analysis_job_id = None
 
 
 # YouTube API/썸네일 유틸
@@ -434,34 +425,9 @@ def thumbnail_with_duration_html(video_id: str, duration_text: str) -> str:
     """
 
 # 자막 체크: 한국어 우선, 없으면 영어 / 수동 자막 우선, 없으면 자동 생성 자막도 허용
+# (자막 목록은 caption_probe에서 캐시됨)
 def has_pref_transcript(video_id: str) -> bool:
-    try:
-        ytt_api = YouTubeTranscriptApi()
-        tl = ytt_api.list_transcripts(video_id)
-
-        has_manual_ko = False
-        has_manual_en = False
-        has_auto_ko = False
-        has_auto_en = False
-
-        for t in tl:
-            if not t.is_generated:  # 수동 자막
-                if t.language_code.startswith("ko"):
-                    has_manual_ko = True
-                    break  # 한국어 수동 자막 있으면 바로 True 반환
-                elif t.language_code.startswith("en"):
-                    has_manual_en = True
-            else:  # 자동 생성 자막
-                if t.language_code.startswith("ko"):
-                    has_auto_ko = True
-                elif t.language_code.startswith("en"):
-                    has_auto_en = True
-
-        # 한국어 수동 자막이 최우선, 없으면 영어 수동 자막, 없으면 자동 생성 자막 확인
-        return has_manual_ko or has_manual_en or has_auto_ko or has_auto_en
-
-    except (TranscriptsDisabled, Exception):
-        return False
+    return has_preferred_captions(get_caption_tracks(video_id), allow_generated=True)
 
 # YouTube URL에서 video ID 추출
 def extract_video_id_from_url(url: str) -> str | None:
@@ -487,10 +453,11 @@ def extract_video_id_from_url(url: str) -> str | None:
     return None
 
 # URL로부터 영상 정보 가져오기
-@st.cache_data(show_spinner=False)
+# API 응답은 youtube_client의 영구 캐시가 워커 간에 공유하므로, 여기서는 짧게만 메모이즈
+@st.cache_data(show_spinner=False, ttl=600, max_entries=64)
 def fetch_video_from_url(video_url: str):
     """YouTube URL 또는 video ID로부터 영상 정보를 가져옵니다."""
-    if not API_KEY:
+    if not get_youtube_client().has_keys:
         raise RuntimeError("YouTube API 키가 지정되지 않았습니다.")
     
     # URL에서 video ID 추출
@@ -499,15 +466,7 @@ def fetch_video_from_url(video_url: str):
         raise ValueError("올바른 YouTube URL 또는 video ID를 입력해주세요.")
     
     # videos API로 영상 정보 가져오기
-    url = "https://www.googleapis.com/youtube/v3/videos"
-    params = {
-        "key": API_KEY,
-        "part": "contentDetails,snippet",
-        "id": video_id,
-    }
-    r = requests.get(url, params=params, timeout=10)
-    r.raise_for_status()
-    items = r.json().get("items", [])
+    items = get_youtube_client().videos([video_id], part="contentDetails,snippet").get("items", [])
     
     if not items:
         raise ValueError("해당 영상을 찾을 수 없습니다.")
@@ -526,9 +485,10 @@ def fetch_video_from_url(video_url: str):
     }
 
 # 검색 단계에서부터 "자막 있는 영상"만 추출 (주제 선택 방식 - 옵션으로 유지)
-@st.cache_data(show_spinner=False)
+# API 응답은 youtube_client의 영구 캐시가 워커 간에 공유하므로, 여기서는 짧게만 메모이즈
+@st.cache_data(show_spinner=False, ttl=600, max_entries=64)
 def fetch_top_videos(subject: str):
-    if not API_KEY:
+    if not get_youtube_client().has_keys:
         raise RuntimeError("YouTube API 키가 지정되지 않았습니다.")
 
     q = subject
@@ -536,19 +496,9 @@ def fetch_top_videos(subject: str):
         q = f"{subject} programming tutorial"
 
     # search API → 후보 영상 추출
-    url = "https://www.googleapis.com/youtube/v3/search"
-    params = {
-        "key": API_KEY,
-        "part": "snippet",
-        "q": q,
-        "type": "video",
-        "maxResults": 50,
-        "relevanceLanguage": "ko",
-        "safeSearch": "none",
-    }
-    r = requests.get(url, params=params, timeout=10)
-    r.raise_for_status()
-    items = r.json().get("items", [])
+    items = get_youtube_client().search(
+        q, type="video", maxResults=50, relevanceLanguage="ko", safeSearch="none"
+    ).get("items", [])
 
     # videoId 안전 추출
     video_ids = [it.get("id", {}).get("videoId") for it in items if it.get("id", {}).get("videoId")]
@@ -556,15 +506,7 @@ def fetch_top_videos(subject: str):
         return []
 
     # 2) videos API → 길이/제목 가져오기
-    url = "https://www.googleapis.com/youtube/v3/videos"
-    params = {
-        "key": API_KEY,
-        "part": "contentDetails,snippet",
-        "id": ",".join(video_ids),
-    }
-    r = requests.get(url, params=params, timeout=10)
-    r.raise_for_status()
-    items = r.json().get("items", [])
+    items = get_youtube_client().videos(video_ids, part="contentDetails,snippet").get("items", [])
 
     results = []
     for it in items:
@@ -582,6 +524,11 @@ def fetch_top_videos(subject: str):
                 "duration_text": format_duration(length_sec),
             })
 
+    # CAPTION_FILTER=1이면 자막 있는 영상만 남기기 (후보를 동시에 확인하고, 3개를 찾으면 중단)
+    if CAPTION_FILTER_ENABLED:
+        captioned = set(probe_captions([v["id"] for v in results], limit=3, allow_generated=True))
+        results = [v for v in results if v["id"] in captioned]
+
     # 상위 3개만 반환
     return results[:3]
 
@@ -647,20 +594,16 @@ with st.sidebar:
             save_selected_video(chosen_id, chosen_title)
 
             if chosen_id not in st.session_state.processed_video_ids:
-                # 기존 분석 결과 파일이 있으면 스킵 (새 구조 또는 이전 구조)
-                output_dir = ROOT_DIR / "Backend" / "output"
-                video_dir = output_dir / chosen_id
-                # 새 구조: output/{video_id}/segments_with_subtitles_*.json
-                pattern_files_new = list(video_dir.glob("segments_with_subtitles_*.json")) if video_dir.exists() else []
-                # 이전 구조 호환성: output/{video_id}_segments_with_subtitles*.json
-                pattern_files_old = list(output_dir.glob(f"{chosen_id}_segments_with_subtitles*.json"))
-                if len(pattern_files_new) > 0 or len(pattern_files_old) > 0:
+                # 카탈로그에 분석 결과가 있으면 스킵
+                if get_catalog().has_analysis(chosen_id):
                     st.info("이미 분석된 영상입니다. 기존 결과를 사용합니다.")
                     st.session_state.processed_video_ids.add(chosen_id)
                 else:
-                    # 커스텀 로딩 화면을 띄우기 위해 상태 변경 후 재실행
+                    # 백그라운드 분석 작업을 등록하고 진행 화면으로 전환
+                    st.session_state.analysis_job_id = JobQueue().submit(chosen_id, ANALYSIS_LANG)
+                    ensure_worker()
                     st.session_state.is_analyzing = True
-                    st.rerun() # 재실행하여 로딩 화면을 먼저 띄우고 분석 시작
+                    st.rerun()
 
             # 분석이 이미 완료되었거나, 새로 시작할 경우 학습 시작 상태로 전환
             st.session_state.learning_started = True
@@ -669,51 +612,55 @@ with st.sidebar:
                 st.rerun()
         else:
             st.error("영상을 먼저 선택해주세요.")
+
+    # 강의 내용 검색: 결과를 누르면 해당 영상의 그 시점부터 재생
+    st.markdown("---")
+    search_query = st.text_input("🔎 강의 내용 검색", key="content_search_query", placeholder="예: 역전파, gradient descent")
+    if search_query:
+        hits = search_content(search_query)
+        if not hits:
+            st.caption("검색 결과가 없습니다.")
+        for i, hit in enumerate(hits):
+            label = f"▶ {format_duration(int(hit['start']))} · {hit['title'] or hit['video_id']}"
+            if st.button(label, key=f"search_hit_{i}", help=hit["snippet"], use_container_width=True):
+                st.session_state.selected_video_id = hit["video_id"]
+                st.session_state.selected_title = hit["title"] or None
+                st.session_state.seek_time = int(hit["start"])
+                st.session_state.processed_video_ids.add(hit["video_id"])
+                st.session_state.learning_started = True
+                save_selected_video(hit["video_id"])
+                st.rerun()
             
-# --- [추가] 영상 분석 로직 (is_analyzing 상태에서만 실행) ---
-# 이 블록은 로딩 화면을 띄운 상태에서 블로킹 작업을 수행합니다.
+# --- [추가] 영상 분석 진행 화면 (is_analyzing 상태에서만 실행) ---
+# 분석은 백그라운드 워커가 수행하고, 이 블록은 작업 상태를 주기적으로 조회하기만 합니다.
 if st.session_state.is_analyzing:
-    # 1. 로딩 오버레이 표시 (애니메이션이 시작됨)
-    display_loading_overlay() 
-    
     chosen_id = st.session_state.selected_video_id
-    
-    # 선택된 영상 ID가 있고, 아직 처리되지 않은 경우에만 분석 실행
-    if chosen_id and chosen_id not in st.session_state.processed_video_ids:
-        # 재확인: 결과 파일 존재 시 즉시 스킵 (새 구조 또는 이전 구조)
-        output_dir = ROOT_DIR / "Backend" / "output"
-        video_dir = output_dir / chosen_id
-        # 새 구조: output/{video_id}/segments_with_subtitles_*.json
-        pattern_files_new = list(video_dir.glob("segments_with_subtitles_*.json")) if video_dir.exists() else []
-        # 이전 구조 호환성: output/{video_id}_segments_with_subtitles*.json
-        pattern_files_old = list(output_dir.glob(f"{chosen_id}_segments_with_subtitles*.json"))
-        if len(pattern_files_new) > 0 or len(pattern_files_old) > 0:
-            st.session_state.processed_video_ids.add(chosen_id)
-            st.session_state.is_analyzing = False
-            st.rerun()
-        try:
-            # 2. blocking task 실행 (이 동안 브라우저는 CSS 애니메이션 표시)
-            # st.info("영상 분석 중입니다. 잠시만 기다려 주세요...") # 이 메시지를 추가하면 디버깅에 도움이 될 수 있습니다.
-            backend_main.main(video_id=chosen_id) 
-            
-            # 3. 분석 완료 후 상태 업데이트
-            st.session_state.processed_video_ids.add(chosen_id)
-            st.session_state.is_analyzing = False
-            st.session_state.learning_started = True 
-            st.session_state.selected_video_id = chosen_id  
-            st.session_state.selected_video_title = st.session_state.get("selected_video_title", "")
-            st.rerun()  
+    job_id = st.session_state.analysis_job_id
+    job = JobQueue().get(job_id) if job_id else None
 
-            
-        except Exception as e:
-            # 3. 분석 실패 시 상태 업데이트
-            st.session_state.is_analyzing = False
-            st.session_state.learning_started = False
-            st.error(f"Backend.main 실행 중 오류: {e}")
-            st.stop() # 에러 발생 시 재실행 방지
-    else:
-        # chosen_id가 없거나 이미 처리된 경우 (예외 상황 대비)
+    if job is None:
+        # 작업 정보가 없는 경우 (예외 상황 대비)
+        st.session_state.is_analyzing = False
+        st.rerun()
+    elif job["status"] == JOB_DONE:
+        # 분석 완료 후 상태 업데이트
+        st.session_state.processed_video_ids.add(chosen_id)
+        st.session_state.is_analyzing = False
+        st.session_state.learning_started = True
+        st.session_state.analysis_job_id = None
+        load_segments.clear()
+        st.rerun()
+    elif job["status"] == JOB_FAILED:
+        # 분석 실패 시 상태 업데이트
         st.session_state.is_analyzing = False
+        st.session_state.learning_started = False
+        st.session_state.analysis_job_id = None
+        st.error(f"영상 분석 중 오류: {job.get('error')}")
+        st.stop() # 에러 발생 시 재실행 방지
+    else:
+        render_analysis_progress(job)
+        ensure_worker() # 워커가 중단되었으면 다시 시작
+        time.sleep(ANALYSIS_POLL_SECONDS)
         st.rerun()
 
 
@@ -830,6 +777,40 @@ with col1:
                     st.session_state.selected_title = t
                     st.rerun()
 
+        # 다른 영상의 같은 단계 챕터 추천 (선택한 챕터, 없으면 영상 제목을 주제로 사용)
+        BLOOM_KO2EN = {ko: en for en, ko in BLOOM_EN2KO.items() if en != "Analyze"}
+        rec_query = st.session_state.selected_title or st.session_state.selected_video_title
+        if rec_query:
+            recs = recommend_chapters(rec_query, BLOOM_KO2EN.get(target_bloom), st.session_state.selected_video_id)
+            if recs:
+                st.markdown('<div class="section-title">다른 영상 추천</div>', unsafe_allow_html=True)
+                for i, rec in enumerate(recs):
+                    label = f"🔗 {rec['title']} ({format_duration(int(rec['duration']))})"
+                    if st.button(label, key=f"rec_btn_{i}", help=rec.get("video_title") or rec["video_id"], use_container_width=True):
+                        st.session_state.selected_video_id = rec["video_id"]
+                        st.session_state.selected_video_title = rec.get("video_title")
+                        st.session_state.selected_title = rec["title"]
+                        st.session_state.processed_video_ids.add(rec["video_id"])
+                        save_selected_video(rec["video_id"], rec.get("video_title"))
+                        st.rerun()
+
+            # 맞춤 학습 경로 (같은 주제로 기억 → 창조 단계까지 이어지는 챕터 순서)
+            if st.button("📚 맞춤 학습 경로 만들기", key="learning_path_btn", use_container_width=True):
+                st.session_state.learning_path = build_learning_path(rec_query)
+            if st.session_state.get("learning_path"):
+                st.markdown('<div class="section-title">맞춤 학습 경로</div>', unsafe_allow_html=True)
+                for i, step in enumerate(st.session_state.learning_path, start=1):
+                    stage_ko = BLOOM_EN2KO.get(step["stage"], step["stage"])
+                    label = f"{i}. [{stage_ko}] {step['title']}"
+                    if st.button(label, key=f"path_btn_{i}", help=step.get("video_title") or step["video_id"], use_container_width=True):
+                        st.session_state.selected_video_id = step["video_id"]
+                        st.session_state.selected_video_title = step.get("video_title")
+                        st.session_state.selected_title = step["title"]
+                        st.session_state.selected_bloom_stage = stage_ko
+                        st.session_state.processed_video_ids.add(step["video_id"])
+                        save_selected_video(step["video_id"], step.get("video_title"))
+                        st.rerun()
+
 with col2:
     st.markdown('<div class="section-title">추천 교육 영상</div>', unsafe_allow_html=True)
 
@@ -841,7 +822,16 @@ with col2:
                 seg_to_play = c
                 break
 
-    if seg_to_play and seg_to_play.get("start_sec") is not None and seg_to_play.get("end_sec") is not None:
+    # 검색 결과에서 들어온 경우 해당 시점부터 재생 (한 번만 적용)
+    seek_time = st.session_state.pop("seek_time", None)
+    if seek_time is not None:
+        render_video(
+            video_id=st.session_state.selected_video_id,
+            start=int(seek_time),
+            end=int(seg_to_play["end_sec"]) if seg_to_play and seg_to_play.get("end_sec") is not None else None,
+            height=480
+        )
+    elif seg_to_play and seg_to_play.get("start_sec") is not None and seg_to_play.get("end_sec") is not None:
         render_video(
             video_id=st.session_state.selected_video_id,
             start=int(seg_to_play["start_sec"]),
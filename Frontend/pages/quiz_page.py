@@ -9,6 +9,8 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
 from Backend.controllers.quiz import generate_quizzes, check_answer, save_quiz_data, load_quiz_data
+from Backend.controllers.segment_store import SegmentStore
+from Backend.controllers.catalog import get_catalog
 
 st.set_page_config(page_title="AIVisio - Quiz", layout="wide")
 
@@ -18,29 +20,19 @@ def load_segments() -> List[Dict[str, Any]]:
     Load the same segments JSON used by main.py.
     """
     try:
-        output_dir = ROOT_DIR / "Backend" / "output"
         video_id_prefix = st.session_state.get("selected_video_id", "aircAruvnKk")
-        
-        # 영상 ID별 폴더 경로
-        video_dir = output_dir / video_id_prefix
-        
-        json_path_to_load = None
-        
-        # 새 구조: output/{video_id}/segments_with_subtitles_*.json
-        pattern = "segments_with_subtitles_*.json"
-        found_files = list(video_dir.glob(pattern)) if video_dir.exists() else []
-        
-        if found_files:
-            json_path_to_load = found_files[0]
-        else:
-            # 이전 구조 호환성: output/{video_id}_segments_with_subtitles*.json
-            old_pattern = f"{video_id_prefix}_segments_with_subtitles*.json"
-            old_found_files = list(output_dir.glob(old_pattern))
-            if old_found_files:
-                json_path_to_load = old_found_files[0]
-            else:
-                st.error(f"세그먼트 파일 파싱 오류: 'Backend/output/{video_id_prefix}/segments_with_subtitles_*.json' 또는 이전 구조 파일을 찾을 수 없습니다.")
-                return []
+
+        # 세그먼트 저장소가 있으면 자막 본문 없이 챕터 메타데이터만 읽음
+        chapters = SegmentStore(video_id_prefix).load_chapters()
+        if chapters:
+            return chapters
+
+        # 저장소가 없으면 카탈로그에 기록된 JSON 파일에서 읽음 (이전 분석 결과 호환)
+        analysis = get_catalog().get_analysis(video_id_prefix, include_incomplete=True)
+        json_path_to_load = analysis.get("json_path") if analysis else None
+        if not json_path_to_load or not Path(json_path_to_load).exists():
+            st.error(f"세그먼트 파일 파싱 오류: 카탈로그에서 '{video_id_prefix}' 영상의 분석 결과를 찾을 수 없습니다.")
+            return []
 
         with open(json_path_to_load, "r", encoding="utf-8") as f:
             data = json.load(f)
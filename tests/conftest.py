@@ -0,0 +1,34 @@
+"""
+테스트 공통 설정
+
+Backend/__init__.py와 Backend/controllers/__init__.py는 YouTube API/자막 모듈을 함께 불러오므로
+requests, youtube_transcript_api, python-dotenv 등이 설치되어 있어야 합니다.
+알고리즘 테스트는 numpy만으로 실행할 수 있도록, 두 패키지의 __init__을 실행하지 않고
+패키지 경로만 등록하여 필요한 하위 모듈만 불러옵니다.
+(Backend.main처럼 무거운 의존성이 필요한 테스트는 pytest.importorskip으로 건너뜀)
+"""
+
+import sys
+import types
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def _register_package(name: str, path: Path):
+    """__init__.py를 실행하지 않고 패키지 경로만 등록합니다."""
+    if name in sys.modules:
+        return
+    package = types.ModuleType(name)
+    package.__path__ = [str(path)]
+    package.__file__ = str(path / "__init__.py")
+    sys.modules[name] = package
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, package)
+
+
+_register_package("Backend", ROOT_DIR / "Backend")
+_register_package("Backend.controllers", ROOT_DIR / "Backend" / "controllers")
@@ -0,0 +1,116 @@
+"""
+분석 파이프라인 단계 테스트
+- 미리보기 챕터가 전체 분할이 끝나기 전에 전달되는지
+- 요약/Bloom 분류가 일부 실패한 결과가 미완료 분석으로 기록되고, 실패 안내 문구가 검색 색인에 들어가지 않는지
+- 배치 분석에서 넘겨받은 네트워크 단계 결과를 다시 가져오지 않는지
+(Backend.main은 torch/transformers 등 분석 의존성이 필요하므로, 없으면 건너뜀)
+"""
+
+import pytest
+
+from Backend.models.video_segment import VideoSegment
+
+main = pytest.importorskip("Backend.main")
+
+
+def _stage(name, on_chapter=None):
+    stages = main.build_analysis_stages("vid", use_cache=False, on_chapter=on_chapter)
+    return next(stage for stage in stages if stage.name == name)
+
+
+def _chapters_stage(on_chapter):
+    return _stage("chapters", on_chapter)
+
+
+def _segment(title):
+    return VideoSegment(id=title, video_id="vid", title=title, start_time=0.0, end_time=10.0, subtitles="",
+                        tags=[], keywords=[], summary="", cognitive_level="", dok_level="")
+
+
+def test_on_chapter_fires_before_full_segmentation(monkeypatch):
+    events = []
+
+    def fake_stream(transcript, video_id, **kwargs):
+        for title in ("preview 1", "preview 2"):
+            events.append(("yield", title))
+            yield title
+
+    def fake_segments(transcript, video_id, **kwargs):
+        events.append(("segment", None))
+        assert kwargs["segmentation_engine"] == main.SEMANTIC_SEGMENTATION_PARAMS["segmentation_engine"]
+        return ["final"]
+
+    monkeypatch.setattr(main, "iter_semantic_chapters", fake_stream)
+    monkeypatch.setattr(main, "create_semantic_segments", fake_segments)
+
+    stage = _chapters_stage(lambda segment: events.append(("on_chapter", segment)))
+    assert stage.func(transcript=["line"], youtube_chapters=None) == ["final"]
+    assert events == [
+        ("yield", "preview 1"), ("on_chapter", "preview 1"),
+        ("yield", "preview 2"), ("on_chapter", "preview 2"),
+        ("segment", None),
+    ]
+
+
+def test_preview_failure_does_not_block_saved_chapters(monkeypatch):
+    def broken_stream(transcript, video_id, **kwargs):
+        raise RuntimeError("boom")
+        yield
+
+    monkeypatch.setattr(main, "iter_semantic_chapters", broken_stream)
+    monkeypatch.setattr(main, "create_semantic_segments", lambda transcript, video_id, **kwargs: ["final"])
+
+    stage = _chapters_stage(lambda segment: None)
+    assert stage.func(transcript=["line"], youtube_chapters=None) == ["final"]
+
+
+def test_youtube_chapters_skip_preview(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "iter_semantic_chapters", lambda *a, **k: calls.append("stream") or iter(()))
+    stage = _chapters_stage(lambda segment: calls.append("on_chapter"))
+    assert stage.func(transcript=["line"], youtube_chapters=["youtube"]) == ["youtube"]
+    assert calls == []
+
+
+class _RecordingCatalog:
+    def __init__(self):
+        self.calls = []
+
+    def record_segments(self, video_id, lang, segments, **kwargs):
+        self.calls.append(kwargs)
+
+
+@pytest.mark.parametrize("bloom, summaries, complete", [
+    ([{"label": "Apply", "probabilities": {}}], ["ok"], True),
+    ([{"label": "Unknown", "probabilities": {}, "failed": True}], ["ok"], False),
+    ([{"label": "Apply", "probabilities": {}}], [None], False),
+    (None, ["ok"], False),
+])
+def test_failed_results_are_recorded_as_incomplete(monkeypatch, bloom, summaries, complete):
+    catalog = _RecordingCatalog()
+    saved = {}
+    monkeypatch.setattr(main, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(main, "save_segments_with_subtitles_to_json",
+                        lambda segments, video_id, language_code, summaries: saved.update(summaries=summaries))
+
+    _stage("save").func(mapped=[_segment("chapter")], bloom=bloom, summaries=summaries)
+    assert catalog.calls[0]["complete"] is complete
+    assert None not in saved["summaries"]
+
+
+def test_failed_summary_is_not_indexed(monkeypatch):
+    indexed = {}
+    monkeypatch.setattr(main, "index_video",
+                        lambda video_id, lang, transcript, segments, summaries: indexed.update(summaries=summaries))
+    _stage("search_index").func(transcript=[], save=[_segment("chapter")], summaries=[None])
+    assert main.SUMMARY_FAILED_MESSAGE not in indexed["summaries"]
+
+
+def test_prefetched_network_results_skip_fetch(monkeypatch):
+    monkeypatch.setattr(main, "extract_transcript", lambda *a, **k: pytest.fail("자막을 다시 가져옴"))
+    monkeypatch.setattr(main, "get_youtube_chapters", lambda *a, **k: pytest.fail("챕터를 다시 가져옴"))
+    stages = main.build_analysis_stages("vid", use_cache=False,
+                                        prefetched={"transcript": ["line"], "youtube_chapters": None})
+    by_name = {stage.name: stage for stage in stages}
+    assert by_name["transcript"].func() == ["line"]
+    assert by_name["youtube_chapters"].func() is None
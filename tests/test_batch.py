@@ -0,0 +1,89 @@
+"""
+배치 분석 테스트
+- 수집 단계 결과가 모델 단계로 직접 전달되는지 (캐시를 사용하지 않아도 다시 가져오지 않음)
+- 모델 프로세스가 비정상 종료되어도 영상별로 실패를 기록하는지
+(Backend.batch는 YouTube API 모듈을 불러오므로 requests가 없으면 건너뜀)
+"""
+
+import sys
+import types
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pytest.importorskip("requests")
+
+from Backend import batch
+
+
+class _Catalog:
+    def get_analysis(self, video_id, language_code=None):
+        return None
+
+
+class _InlinePool:
+    """제출 즉시 실행하는 풀. broken에 있는 영상은 BrokenProcessPool로 실패"""
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        if args[0] in self.broken:
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            self.calls.append(args)
+            future.set_result(fn(*args))
+        return future
+
+
+def _patch_batch(monkeypatch, model_pool):
+    refreshed = []
+    monkeypatch.setattr(batch, "get_catalog", lambda: _Catalog())
+    monkeypatch.setattr(batch, "get_youtube_video_infos", lambda ids: {})
+    monkeypatch.setattr(batch, "ThreadPoolExecutor", _InlinePool())
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", model_pool)
+    monkeypatch.setattr(batch, "_fetch_video", lambda vid, lang, use_cache: (
+        vid, True, "", {"transcript": f"transcript-{vid}", "youtube_chapters": None}))
+    monkeypatch.setattr(batch, "_analyze_video", lambda vid, lang, use_cache, prefetched: (vid, True, ""))
+    monkeypatch.setitem(sys.modules, "Backend.jobs",
+                        types.SimpleNamespace(refresh_indexes=lambda: refreshed.append(True)))
+    return refreshed
+
+
+def test_fetched_results_are_passed_to_model_stage(monkeypatch):
+    model_pool = _InlinePool()
+    refreshed = _patch_batch(monkeypatch, model_pool)
+    results = batch.run_batch(["a", "b"], use_cache=False)
+    assert sorted(results) == [("a", True, ""), ("b", True, "")]
+    assert sorted(model_pool.calls) == [
+        ("a", "en", False, {"transcript": "transcript-a", "youtube_chapters": None}),
+        ("b", "en", False, {"transcript": "transcript-b", "youtube_chapters": None}),
+    ]
+    assert refreshed == [True]
+
+
+def test_broken_process_pool_is_recorded_per_video(monkeypatch):
+    refreshed = _patch_batch(monkeypatch, _InlinePool(broken={"b"}))
+    results = {vid: (ok, message) for vid, ok, message in batch.run_batch(["a", "b"])}
+    assert results["a"] == (True, "")
+    assert results["b"][0] is False and "worker died" in results["b"][1]
+    assert refreshed == [True]
+
+
+def test_all_workers_broken_skips_index_refresh(monkeypatch):
+    refreshed = _patch_batch(monkeypatch, _InlinePool(broken={"a", "b"}))
+    results = batch.run_batch(["a", "b"])
+    assert [ok for _, ok, _ in results] == [False, False]
+    assert refreshed == []
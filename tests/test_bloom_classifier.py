@@ -0,0 +1,110 @@
+"""
+Bloom 분류기 테스트
+- 긴 텍스트 윈도우를 묶음 단위로만 보관하며 길이순으로 배치를 구성하는지
+- 저장된 결과 재분류가 JSON, 세그먼트 저장소, 카탈로그를 함께 갱신하는지
+(bloom_classifier는 torch/transformers가 필요하므로, 없으면 건너뜀)
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from Backend.controllers import bloom_classifier, catalog as catalog_module, segment_store
+from Backend.controllers.catalog import Catalog
+from Backend.controllers.segment_store import SegmentStore
+from Backend.models.video_segment import VideoSegment
+
+
+def _segment(title, start, end, subtitles):
+    segment = VideoSegment(id=title, video_id="vid", title=title, start_time=start, end_time=end,
+                           subtitles=subtitles, tags=[], keywords=[], summary="", cognitive_level="", dok_level="")
+    segment.bloom_category = "Remember"
+    segment.bloom_probabilities = {"Remember": 1.0}
+    return segment
+
+
+class _FakeClassifier(bloom_classifier.BloomClassifier):
+    def __init__(self, predictions):
+        self.predictions = predictions
+        self.calls = []
+
+    def predict_long_batch(self, texts, batch_size=bloom_classifier.DEFAULT_BATCH_SIZE, aggregation=None, **kwargs):
+        self.calls.append((list(texts), aggregation))
+        return self.predictions[:len(texts)]
+
+
+class _WindowClassifier(bloom_classifier.BloomClassifier):
+    """윈도우 생성/배치 추론만 기록하는 분류기 (모델 없이 실행)"""
+
+    def __init__(self, windows):
+        self.windows = windows
+        self.produced = 0
+        self.consumed = 0
+        self.pending_max = 0
+        self.batches = []
+
+    def _iter_windows(self, texts, window_size, stride):
+        for window in self.windows:
+            self.produced += 1
+            yield window
+
+    def _run_window_batch(self, batch, aggregators, failed):
+        self.pending_max = max(self.pending_max, self.produced - self.consumed)
+        self.consumed += len(batch)
+        self.batches.append([len(ids) for _, ids in batch])
+
+
+def test_long_batch_sorts_windows_within_bounded_chunks():
+    lengths = [(i * 37) % 97 + 1 for i in range(1000)]
+    windows = [(i % 10, [0] * n) for i, n in enumerate(lengths)]
+    classifier = _WindowClassifier(windows)
+    results = classifier.predict_long_batch(["text"] * 10, batch_size=4)
+
+    chunk_size = 4 * bloom_classifier.WINDOW_SORT_CHUNK_BATCHES
+    assert len(results) == 10
+    assert classifier.consumed == len(windows)
+    # 보관하는 윈도우는 묶음 하나를 넘지 않음
+    assert classifier.pending_max <= chunk_size
+    assert all(len(batch) <= 4 for batch in classifier.batches)
+    # 묶음 안에서는 길이순으로 배치 구성
+    per_chunk = chunk_size // 4
+    for c in range(0, len(classifier.batches), per_chunk):
+        flat = [n for batch in classifier.batches[c:c + per_chunk] for n in batch]
+        assert flat == sorted(flat)
+    assert sorted(n for batch in classifier.batches for n in batch) == sorted(lengths)
+
+
+def test_predict_segment_files_updates_store_and_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(segment_store, "get_output_root", lambda: str(tmp_path))
+    catalog = Catalog(str(tmp_path / "catalog.sqlite"), sync_existing=False)
+    monkeypatch.setattr(catalog_module, "get_catalog", lambda: catalog)
+
+    segments = [_segment("a", 0.0, 10.0, "first"), _segment("b", 10.0, 20.0, ""), _segment("c", 20.0, 30.0, "third")]
+    store = SegmentStore("vid")
+    store.save_segments(segments, "en", ["s1", "s2", "s3"])
+    json_path = tmp_path / "vid" / "segments_with_subtitles_en.json"
+    json_path.write_text(json.dumps({"video_id": "vid", "segments": [
+        {"title": s.title, "start_time": s.start_time, "end_time": s.end_time, "subtitles": s.subtitles,
+         "bloom_category": "Remember"} for s in segments
+    ]}), encoding="utf-8")
+    catalog.record_segments("vid", "en", segments, models={"bloom": "old"}, json_path=str(json_path))
+    revision = catalog.revision()
+
+    classifier = _FakeClassifier([
+        {"label": "Apply", "probabilities": {"Apply": 0.9}},
+        {"label": "Unknown", "probabilities": {}, "failed": True},
+    ])
+    assert classifier.predict_segment_files([str(json_path)]) == 1
+    assert classifier.calls == [(["first", "third"], bloom_classifier.DEFAULT_AGGREGATION)]
+
+    data = json.loads(json_path.read_text(encoding="utf-8"))
+    assert [item["bloom_category"] for item in data["segments"]] == ["Apply", "Remember", "Remember"]
+    assert data["segments"][0]["bloom_probabilities"] == {"Apply": 0.9}
+    # 실패한 세그먼트는 기존 분류 유지
+    assert [ch["bloom_category"] for ch in store.load_chapters("en")] == ["Apply", "Remember", "Remember"]
+    assert [ch["bloom_category"] for ch in catalog.find_chapters(language_code="en")] == ["Apply", "Remember", "Remember"]
+    assert catalog.get_analysis("vid", "en")["models"] == {"bloom": "old"}
+    assert catalog.revision() != revision
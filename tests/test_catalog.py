@@ -0,0 +1,46 @@
+"""
+카탈로그 테스트: 요약/Bloom 분류 일부가 실패한 분석은 분석되지 않은 영상으로 취급되는지 확인합니다.
+"""
+
+import sqlite3
+
+from Backend.controllers.catalog import Catalog
+
+CHAPTERS = [{"title": "intro", "start_time": 0.0, "end_time": 60.0, "bloom_category": "Remember"}]
+
+
+def test_incomplete_analysis_is_not_reported_as_analyzed(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.sqlite"), sync_existing=False)
+    catalog.record_analysis("vid", "en", CHAPTERS, complete=False)
+
+    assert not catalog.has_analysis("vid", "en")
+    assert catalog.get_analysis("vid") is None
+    assert catalog.get_analysis("vid", "en", include_incomplete=True)["complete"] is False
+
+    # 다시 분석하여 완료되면 조회됨
+    catalog.record_analysis("vid", "en", CHAPTERS)
+    assert catalog.has_analysis("vid", "en")
+    assert catalog.get_analysis("vid", "en")["complete"] is True
+
+
+def test_existing_catalog_without_complete_column_is_migrated(tmp_path):
+    path = tmp_path / "catalog.sqlite"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE videos (video_id TEXT PRIMARY KEY, title TEXT, subject TEXT, updated_at TEXT NOT NULL);
+        CREATE TABLE analyses (
+            video_id TEXT NOT NULL, language_code TEXT NOT NULL, duration REAL NOT NULL,
+            num_chapters INTEGER NOT NULL, models TEXT NOT NULL DEFAULT '{}', store_path TEXT, json_path TEXT,
+            analyzed_at TEXT NOT NULL, PRIMARY KEY (video_id, language_code)
+        );
+        INSERT INTO videos VALUES ('old', NULL, NULL, '2024-01-01T00:00:00');
+        INSERT INTO analyses VALUES ('old', 'ko', 60.0, 1, '{}', NULL, NULL, '2024-01-01T00:00:00');
+    """)
+    conn.commit()
+    conn.close()
+
+    catalog = Catalog(str(path), sync_existing=False)
+    # 기존 결과는 완료된 분석으로 유지
+    assert catalog.has_analysis("old", "ko")
+    catalog.record_analysis("new", "ko", CHAPTERS, complete=False)
+    assert not catalog.has_analysis("new")
@@ -0,0 +1,82 @@
+"""
+changepoint DP 분할 테스트: 모든 분할을 나열하는 완전 탐색 결과와 비교합니다.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from Backend.controllers.changepoint import (
+    backtrack, duration_mask, optimal_segment_ranges, segment_cost_matrix, solve_segmentation
+)
+
+
+def _naive_cost(x, i, j):
+    block = x[i:j]
+    return float(((block - block.mean(axis=0)) ** 2).sum())
+
+
+def _brute_force(cost, k):
+    """[0, n)을 k개 구간으로 나누는 모든 경우 중 최소 비용과 그 경계"""
+    n = cost.shape[0] - 1
+    best, best_bounds = np.inf, None
+    for cuts in itertools.combinations(range(1, n), k - 1):
+        edges = (0,) + cuts + (n,)
+        total = sum(cost[a, b] for a, b in zip(edges[:-1], edges[1:]))
+        if total < best:
+            best, best_bounds = total, list(zip(edges[:-1], edges[1:]))
+    return best, best_bounds
+
+
+def test_segment_cost_matrix_matches_direct_sum():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(9, 4))
+    cost = segment_cost_matrix(x)
+    for i in range(len(x) + 1):
+        for j in range(len(x) + 1):
+            if i < j:
+                assert cost[i, j] == pytest.approx(_naive_cost(x, i, j), abs=1e-9)
+            else:
+                assert np.isinf(cost[i, j])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solve_segmentation_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(8, 3))
+    cost = segment_cost_matrix(x)
+    totals, back = solve_segmentation(cost, max_segments=5)
+    for k in range(1, 6):
+        expected, expected_bounds = _brute_force(cost, k)
+        assert totals[k - 1] == pytest.approx(expected, abs=1e-9)
+        bounds = backtrack(back, k, len(x))
+        assert sum(cost[a, b] for a, b in bounds) == pytest.approx(expected, abs=1e-9)
+        assert bounds[0][0] == 0 and bounds[-1][1] == len(x)
+        assert all(a < b for a, b in bounds)
+        assert all(prev[1] == cur[0] for prev, cur in zip(bounds, bounds[1:]))
+        if len(bounds) == len(expected_bounds):
+            assert sum(cost[a, b] for a, b in expected_bounds) == pytest.approx(totals[k - 1], abs=1e-9)
+
+
+def test_solve_segmentation_respects_duration_mask():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(8, 3))
+    times = [(i * 10.0, (i + 1) * 10.0) for i in range(len(x))]
+    cost = np.where(duration_mask(times, 25.0), segment_cost_matrix(x), np.inf)
+    totals, back = solve_segmentation(cost, max_segments=4)
+    # 25초 이상 구간은 창 3개 이상이므로 8개 창은 최대 2개로만 나눌 수 있음
+    assert np.isfinite(totals[:2]).all()
+    assert np.isinf(totals[2:]).all()
+    expected, _ = _brute_force(cost, 2)
+    assert totals[1] == pytest.approx(expected, abs=1e-9)
+    assert all(b - a >= 3 for a, b in backtrack(back, 2, len(x)))
+
+
+def test_optimal_segment_ranges_finds_planted_topics():
+    rng = np.random.default_rng(2)
+    topics = np.eye(3)
+    x = np.concatenate([topics[t] + 0.05 * rng.normal(size=(5, 3)) for t in range(3)])
+    times = [(i * 30.0, (i + 1) * 30.0) for i in range(len(x))]
+    ranges = optimal_segment_ranges(x, times, min_segments=2, max_segments=4)
+    assert ranges == [(0, 4), (5, 9), (10, 14)]
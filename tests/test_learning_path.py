@@ -0,0 +1,88 @@
+"""
+학습 경로 테스트
+- 퀴즈 기록을 파일별로 캐시하고, 바뀐/삭제된 quiz.json만 반영하는지
+- 수천 개 챕터에서도 학습 경로 요청이 대화형 응답 시간(100ms) 안에 끝나는지
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+from Backend.controllers import learning_path
+from Backend.controllers.learning_path import load_quiz_history, plan_learning_path
+from Backend.controllers.recommendation import BLOOM_STAGES, IVFIndex, RecommendationIndex
+
+
+def _write_quiz(root, video_id, title, correct, total=2):
+    directory = root / video_id
+    directory.mkdir(parents=True, exist_ok=True)
+    progress = [{"tries": 1, "is_correct": i < correct} for i in range(total)]
+    (directory / "quiz.json").write_text(json.dumps({
+        "video_id": video_id,
+        "chapters": {title: {"quizzes": [{}] * total, "progress": progress}},
+    }), encoding="utf-8")
+    return directory / "quiz.json"
+
+
+def test_quiz_history_reads_only_changed_files(tmp_path, monkeypatch):
+    _write_quiz(tmp_path, "v1", "intro", correct=2)
+    second = _write_quiz(tmp_path, "v2", "loops", correct=1)
+    reads = []
+    original = learning_path._read_quiz_file
+    monkeypatch.setattr(learning_path, "_read_quiz_file", lambda path: reads.append(path) or original(path))
+
+    history = load_quiz_history(str(tmp_path))
+    assert history[("v1", "intro")]["ratio"] == 1.0
+    assert history[("v2", "loops")]["ratio"] == 0.5
+    assert len(reads) == 2
+
+    # 바뀌지 않았으면 다시 읽지 않음
+    assert load_quiz_history(str(tmp_path)) == history
+    assert len(reads) == 2
+
+    _write_quiz(tmp_path, "v2", "loops", correct=2, total=4)
+    stat = os.stat(second)
+    os.utime(second, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_quiz_history(str(tmp_path))[("v2", "loops")]["ratio"] == 0.5
+    assert reads[2:] == [str(second)]
+
+    os.remove(second)
+    assert set(load_quiz_history(str(tmp_path))) == {("v1", "intro")}
+
+
+def _synthetic_index(n, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    items = [
+        {"video_id": f"v{i // 10}", "language_code": "en", "position": i % 10, "title": f"chapter {i}",
+         "duration": float(60 + i % 300), "bloom_category": BLOOM_STAGES[i % len(BLOOM_STAGES)],
+         "subject": "math" if i % 2 else "science", "summary": ""}
+        for i in range(n)
+    ]
+    return RecommendationIndex(items, IVFIndex.build(vectors, seed=0), None, "rev"), vectors
+
+
+def test_plan_learning_path_is_interactive(tmp_path, monkeypatch):
+    index, vectors = _synthetic_index(3000)
+    monkeypatch.setattr(learning_path, "get_recommendation_index", lambda: index)
+    monkeypatch.setattr(learning_path, "get_recommendation_dir", lambda: str(tmp_path / "recommendation"))
+    monkeypatch.setattr(learning_path, "get_output_root", lambda: str(tmp_path / "output"))
+    monkeypatch.setattr(learning_path, "_default_planner", None)
+    for v in range(50):
+        _write_quiz(tmp_path / "output", f"v{v}", f"chapter {v * 10}", correct=2)
+
+    learning_path.refresh_similarity_graph(index)
+    topic = vectors[42]
+    plan_learning_path(topic, per_stage=2)  # 플래너/퀴즈 기록 캐시 준비
+
+    start = time.perf_counter()
+    for _ in range(5):
+        path = plan_learning_path(topic, per_stage=2)
+    elapsed = (time.perf_counter() - start) / 5
+
+    assert path
+    assert all(item["title"] != "chapter 0" for item in path)  # 익힌 챕터는 제외
+    assert elapsed < 0.1, f"학습 경로 요청 {elapsed * 1000:.1f}ms"
@@ -0,0 +1,64 @@
+"""
+추천 색인 테스트: IVF 검색의 재현율을 전체 비교(정확한 결과)와 비교합니다.
+"""
+
+import numpy as np
+
+from Backend.controllers.recommendation import IVF_MIN_ITEMS, IVFIndex
+
+
+def _clustered_vectors(seed, n, dim=32, clusters=64):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    return (centers[labels] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def _exact_top(vectors, query, k, mask=None):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = unit @ (query / np.linalg.norm(query))
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+    return set(np.argsort(-scores)[:k].tolist())
+
+
+def test_small_index_uses_exact_search():
+    vectors = _clustered_vectors(0, 200)
+    index = IVFIndex.build(vectors)
+    assert index.centroids is None
+    query = vectors[3]
+    ids, scores = index.search(query, k=10)
+    assert set(ids.tolist()) == _exact_top(vectors, query, 10)
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_ivf_recall_against_flat_search():
+    n = IVF_MIN_ITEMS * 2
+    vectors = _clustered_vectors(1, n)
+    index = IVFIndex.build(vectors, seed=0)
+    assert index.centroids is not None
+    assert sorted(index.order.tolist()) == list(range(n))
+
+    rng = np.random.default_rng(2)
+    k = 10
+    hits = 0
+    queries = vectors[rng.choice(n, 50, replace=False)] + 0.1 * rng.normal(size=(50, vectors.shape[1]))
+    for query in queries:
+        ids, _ = index.search(query, k=k)
+        assert len(ids) == k
+        hits += len(set(ids.tolist()) & _exact_top(vectors, query, k))
+    assert hits / (k * len(queries)) >= 0.9
+
+
+def test_ivf_search_with_mask_returns_only_allowed_items():
+    n = IVF_MIN_ITEMS * 2
+    vectors = _clustered_vectors(3, n)
+    index = IVFIndex.build(vectors, seed=0)
+    mask = np.zeros(n, dtype=bool)
+    mask[::7] = True
+    query = vectors[10]
+    ids, _ = index.search(query, k=10, mask=mask)
+    assert len(ids) == 10
+    assert mask[ids].all()
+    # 조건에 맞는 항목이 적으면 전체 비교로 정확한 결과를 반환
+    assert set(ids.tolist()) == _exact_top(vectors, query, 10, mask)
@@ -0,0 +1,90 @@
+"""
+강의 내용 검색 테스트: BM25 점수와 RRF 융합 순서를 확인합니다.
+"""
+
+import math
+
+import pytest
+
+import Backend.controllers.search as search
+from Backend.controllers.search import BM25_B, BM25_K1, RRF_K, SearchIndex, index_video, tokenize
+from Backend.models.video_segment import VideoSegment
+
+
+def _segment(position, title):
+    return VideoSegment(id=str(position), video_id="vid", title=title, start_time=position * 60.0,
+                        end_time=(position + 1) * 60.0, subtitles="", tags=[], keywords=[], summary="",
+                        cognitive_level="", dok_level="")
+
+
+@pytest.fixture
+def bm25_index(tmp_path, monkeypatch):
+    """임베딩 모델 없이(BM25만) 영상 하나를 색인한 검색 색인"""
+    monkeypatch.setattr(search, "get_output_root", lambda: str(tmp_path))
+    monkeypatch.setattr(search, "load_embedding_model", lambda: (None, None))
+    summaries = [
+        "gradient descent updates weights using the gradient of the loss",
+        "convolution layers share weights across image positions",
+        "gradient clipping keeps the gradient norm bounded during training with gradient descent",
+    ]
+    segments = [_segment(i, f"chapter {i}") for i in range(len(summaries))]
+    index_video("vid", "en", None, segments, summaries)
+    texts = [f"{seg.title}. {summary}" for seg, summary in zip(segments, summaries)]
+    return SearchIndex(output_root=str(tmp_path)), texts
+
+
+def _reference_bm25(texts, query):
+    docs = [tokenize(t, "en") for t in texts]
+    avgdl = sum(len(d) for d in docs) / len(docs)
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in dict.fromkeys(tokenize(query, "en")):
+            df = sum(term in d for d in docs)
+            tf = doc.count(term)
+            if tf == 0:
+                continue
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avgdl))
+        scores.append(score)
+    return scores
+
+
+def test_bm25_scores_match_reference(bm25_index):
+    index, texts = bm25_index
+    index.refresh(force=True)
+    shards = index.shards()
+    query = "gradient descent"
+    expected = _reference_bm25(texts, query)
+    results = index._bm25(shards, query, k=10)
+    assert [d for _, _, d in results] == sorted((d for d, s in enumerate(expected) if s > 0),
+                                                key=lambda d: -expected[d])
+    for score, _, d in results:
+        assert score == pytest.approx(expected[d], rel=1e-5)
+
+
+def test_bm25_search_returns_chapter_metadata(bm25_index):
+    index, _ = bm25_index
+    hits = index.search("convolution", k=3, mode="bm25")
+    assert len(hits) == 1
+    assert hits[0]["video_id"] == "vid" and hits[0]["chapter"] == 1 and hits[0]["kind"] == "summary"
+    assert index.search("unrelated words", mode="bm25") == []
+
+
+def test_rrf_prefers_documents_ranked_by_both_methods(bm25_index, monkeypatch):
+    index, _ = bm25_index
+    # BM25: 0 > 2 > 1, 임베딩: 2 > 1 → 두 방식 모두에 나온 1, 2가 BM25 1위인 0보다 앞섬
+    monkeypatch.setattr(SearchIndex, "_bm25", lambda self, shards, query, k: [(3.0, 0, 0), (2.0, 0, 2), (1.0, 0, 1)])
+    monkeypatch.setattr(SearchIndex, "_dense", lambda self, shards, query, k: [(0.9, 0, 2), (0.8, 0, 1)])
+    hits = index.search("anything", k=3, mode="hybrid")
+    scores = {hit["chapter"]: hit["score"] for hit in hits}
+    assert scores[2] == pytest.approx(1.0 / (RRF_K + 2) + 1.0 / (RRF_K + 1))
+    assert scores[1] == pytest.approx(1.0 / (RRF_K + 3) + 1.0 / (RRF_K + 2))
+    assert scores[0] == pytest.approx(1.0 / (RRF_K + 1))
+    assert [hit["chapter"] for hit in hits] == [2, 1, 0]
+
+
+def test_search_rejects_unknown_mode(bm25_index):
+    index, _ = bm25_index
+    with pytest.raises(ValueError):
+        index.search("gradient", mode="fuzzy")
@@ -0,0 +1,50 @@
+"""
+자막 매핑 테스트: 정렬 구간 인덱스 검색이 모든 자막을 비교하는 방식과 같은 결과를 내는지 확인합니다.
+"""
+
+import numpy as np
+
+from Backend.controllers.segments import (
+    _build_subtitle_index, _find_overlapping_subtitles, map_subtitles_to_segments
+)
+from Backend.models.transcript import Transcript
+from Backend.models.video_segment import VideoSegment
+
+
+def _linear_overlaps(starts, durations, start_time, end_time):
+    ends = starts + durations
+    return np.flatnonzero((starts < end_time) & (ends > start_time))
+
+
+def _segment(title, start, end):
+    return VideoSegment(id=title, video_id="vid", title=title, start_time=start, end_time=end, subtitles="",
+                        tags=[], keywords=[], summary="", cognitive_level="", dok_level="")
+
+
+def test_overlap_index_matches_linear_scan():
+    rng = np.random.default_rng(0)
+    # 순서가 섞이고 길이가 제각각인(긴 자막이 뒤 자막과 겹치는) 자막
+    starts = rng.uniform(0, 600, size=300)
+    durations = rng.exponential(8.0, size=300)
+    durations[::37] = 120.0
+    index = _build_subtitle_index(starts, durations)
+    for _ in range(200):
+        a, b = np.sort(rng.uniform(-10, 650, size=2))
+        found = _find_overlapping_subtitles(index, a, b)
+        np.testing.assert_array_equal(found, _linear_overlaps(starts, durations, a, b))
+
+
+def test_overlap_index_boundaries_are_half_open():
+    starts = np.array([0.0, 10.0, 20.0])
+    durations = np.array([10.0, 10.0, 10.0])
+    index = _build_subtitle_index(starts, durations)
+    # 끝이 세그먼트 시작과 같거나, 시작이 세그먼트 끝과 같은 자막은 겹치지 않음
+    assert _find_overlapping_subtitles(index, 10.0, 20.0).tolist() == [1]
+    assert _find_overlapping_subtitles(index, 30.0, 40.0).tolist() == []
+
+
+def test_map_subtitles_to_segments_joins_in_subtitle_order():
+    transcript = Transcript.from_columns([0.0, 4.0, 8.0, 12.0], [4.0, 4.0, 4.0, 4.0], ["a", "b", "c", "d"])
+    segments = [_segment("first", 0.0, 8.0), _segment("second", 8.0, 16.0), _segment("empty", 20.0, 30.0)]
+    mapped = map_subtitles_to_segments(segments, transcript)
+    assert [seg.subtitles for seg in mapped] == ["a b", "c d", ""]
@@ -0,0 +1,68 @@
+"""
+주제 변화 감지 테스트: threshold 일괄 계산이 threshold별 순차 계산과 같은 결과를 내는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from Backend.controllers.semantic_segmentation import (
+    build_threshold_grid, detect_topic_changes_centroid, normalize_embeddings, sweep_topic_change_thresholds
+)
+
+
+def _reference_change_points(embeddings, threshold, min_segment_len=1):
+    """벡터화 이전의 centroid 기반 감지 (threshold 하나씩, 구간 평균과의 코사인 유사도)"""
+    n = len(embeddings)
+    if n == 0:
+        return []
+    if n == 1:
+        return [0, 0]
+    change_points = [0]
+    centroid = embeddings[0].astype(np.float64).copy()
+    count = 1
+    for i in range(1, n):
+        x = embeddings[i].astype(np.float64)
+        denom = np.linalg.norm(x) * np.linalg.norm(centroid)
+        sim = float(x @ centroid / denom) if denom > 0 else 0.0
+        if sim < threshold and count >= min_segment_len:
+            change_points.append(i)
+            centroid = x.copy()
+            count = 1
+        else:
+            count += 1
+            centroid = (centroid * (count - 1) + x) / count
+    if change_points[-1] != n - 1:
+        change_points.append(n - 1)
+    return change_points
+
+
+def _topic_embeddings(seed, n=40, dim=16):
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(4, dim))
+    labels = np.repeat(np.arange(4), n // 4)
+    return topics[labels] + 0.6 * rng.normal(size=(len(labels), dim))
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("min_segment_len", [1, 3])
+def test_sweep_matches_per_threshold_reference(seed, min_segment_len):
+    embeddings = _topic_embeddings(seed)
+    thresholds = build_threshold_grid(0.75, max_adjust_iters=4)
+    swept = sweep_topic_change_thresholds(embeddings, thresholds, min_segment_len)
+    assert len(swept) == len(thresholds)
+    for threshold, change_points in zip(thresholds, swept):
+        assert change_points == _reference_change_points(embeddings, threshold, min_segment_len)
+
+
+def test_sweep_with_normalized_input_matches_reference_on_unit_vectors():
+    unit = normalize_embeddings(_topic_embeddings(7))
+    thresholds = [0.2, 0.5, 0.8]
+    swept = sweep_topic_change_thresholds(unit, thresholds, normalized=True)
+    assert swept == [_reference_change_points(unit, t) for t in thresholds]
+
+
+def test_detect_topic_changes_centroid_edge_cases():
+    assert detect_topic_changes_centroid(np.zeros((0, 4))) == []
+    assert detect_topic_changes_centroid(np.ones((1, 4))) == [0, 0]
+    same = np.ones((5, 4))
+    assert detect_topic_changes_centroid(same, similarity_threshold=0.9) == [0, 4]
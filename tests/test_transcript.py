@@ -0,0 +1,88 @@
+"""
+자막 저장소 테스트: 자막 목록이 만료되어도 고른 자막이 저장되어 있으면 네트워크 요청 없이 재사용하는지 확인합니다.
+(transcript 모듈은 youtube_transcript_api가 필요하므로, 없으면 건너뜀)
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("youtube_transcript_api")
+
+from Backend.controllers import transcript as transcript_module
+from Backend.controllers.transcript import TRANSCRIPT_LIST_TTL, TranscriptStore, get_transcript_path
+
+
+class _Track:
+    def __init__(self, language_code, is_generated):
+        self.language_code = language_code
+        self.language = language_code
+        self.is_generated = is_generated
+
+    def fetch(self):
+        return [{"text": f"{self.language_code} remote", "start": 0.0, "duration": 1.0}]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_module, "get_output_root", lambda: str(tmp_path))
+    monkeypatch.setattr(transcript_module, "ensure_output_dir", lambda video_id: str(tmp_path / video_id))
+    calls = []
+
+    def list_transcripts(video_id):
+        calls.append(video_id)
+        return [_Track("en", False)]
+
+    monkeypatch.setattr(transcript_module, "list_transcripts", list_transcripts)
+    store = TranscriptStore("vid")
+    store.network_calls = calls
+    return store
+
+
+def _write_list(store, tracks, age):
+    os.makedirs(store.video_dir, exist_ok=True)
+    with open(store.list_path, "w", encoding="utf-8") as f:
+        json.dump({"video_id": "vid", "fetched_ts": time.time() - age, "tracks": tracks}, f)
+
+
+def _write_saved(language_code, is_generated, text="saved"):
+    with open(get_transcript_path("vid", language_code), "w", encoding="utf-8") as f:
+        json.dump({"video_id": "vid", "language_code": language_code, "is_generated": is_generated,
+                   "segments": [{"text": text, "start": 0.0, "duration": 1.0}]}, f)
+
+
+def test_expired_list_reuses_saved_track_without_network(store):
+    _write_list(store, [{"language_code": "en", "language": "English", "is_generated": False}],
+                age=TRANSCRIPT_LIST_TTL * 2)
+    _write_saved("en", False)
+
+    transcript, code, is_generated = store.get("en")
+    assert (code, is_generated) == ("en", False)
+    assert transcript.join(0, len(transcript)).strip() == "saved"
+    assert store.network_calls == []
+    # 자막 유무 확인(caption_probe)에는 계속 유효 기간 적용
+    assert store.cached_tracks() is None
+
+
+def test_expired_list_without_saved_track_refetches(store):
+    _write_list(store, [{"language_code": "en", "language": "English", "is_generated": False}],
+                age=TRANSCRIPT_LIST_TTL * 2)
+    _write_saved("en", True)  # 종류가 다른 자막은 재사용하지 않음
+
+    transcript, code, is_generated = store.get("en")
+    assert (code, is_generated) == ("en", False)
+    assert store.network_calls == ["vid"]
+    assert store.cached_tracks() is not None
+
+
+def test_empty_list_is_trusted_only_within_ttl(store):
+    _write_list(store, [], age=0)
+    assert store.get("en") == (None, None, None)
+    assert store.network_calls == []
+
+    _write_list(store, [], age=TRANSCRIPT_LIST_TTL * 2)
+    _, code, _ = store.get("en")
+    assert code == "en"
+    assert store.network_calls == ["vid"]